@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+from typing import Dict, Any, Optional
+import asyncio
+from app.core.config import settings
+from app.services.data_store import data_store
+from app.utils.serialization import FastJSONResponse
+
+router = APIRouter()
+
+# Записи, збережені в data_store під час парсингу. Фільтри відповідають
+# індексованим колонкам, тож запити не потребують повторного розбору файлів.
+# Обмеження сховища (записи за ім'ям файлу, студенти не видаляються) — див. DataStore.
+MAX_PAGE_SIZE = 1000
+
+
+async def store_response(query, *args: Any, **extra: Any) -> Any:
+    try:
+        page = await asyncio.to_thread(query, *args)
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "detail": f"Помилка читання сховища даних: {str(e)}"
+            }
+        )
+    return FastJSONResponse(content={"status": "success", **extra, **page})
+
+@router.get("/data/students", response_model=Dict[str, Any])
+async def query_students(
+    IDstudent: Optional[int] = None,
+    groupId: Optional[int] = None,
+    educationalProgramId: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Студенти з розібраних списків; фільтри за IDstudent, groupId, educationalProgramId.
+    Студенти, що зникли зі списку, лишаються, доки список не імпортовано через /import-students.
+    """
+    return await store_response(data_store.query_students, limit, offset, IDstudent, groupId, educationalProgramId)
+
+@router.get("/data/disciplines", response_model=Dict[str, Any])
+async def query_disciplines(
+    code: Optional[str] = None,
+    semester: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Дисципліни вільного вибору; фільтри за кодом (codeAddDisciplines) і семестром (addSemestr).
+    Дисципліни зберігаються за ім'ям файлу: файл з тим самим ім'ям замінює попередній.
+    """
+    return await store_response(data_store.query_disciplines, limit, offset, code, semester)
+
+@router.get("/data/main-disciplines", response_model=Dict[str, Any])
+async def query_main_disciplines(
+    code: Optional[str] = None,
+    semester: Optional[int] = None,
+    sourceFile: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Обов'язкові дисципліни освітніх програм; фільтри за кодом, семестром і файлом програми
+    (ім'я файлу без шляху: файл з тим самим ім'ям замінює попередній).
+    """
+    return await store_response(data_store.query_main_disciplines, limit, offset, code, semester, sourceFile)
+
+@router.get("/data/educational-programs", response_model=Dict[str, Any])
+async def query_educational_programs(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """Освітні програми, по одній на ім'я розібраного файлу"""
+    return await store_response(data_store.query_programs, limit, offset)
+
+@router.get("/data", response_model=Dict[str, Any])
+async def data_store_info():
+    """Кількість записів у таблицях сховища"""
+    return await store_response(
+        lambda: {"counts": data_store.counts()},
+        enabled=settings.DATA_STORE_ENABLED,
+        path=data_store.path
+    )
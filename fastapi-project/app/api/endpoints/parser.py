@@ -1,51 +1,224 @@
-from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, HTTPException, Body, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import json
 import os
-from app.services.parser_service import ParserService
+import time
+from app.services.parser_service import ParserService, PARSE_KINDS, PARSE_EXTENSIONS
 from app.core.config import settings
 from pathlib import Path
 from pydantic import BaseModel
-from app.parsers.excel_parser import parse_students as excel_parse_students
+from app.parsers.registry import excel_parser, word_parser
+from app.services.reference_data import reference_cache
+from app.services.result_cache import result_cache
+from app.services.job_queue import job_queue
+from app.services.roster_import import import_roster
+from app.utils.json_stream import ndjson_line, JsonArrayWriter
+from app.utils.serialization import FastJSONResponse
+from app.utils.file_handler import UploadTooLargeError, remove_temp_file
+from app.utils.upload_stream import receive_multipart_upload
+from app.utils.export_writer import EXPORT_FORMATS, export_format, missing_dependency, result_sheets, write_export
 from app.core.config import settings
-import pandas as pd        
 
 router = APIRouter()
 parser_service = ParserService()
 
-EXPORT_DIR = settings.OUTPUT_EXPORT_FOLDER
-
 class ParseStudentsRequest(BaseModel):
     fileName: str
     limit: int = 5
     outputFile: str = None
+    prettyOutput: bool = False
+    stream: bool = False
+
+class ImportStudentsRequest(BaseModel):
+    fileName: str
+    roster: Optional[str] = None
+    dryRun: bool = False
 
 class ParseDisciplinesRequest(BaseModel):
     filename: str
     limit: int = 5
+    stream: bool = False
+    docxBackend: Optional[str] = None
 
 class ParseEducationalProgramsRequest(BaseModel):
     filename: str
+    docxBackend: Optional[str] = None
+
+class BatchItem(BaseModel):
+    filename: str
+    kind: str
+    limit: int = 5
+
+class ParseBatchRequest(BaseModel):
+    items: List[BatchItem]
+    concurrency: Optional[int] = None
+
+class SubmitJobRequest(BaseModel):
+    filename: str
+    kind: str
+    limit: int = 5
 
 class ExportDataRequest(BaseModel):
-    data: list
+    data: Optional[list] = None
+    sheets: Optional[Dict[str, list]] = None
+    resultId: Optional[str] = None
+    outputFile: Optional[str] = None
     filename: str = "exported_data.xlsx"
+    format: Optional[str] = None
+
+
+async def ndjson_stream(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+    summary: Dict[str, Any],
+    output_path: Optional[str] = None,
+    pretty_output: bool = False
+) -> AsyncIterator[str]:
+    """
+    Віддає записи у форматі NDJSON по мірі парсингу. Останній рядок —
+    підсумковий запис з кількістю записів і часом обробки. `summary` читається
+    після останнього пакета, тож парсер може доповнити його (наприклад, result_id).
+    """
+    started = time.perf_counter()
+    first_record_ms = None
+    total = 0
+    writer = None
+
+    try:
+        if output_path:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            writer = JsonArrayWriter(output_path, pretty_output)
+
+        async for batch in batches:
+            if first_record_ms is None and batch:
+                first_record_ms = round((time.perf_counter() - started) * 1000, 2)
+            total += len(batch)
+            if writer:
+                writer.write(batch)
+            yield "".join(ndjson_line(record) for record in batch)
 
+    except Exception as e:
+        yield ndjson_line({
+            "type": "summary",
+            "status": "error",
+            "detail": f"Помилка парсингу файлу: {str(e)}",
+            "total_processed": total,
+            **summary
+        })
+        return
+
+    finally:
+        if writer:
+            writer.close()
+
+    trailer = {
+        "type": "summary",
+        "status": "success",
+        "total_processed": total,
+        **summary,
+        "timings": {
+            "first_record_ms": first_record_ms,
+            "total_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+    }
+    if output_path:
+        trailer["output_file"] = {
+            "path": output_path,
+            "size": os.path.getsize(output_path) if os.path.exists(output_path) else 0,
+            "created": os.path.exists(output_path)
+        }
+    yield ndjson_line(trailer)
+
+def docx_backend_error(backend: Optional[str], debug_info: Dict[str, Any]) -> Optional[JSONResponse]:
+    """Відповідь 400 для невідомого docxBackend або None, якщо бекенд допустимий."""
+    if backend is None or backend in word_parser.DOCX_BACKENDS:
+        return None
+    return JSONResponse(
+        status_code=400,
+        content={
+            "status": "error",
+            "detail": f"Невідомий бекенд DOCX: {backend}",
+            "supported_backends": list(word_parser.DOCX_BACKENDS),
+            "debug_info": debug_info
+        }
+    )
+
+async def load_stored_result(result_id: Optional[str], output_file: Optional[str]) -> Any:
+    """
+    Результат парсингу, збережений на сервері: з кешу результатів за result_id
+    або з JSON-файлу outputFile у директорії OUTPUT_JSON_FOLDER.
+    """
+    if result_id:
+        if not result_cache.is_key(result_id):
+            raise ValueError(f"Некоректний resultId: {result_id}")
+        result = await result_cache.get(result_id)
+        if result is None:
+            raise FileNotFoundError(f"Результат {result_id} не знайдено в кеші (можливо, його витіснено); повторіть парсинг")
+        return result
+
+    # Лише ім'я файлу: читання поза OUTPUT_JSON_FOLDER не дозволяється
+    path = os.path.join(settings.OUTPUT_JSON_FOLDER, os.path.basename(output_file))
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Файл {os.path.basename(output_file)} не знайдено в директорії {settings.OUTPUT_JSON_FOLDER}")
+
+    def read() -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    return await asyncio.to_thread(read)
+
+async def single_batch(records_coro) -> AsyncIterator[List[Dict[str, Any]]]:
+    yield await records_coro
 
 @router.post("/export-data", response_model=Dict[str, Any])
 async def export_data(request_data: ExportDataRequest):
+    """
+    Експорт списку записів (data) або кількох аркушів (sheets: назва -> записи)
+    у xlsx, csv, csv.gz або parquet. Формат — поле format або розширення filename.
+    Файли пишуться потоково, без проміжного DataFrame.
+
+    Замість даних можна передати resultId (повертається ендпоінтами парсингу)
+    або outputFile (JSON-файл, збережений parse-students) — тоді експортується
+    збережений на сервері результат без пересилання даних клієнтом.
+    """
     filename = request_data.filename or "exported_data.xlsx"
     data = request_data.data
+    sheets = request_data.sheets or ({"data": data} if isinstance(data, list) and data else None)
 
-    if not data or not isinstance(data, list):
+    if not sheets and (request_data.resultId or request_data.outputFile):
+        try:
+            sheets = result_sheets(await load_stored_result(request_data.resultId, request_data.outputFile))
+        except FileNotFoundError as e:
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "status": "error",
+                    "detail": str(e)
+                }
+            )
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "detail": str(e)
+                }
+            )
+
+    if not sheets or not any(sheets.values()):
         return JSONResponse(
             status_code=400,
             content={
                 "status": "error",
-                "detail": "Не передані дані для експорту. Потрібен список об'єктів у полі 'data'.",
+                "detail": "Не передані дані для експорту. Потрібен список об'єктів у полі 'data', аркуші у полі 'sheets' або посилання на збережений результат ('resultId' чи 'outputFile').",
                 "required_params": {
                     "data": "Список словників для експорту",
-                    "filename": "Назва файлу для експорту (опціонально)"
+                    "sheets": "Аркуші для експорту: назва аркуша -> список словників (опціонально, замість data)",
+                    "resultId": "Ідентифікатор результату парсингу (опціонально, замість data)",
+                    "outputFile": "JSON-файл результатів з output_json_files (опціонально, замість data)",
+                    "filename": "Назва файлу для експорту (опціонально)",
+                    "format": f"Формат експорту: {', '.join(EXPORT_FORMATS)} (опціонально, за замовчуванням — за розширенням filename)"
                 },
                 "received_params": {
                     "data": data,
@@ -54,20 +227,52 @@ async def export_data(request_data: ExportDataRequest):
             }
         )
 
-    export_path = os.path.join(EXPORT_DIR, filename)
+    try:
+        fmt = export_format(filename, request_data.format)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "detail": str(e),
+                "supported_formats": list(EXPORT_FORMATS)
+            }
+        )
+
+    package = missing_dependency(fmt)
+    if package is not None:
+        return JSONResponse(
+            status_code=501,
+            content={
+                "status": "error",
+                "detail": f"Експорт у {fmt} недоступний: на сервері не встановлено пакет {package}",
+                "supported_formats": [name for name in EXPORT_FORMATS if missing_dependency(name) is None]
+            }
+        )
+
+    if not filename.lower().endswith(EXPORT_FORMATS[fmt]):
+        filename = os.path.splitext(filename)[0] + EXPORT_FORMATS[fmt]
+    export_path = os.path.join(settings.OUTPUT_EXPORT_FOLDER, filename)
 
     try:
-        df = pd.DataFrame(data)
-        df.to_excel(export_path, index=False)
+        started = time.perf_counter()
+        paths = await asyncio.to_thread(write_export, export_path, sheets, fmt)
 
         return JSONResponse(
             status_code=200,
             content={
                 "status": "success",
                 "detail": f"Дані успішно експортовано у файл {filename}",
-                "file_path": export_path,
-                "file_exists": os.path.exists(export_path),
-                "file_size": os.path.getsize(export_path) if os.path.exists(export_path) else 0
+                "format": fmt,
+                "file_path": paths[0],
+                "file_exists": os.path.exists(paths[0]),
+                "file_size": os.path.getsize(paths[0]) if os.path.exists(paths[0]) else 0,
+                "files": [
+                    {"path": path, "size": os.path.getsize(path) if os.path.exists(path) else 0}
+                    for path in paths
+                ],
+                "rows": {name: len(records) for name, records in sheets.items()},
+                "timings": {"total_ms": round((time.perf_counter() - started) * 1000, 1)}
             }
         )
     except Exception as e:
@@ -75,7 +280,7 @@ async def export_data(request_data: ExportDataRequest):
             status_code=500,
             content={
                 "status": "error",
-                "detail": f"Помилка експорту у Excel: {str(e)}",
+                "detail": f"Помилка експорту у {fmt}: {str(e)}",
                 "file_path": export_path
             }
         )
@@ -177,8 +382,22 @@ async def parse_students(request_data: ParseStudentsRequest):
             }
         )
     
+    if request_data.stream:
+        summary = {"limit_applied": limit}
+        return StreamingResponse(
+            ndjson_stream(
+                parser_service.stream_students(file_path, limit, summary),
+                summary,
+                excel_parser.resolve_output_path(output_file) if output_file else None,
+                request_data.prettyOutput
+            ),
+            media_type="application/x-ndjson"
+        )
+    
     try:
-        result_data = await excel_parse_students(file_path, limit, output_file)
+        meta = {}
+        result_data = await parser_service.parse_students(file_path, file_extension, limit, output_file, meta,
+                                                          request_data.prettyOutput)
         
         if isinstance(result_data, tuple) and len(result_data) == 2:
             students, saved_file_path = result_data
@@ -186,6 +405,7 @@ async def parse_students(request_data: ParseStudentsRequest):
             result = {
                 "status": "success", 
                 "data": students,
+                **meta,
                 "output_file": {
                     "path": saved_file_path,
                     "size": os.path.getsize(saved_file_path) if os.path.exists(saved_file_path) else 0,
@@ -197,7 +417,8 @@ async def parse_students(request_data: ParseStudentsRequest):
             
             result = {
                 "status": "success", 
-                "data": students
+                "data": students,
+                **meta
             }
             
             if output_file:
@@ -219,7 +440,7 @@ async def parse_students(request_data: ParseStudentsRequest):
                         "error": "Файл не було створено"
                     }
         
-        return result
+        return FastJSONResponse(content=result)
 
     except Exception as e:
         error_message = str(e)
@@ -248,6 +469,50 @@ async def parse_students(request_data: ParseStudentsRequest):
             }
         )
 
+@router.post("/import-students", response_model=Dict[str, Any])
+async def import_students(request_data: ImportStudentsRequest):
+    """
+    Інкрементальний імпорт списку студентів: повертає лише студентів, доданих,
+    змінених (з переліком змінених полів) і вилучених відносно попереднього
+    імпорту того самого списку (roster, за замовчуванням — ім'я файлу).
+    Перший імпорт повертає всіх студентів як доданих. З dryRun відбитки не оновлюються.
+    """
+    filename = request_data.fileName
+    file_extension = os.path.splitext(filename)[1].lower()
+
+    if file_extension != '.xlsx':
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "detail": f"Непідтримуваний формат файлу: {file_extension}. Для імпорту студентів підтримуються тільки файли Excel (.xlsx)",
+                "supported_formats": [".xlsx"],
+                "received_format": file_extension
+            }
+        )
+
+    file_path = os.path.join(settings.FILES_DIRECTORY, filename)
+    if not os.path.exists(file_path):
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "error",
+                "detail": f"Файл {filename} не знайдено в директорії {settings.FILES_DIRECTORY}"
+            }
+        )
+
+    try:
+        result = await import_roster(parser_service, file_path, request_data.roster, request_data.dryRun)
+        return FastJSONResponse(content={"status": "success", **result})
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "detail": f"Помилка імпорту списку студентів: {str(e)}"
+            }
+        )
+
 @router.post("/parse-disciplines", response_model=Dict[str, Any])
 async def parse_disciplines(request_data: ParseDisciplinesRequest):
     filename = request_data.filename
@@ -281,6 +546,10 @@ async def parse_disciplines(request_data: ParseDisciplinesRequest):
             }
         )
     
+    backend_error = docx_backend_error(request_data.docxBackend, debug_info)
+    if backend_error:
+        return backend_error
+    
     file_path = os.path.join(settings.FILES_DIRECTORY, filename)
     
     if not os.path.exists(file_path):
@@ -305,15 +574,28 @@ async def parse_disciplines(request_data: ParseDisciplinesRequest):
             }
         )
     
+    if request_data.stream:
+        summary = {"limit_applied": limit}
+        return StreamingResponse(
+            ndjson_stream(
+                single_batch(parser_service.parse_disciplines(file_path, file_extension, limit,
+                                                              request_data.docxBackend, summary)),
+                summary
+            ),
+            media_type="application/x-ndjson"
+        )
+    
     try:
-        disciplines = await parser_service.parse_disciplines(file_path, file_extension, limit)
+        meta = {}
+        disciplines = await parser_service.parse_disciplines(file_path, file_extension, limit, request_data.docxBackend, meta)
         
-        return {
+        return FastJSONResponse(content={
             "status": "success",
             "disciplines": disciplines,
             "total_processed": len(disciplines),
-            "limit_applied": limit
-        }
+            "limit_applied": limit,
+            **meta
+        })
     
     except Exception as e:
         error_message = str(e)
@@ -358,6 +640,10 @@ async def parse_educational_programs(request_data: ParseEducationalProgramsReque
             }
         )
     
+    backend_error = docx_backend_error(request_data.docxBackend, debug_info)
+    if backend_error:
+        return backend_error
+    
     file_path = os.path.join(settings.FILES_DIRECTORY, filename)
     
     if not os.path.exists(file_path):
@@ -383,12 +669,16 @@ async def parse_educational_programs(request_data: ParseEducationalProgramsReque
         )
     
     try:
-        result = await parser_service.parse_educational_programs(file_path, file_extension)
+        timings = {}
+        meta = {}
+        result = await parser_service.parse_educational_programs(file_path, file_extension, timings, request_data.docxBackend, meta)
         
-        return {
+        return FastJSONResponse(content={
             "status": "success",
-            **result
-        }
+            **result,
+            **meta,
+            "timings": timings
+        })
     
     except Exception as e:
         error_message = str(e)
@@ -402,6 +692,288 @@ async def parse_educational_programs(request_data: ParseEducationalProgramsReque
             }
         )
     
+@router.post("/parse-batch", response_model=Dict[str, Any])
+async def parse_batch(request_data: ParseBatchRequest):
+    """
+    Пакетний парсинг файлів з FILES_DIRECTORY. Елемент: {"filename", "kind", "limit"},
+    де kind — "students", "disciplines" або "educational-programs".
+    Файли розбираються одночасно (не більше concurrency за раз; значення обмежується
+    BATCH_CONCURRENCY, воно ж за замовчуванням), помилки повертаються окремо для кожного файлу.
+    """
+    if not request_data.items:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "detail": "Не вказано жодного файлу для пакетного парсингу",
+                "supported_kinds": list(PARSE_KINDS)
+            }
+        )
+    
+    concurrency = max(1, min(request_data.concurrency or settings.BATCH_CONCURRENCY, settings.BATCH_CONCURRENCY))
+    started = time.perf_counter()
+    
+    results = await parser_service.parse_batch(
+        [item.model_dump() for item in request_data.items],
+        concurrency
+    )
+    
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    
+    return FastJSONResponse(content={
+        "status": "success" if succeeded == len(results) else "partial" if succeeded else "error",
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "concurrency": concurrency,
+        "results": results,
+        "timings": {
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "sum_parse_ms": round(sum(result["timings"]["parse_ms"] for result in results), 1)
+        }
+    })
+
+@router.post("/upload-and-parse")
+async def upload_and_parse(request: Request, kind: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Завантаження файлу (multipart/form-data, поле з файлом) і його парсинг.
+    kind і limit передаються параметрами запиту або полями форми.
+    Файл приймається потоково з обмеженням UPLOAD_MAX_BYTES. Файли до UPLOAD_MEMORY_MAX_BYTES
+    парсяться з пам'яті без тимчасового файлу, більші записуються на диск і видаляються
+    після парсингу; sha256 рахується під час прийому (пошук у кеші результатів не перечитує файл).
+    """
+    max_bytes = settings.UPLOAD_MAX_BYTES
+    
+    if kind is not None and kind not in PARSE_KINDS:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "detail": f"Невідомий тип парсингу: {kind}",
+                "supported_kinds": list(PARSE_KINDS)
+            }
+        )
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + 64 * 1024:
+        return JSONResponse(
+            status_code=413,
+            content={
+                "status": "error",
+                "detail": f"Файл перевищує максимальний розмір {max_bytes} байт",
+                "max_bytes": max_bytes
+            }
+        )
+    
+    allowed_extensions = PARSE_EXTENSIONS[kind] if kind else {ext for exts in PARSE_EXTENSIONS.values() for ext in exts}
+    started = time.perf_counter()
+    
+    try:
+        upload = await receive_multipart_upload(
+            request.headers.get("content-type", ""), request.stream(), max_bytes, allowed_extensions,
+            settings.UPLOAD_MEMORY_MAX_BYTES
+        )
+    except UploadTooLargeError as e:
+        return JSONResponse(
+            status_code=413,
+            content={"status": "error", "detail": str(e), "max_bytes": max_bytes}
+        )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "detail": f"Некоректне завантаження: {str(e)}"}
+        )
+    
+    uploaded = time.perf_counter()
+    
+    try:
+        kind = kind or upload.fields.get("kind")
+        if kind not in PARSE_KINDS:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "detail": f"Невідомий тип парсингу: {kind}",
+                    "supported_kinds": list(PARSE_KINDS)
+                }
+            )
+        
+        extension = os.path.splitext(upload.filename)[1].lower()
+        if extension not in PARSE_EXTENSIONS[kind]:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "detail": f"Непідтримуваний формат файлу для {kind}: {extension}",
+                    "supported_formats": list(PARSE_EXTENSIONS[kind])
+                }
+            )
+        
+        if limit is None:
+            limit_field = upload.fields.get("limit", "5").strip()
+            if not limit_field.isdigit():
+                return JSONResponse(
+                    status_code=400,
+                    content={
+                        "status": "error",
+                        "detail": f"Поле limit має бути невід'ємним цілим числом, отримано: {limit_field}"
+                    }
+                )
+            limit = int(limit_field)
+        timings = {}
+        meta = {}
+        result = await parser_service.parse_file(upload.source, kind, limit, timings, meta)
+        
+        return FastJSONResponse(content={
+            "status": "success",
+            "upload": {
+                "filename": upload.filename,
+                "size": upload.size,
+                "sha256": upload.sha256,
+                "in_memory": upload.path is None
+            },
+            **result,
+            **meta,
+            "timings": {
+                **timings,
+                "upload_ms": round((uploaded - started) * 1000, 1),
+                "parse_ms": round((time.perf_counter() - uploaded) * 1000, 1)
+            }
+        })
+    
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "detail": f"Помилка парсингу файлу: {str(e)}",
+                "upload": {"filename": upload.filename, "size": upload.size}
+            }
+        )
+    
+    finally:
+        if upload.path is not None:
+            await remove_temp_file(upload.path)
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request_data: SubmitJobRequest):
+    """
+    Ставить парсинг файлу в чергу і одразу повертає id завдання.
+    Стан — GET /jobs/{job_id}, результат — GET /jobs/{job_id}/result.
+    """
+    if request_data.kind not in PARSE_KINDS:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "detail": f"Невідомий тип парсингу: {request_data.kind}",
+                "supported_kinds": list(PARSE_KINDS)
+            }
+        )
+    
+    extension = os.path.splitext(request_data.filename)[1].lower()
+    if extension not in PARSE_EXTENSIONS[request_data.kind]:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "detail": f"Непідтримуваний формат файлу для {request_data.kind}: {extension}",
+                "supported_formats": list(PARSE_EXTENSIONS[request_data.kind])
+            }
+        )
+    
+    if not os.path.exists(os.path.join(settings.FILES_DIRECTORY, request_data.filename)):
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "error",
+                "detail": f"Файл {request_data.filename} не знайдено в директорії {settings.FILES_DIRECTORY}"
+            }
+        )
+    
+    job = await job_queue.submit(request_data.kind, request_data.filename, {"limit": request_data.limit})
+    return {
+        "status": "accepted",
+        "job_id": job["id"],
+        "job": job
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(job_queue.store.get, job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "detail": f"Завдання {job_id} не знайдено"}
+        )
+    return {"status": "success", "job": job}
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await asyncio.to_thread(job_queue.store.get, job_id, True)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "detail": f"Завдання {job_id} не знайдено"}
+        )
+    
+    if job["status"] == "failed":
+        return JSONResponse(
+            status_code=500,
+            content={"status": "error", "detail": f"Помилка парсингу файлу: {job['error']}", "job_id": job_id}
+        )
+    
+    if job["status"] != "done":
+        return JSONResponse(
+            status_code=409,
+            content={
+                "status": "pending",
+                "detail": "Результат ще не готовий",
+                "job_status": job["status"],
+                "attempts": job["attempts"]
+            }
+        )
+    
+    return FastJSONResponse(content={
+        "status": "success",
+        "job_id": job_id,
+        **job["result"]
+    })
+
+@router.get("/reference-cache")
+async def reference_cache_status():
+    return {
+        "status": "success",
+        **reference_cache.status()
+    }
+
+@router.post("/reference-cache/invalidate")
+async def invalidate_reference_cache():
+    """Скидає кеш довідників і повертає його вік на момент скидання"""
+    previous = reference_cache.invalidate()
+    return {
+        "status": "success",
+        "detail": "Кеш довідників скинуто, наступний запит завантажить їх заново",
+        "invalidated_age_seconds": previous["age_seconds"],
+        "invalidated_fetched_at": previous["fetched_at"]
+    }
+
+@router.get("/result-cache")
+async def result_cache_status():
+    return {
+        "status": "success",
+        **result_cache.stats()
+    }
+
+@router.post("/result-cache/clear")
+async def clear_result_cache():
+    removed = await result_cache.clear()
+    return {
+        "status": "success",
+        "detail": f"Видалено записів з кешу результатів: {removed}",
+        "removed": removed
+    }
+
 @router.get("/debug/files")
 async def list_files():
     files = []
@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 from pathlib import Path
-import sys
+from typing import Dict
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -14,6 +14,49 @@ class Settings(BaseSettings):
     OUTPUT_JSON_FOLDER: str = str(BASE_DIR / "output_json_files")
     OUTPUT_EXPORT_FOLDER: str = str(BASE_DIR / "output_export_files")
 
+    REFERENCE_API_URL: str = "https://localhost:7011"
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 20
+
+    CACHE_FOLDER: str = str(BASE_DIR / "cache")
+    REFERENCE_CACHE_TTL: float = 3600.0
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    DOCUMENT_CACHE_ENABLED: bool = True
+    DOCUMENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    STREAM_BATCH_SIZE: int = 1000
+    BATCH_CONCURRENCY: int = 4
+
+    WATCHER_ENABLED: bool = False
+    WATCHER_POLL_INTERVAL: float = 5.0
+    WATCHER_DEBOUNCE: float = 2.0
+    WATCHER_LIMIT: int = 5
+
+    JOB_WORKERS: int = 2
+    # Оренда завдання: процес-виконавець продовжує її, доки працює; прострочене завдання повертається в чергу
+    JOB_LEASE_SECONDS: float = 60.0
+    # Після стількох запусків, перерваних аварійним завершенням процесу, завдання вважається невдалим
+    JOB_MAX_ATTEMPTS: int = 3
+
+    UPLOAD_MAX_BYTES: int = 50 * 1024 * 1024
+    # Завантаження до цього розміру парсяться з пам'яті, більші записуються в UPLOAD_FOLDER
+    UPLOAD_MEMORY_MAX_BYTES: int = 2 * 1024 * 1024
+
+    DATA_STORE_ENABLED: bool = True
+
+    PARSER_POOL_KIND: str = "process"
+    PARSER_POOL_SIZE: int = 0
+    # Імпортувати парсери в основному процесі та воркерах пулу під час старту, а не при першому запиті
+    PARSER_WARMUP: bool = False
+
+    # Паралельне витягування сторінок PDF вмикається явно: кількість процесів на один розбір
+    # (0 — вимкнено). Має сенс, коли PARSER_POOL_SIZE менший за кількість ядер
+    PDF_PARALLEL_PAGE_THRESHOLD: int = 60
+    PDF_PARALLEL_WORKERS: int = 0
+
+    DOCX_BACKEND: str = "python-docx"
+
     database_url: str = "sqlite:///./test.db"
     secret_key: str = "your_secret_key"
 
@@ -24,79 +67,16 @@ class Settings(BaseSettings):
         env_prefix=""
     )
 
-print(f"Python version: {sys.version}")
-print(f"Current working directory: {os.getcwd()}")
-print(f"Base directory: {BASE_DIR}")
-
 try:
     settings = Settings()
     
     env_files_dir = os.environ.get("FILES_DIRECTORY")
     if env_files_dir:
         settings.FILES_DIRECTORY = env_files_dir
-        print(f"Overriding FILES_DIRECTORY from environment variable: {settings.FILES_DIRECTORY}")
 
     env_upload_folder = os.environ.get("UPLOAD_FOLDER")
     if env_upload_folder:
         settings.UPLOAD_FOLDER = env_upload_folder
-        print(f"Overriding UPLOAD_FOLDER from environment variable: {settings.UPLOAD_FOLDER}")
-    
-    print(f"Settings loaded successfully")
-    print(f"DEBUG mode: {settings.DEBUG}")
-    print(f"FILES_DIRECTORY: {settings.FILES_DIRECTORY}")
-    print(f"UPLOAD_FOLDER: {settings.UPLOAD_FOLDER}")
-    
-    for directory in [
-        settings.FILES_DIRECTORY,
-        settings.UPLOAD_FOLDER,
-        settings.OUTPUT_JSON_FOLDER,
-        settings.OUTPUT_EXPORT_FOLDER 
-    ]:
-        print(f"Checking directory: {directory}")
-        print(f"Directory exists: {os.path.exists(directory)}")
-        if not os.path.exists(directory):
-            try:
-                os.makedirs(directory, exist_ok=True)
-                print(f"Created directory: {directory}")
-            except Exception as e:
-                print(f"Error creating directory {directory}: {e}")
-                import tempfile
-                temp_dir = tempfile.gettempdir()
-                alt_dir = os.path.join(temp_dir, os.path.basename(directory))
-                print(f"Trying alternative directory: {alt_dir}")
-                os.makedirs(alt_dir, exist_ok=True)
-                if directory == settings.FILES_DIRECTORY:
-                    settings.FILES_DIRECTORY = alt_dir
-                elif directory == settings.UPLOAD_FOLDER:
-                    settings.UPLOAD_FOLDER = alt_dir
-                elif directory == settings.OUTPUT_JSON_FOLDER:
-                    settings.OUTPUT_JSON_FOLDER = alt_dir
-                elif directory == settings.OUTPUT_EXPORT_FOLDER:
-                    settings.OUTPUT_EXPORT_FOLDER = alt_dir
-                print(f"Using alternative directory: {alt_dir}")
-    
-    for directory in [settings.FILES_DIRECTORY, settings.UPLOAD_FOLDER, settings.OUTPUT_JSON_FOLDER]:
-        try:
-            test_file_path = os.path.join(directory, "test_write.txt")
-            with open(test_file_path, "w") as f:
-                f.write("Test write access")
-            os.remove(test_file_path)
-            print(f"Write access to {directory} confirmed")
-        except Exception as e:
-            print(f"Warning: Cannot write to directory {directory}: {e}")
-            
-            import tempfile
-            temp_dir = tempfile.gettempdir()
-            alt_dir = os.path.join(temp_dir, os.path.basename(directory))
-            print(f"Trying alternative directory for writing: {alt_dir}")
-            os.makedirs(alt_dir, exist_ok=True)
-            
-            if directory == settings.FILES_DIRECTORY:
-                settings.FILES_DIRECTORY = alt_dir
-            elif directory == settings.UPLOAD_FOLDER:
-                settings.UPLOAD_FOLDER = alt_dir
-                
-            print(f"Using alternative directory for writing: {alt_dir}")
 
 except Exception as e:
     print(f"Error loading settings: {e}")
@@ -107,27 +87,87 @@ except Exception as e:
         UPLOAD_FOLDER = str(BASE_DIR / "uploads")
         OUTPUT_JSON_FOLDER = str(BASE_DIR / "output_json_files")
         OUTPUT_EXPORT_FOLDER = str(BASE_DIR / "output_export_files")
+        REFERENCE_API_URL = "https://localhost:7011"
+        HTTP_TIMEOUT = 30.0
+        HTTP_MAX_CONNECTIONS = 20
+        CACHE_FOLDER = str(BASE_DIR / "cache")
+        REFERENCE_CACHE_TTL = 3600.0
+        RESULT_CACHE_ENABLED = True
+        RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+        DOCUMENT_CACHE_ENABLED = True
+        DOCUMENT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+        STREAM_BATCH_SIZE = 1000
+        BATCH_CONCURRENCY = 4
+        WATCHER_ENABLED = False
+        WATCHER_POLL_INTERVAL = 5.0
+        WATCHER_DEBOUNCE = 2.0
+        WATCHER_LIMIT = 5
+        JOB_WORKERS = 2
+        JOB_LEASE_SECONDS = 60.0
+        JOB_MAX_ATTEMPTS = 3
+        UPLOAD_MAX_BYTES = 50 * 1024 * 1024
+        UPLOAD_MEMORY_MAX_BYTES = 2 * 1024 * 1024
+        DATA_STORE_ENABLED = True
+        PARSER_POOL_KIND = "process"
+        PARSER_POOL_SIZE = 0
+        PARSER_WARMUP = False
+        PDF_PARALLEL_PAGE_THRESHOLD = 60
+        PDF_PARALLEL_WORKERS = 0
+        DOCX_BACKEND = "python-docx"
         database_url = "sqlite:///./test.db"
         secret_key = "default_fallback_key"
     settings = FallbackSettings()
     print(f"Using fallback settings")
-    
-    for directory in [settings.FILES_DIRECTORY, settings.UPLOAD_FOLDER]:
-        if not os.path.exists(directory):
-            try:
-                os.makedirs(directory, exist_ok=True)
-                print(f"Created directory: {directory}")
-            except Exception as e:
-                print(f"Error creating directory {directory}: {e}")
-                
-                import tempfile
-                temp_dir = tempfile.gettempdir()
-                alt_dir = os.path.join(temp_dir, os.path.basename(directory))
-                os.makedirs(alt_dir, exist_ok=True)
-                
-                if directory == settings.FILES_DIRECTORY:
-                    settings.FILES_DIRECTORY = alt_dir
-                elif directory == settings.UPLOAD_FOLDER:
-                    settings.UPLOAD_FOLDER = alt_dir
-                    
-                print(f"Using temporary directory: {alt_dir}")
\ No newline at end of file
+
+# Атрибути settings з робочими директоріями; prepare_directories створює їх під час старту
+DIRECTORY_SETTINGS = ("FILES_DIRECTORY", "UPLOAD_FOLDER", "OUTPUT_JSON_FOLDER", "OUTPUT_EXPORT_FOLDER", "CACHE_FOLDER")
+# Директорії, для яких додатково перевіряється право запису
+WRITABLE_DIRECTORY_SETTINGS = ("FILES_DIRECTORY", "UPLOAD_FOLDER", "OUTPUT_JSON_FOLDER")
+
+
+def directory_settings() -> Dict[str, str]:
+    """Поточні робочі директорії (після prepare_directories) для передачі воркерам пулу."""
+    return {name: getattr(settings, name) for name in DIRECTORY_SETTINGS}
+
+
+def apply_directory_settings(directories: Dict[str, str]) -> None:
+    """Ініціалізатор воркера пулу: ті самі директорії, що обрав основний процес."""
+    for name, directory in directories.items():
+        setattr(settings, name, directory)
+
+
+def _use_temp_directory(name: str, directory: str) -> None:
+    import tempfile
+    alt_dir = os.path.join(tempfile.gettempdir(), os.path.basename(directory))
+    os.makedirs(alt_dir, exist_ok=True)
+    setattr(settings, name, alt_dir)
+    print(f"Using alternative directory for {name}: {alt_dir}")
+
+
+def prepare_directories() -> None:
+    """
+    Створює робочі директорії і перевіряє право запису; недоступні замінюються
+    директоріями в системному tempdir. Імпорт модуля нічого не змінює на диску —
+    функція викликається явно під час старту застосунку (lifespan в app.main).
+    """
+    for name in DIRECTORY_SETTINGS:
+        directory = getattr(settings, name)
+        if os.path.exists(directory):
+            continue
+        try:
+            os.makedirs(directory, exist_ok=True)
+            print(f"Created directory: {directory}")
+        except Exception as e:
+            print(f"Error creating directory {directory}: {e}")
+            _use_temp_directory(name, directory)
+
+    for name in WRITABLE_DIRECTORY_SETTINGS:
+        directory = getattr(settings, name)
+        try:
+            test_file_path = os.path.join(directory, "test_write.txt")
+            with open(test_file_path, "w") as f:
+                f.write("Test write access")
+            os.remove(test_file_path)
+        except Exception as e:
+            print(f"Warning: Cannot write to directory {directory}: {e}")
+            _use_temp_directory(name, directory)
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+import os
+import sqlite3
+
+
+def sqlite_path(database_url: str) -> str:
+    """Шлях до файлу бази з URL виду sqlite:///./test.db або sqlite:////abs/path.db."""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Підтримуються лише бази SQLite (sqlite:///...), отримано: {database_url}")
+    return database_url[len(prefix):]
+
+
+class SQLiteDatabase:
+    """
+    Базовий клас сховищ у базі settings.database_url. Схема (`schema`)
+    створюється при першому з'єднанні; методи нащадків синхронні,
+    тож з асинхронного коду їх викликають через asyncio.to_thread.
+    """
+
+    schema = ""
+    # Колонки, додані до таблиць пізніше (таблиця, колонка, визначення): у наявних базах
+    # CREATE TABLE IF NOT EXISTS їх не створить, тому вони додаються через ALTER TABLE
+    added_columns: Tuple[Tuple[str, str, str], ...] = ()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._initialized = False
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """З'єднання на одну операцію: транзакція фіксується при виході, з'єднання закривається."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                connection.executescript(self.schema)
+                self._add_columns(connection)
+                self._initialized = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _add_columns(self, connection: sqlite3.Connection) -> None:
+        for table, column, definition in self.added_columns:
+            existing = {row["name"] for row in connection.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
@@ -0,0 +1,89 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+import asyncio
+import multiprocessing
+import os
+from app.core.config import settings, apply_directory_settings, directory_settings
+
+_executor: Optional[Executor] = None
+
+
+def pool_size() -> int:
+    """Кількість воркерів пулу парсерів (PARSER_POOL_SIZE або кількість CPU)."""
+    return settings.PARSER_POOL_SIZE or os.cpu_count() or 1
+
+
+def _create_thread_pool() -> Executor:
+    return ThreadPoolExecutor(max_workers=pool_size(), thread_name_prefix="parser")
+
+
+def _create_executor() -> Executor:
+    if settings.PARSER_POOL_KIND != "process":
+        return _create_thread_pool()
+    try:
+        return ProcessPoolExecutor(
+            max_workers=pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+            # Воркери імпортують config заново; замінені під час старту директорії передаються явно
+            initializer=apply_directory_settings,
+            initargs=(directory_settings(),)
+        )
+    except (OSError, NotImplementedError, ValueError) as e:
+        print(f"Не вдалося створити пул процесів, використовується пул потоків: {str(e)}")
+        return _create_thread_pool()
+
+
+def get_executor() -> Executor:
+    """Повертає спільний пул для CPU-завдань парсингу (створюється при першому зверненні)."""
+    global _executor
+    if _executor is None:
+        _executor = _create_executor()
+    return _executor
+
+
+def start_executor() -> Executor:
+    return get_executor()
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+def executor_info() -> dict:
+    executor = get_executor()
+    return {
+        "kind": "process" if isinstance(executor, ProcessPoolExecutor) else "thread",
+        "max_workers": pool_size()
+    }
+
+
+async def run_in_executor(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Виконує синхронну функцію парсера в пулі, не блокуючи цикл подій.
+    Якщо пул процесів зламався (наприклад, воркер аварійно завершився),
+    переходить на пул потоків і повторює виклик.
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_executor(), func, *args)
+    except BrokenProcessPool:
+        print("Пул процесів парсерів зламано, переходжу на пул потоків")
+        shutdown_executor()
+        _executor = _create_thread_pool()
+        return await loop.run_in_executor(_executor, func, *args)
+
+
+async def warm_up_executor(func: Callable[..., Any], *args: Any) -> List[Any]:
+    """
+    Виконує func у пулі стільки разів, скільки в ньому воркерів, щоб процеси
+    запустилися й імпортували потрібні модулі ще до першого запиту.
+    Розподіл викликів між воркерами не гарантується.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    return await asyncio.gather(*(loop.run_in_executor(executor, func, *args) for _ in range(pool_size())))
@@ -0,0 +1,41 @@
+from typing import Optional
+import httpx
+from app.core.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        verify=False,
+        timeout=settings.HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS
+        )
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Створює спільний HTTP-клієнт застосунку (викликається з lifespan)."""
+    return get_http_client()
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Повертає спільний HTTP-клієнт з пулом keep-alive з'єднань.
+
+    Якщо застосунок запущено без lifespan (скрипти, тести), клієнт
+    створюється при першому зверненні.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
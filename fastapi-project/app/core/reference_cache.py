@@ -0,0 +1,152 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+ReferenceMaps = Tuple[Dict[str, int], Dict[str, int], Dict[str, int], Dict[str, Dict[str, int]]]
+
+# Після невдалого оновлення не звертаємося до upstream частіше, ніж раз на цей інтервал
+RETRY_INTERVAL = 30.0
+
+
+class ReferenceDataCache:
+    """
+    Кеш довідників (факультети, ступені, форми навчання, групи).
+
+    - дані вважаються свіжими протягом `ttl` секунд;
+    - одночасні запити при порожньому кеші чекають на одне спільне завантаження;
+    - застарілі дані віддаються одразу, а оновлення запускається у фоні;
+    - після невдалого завантаження upstream не опитується частіше, ніж раз на
+      RETRY_INTERVAL: якщо даних немає, запити до того отримують ту саму помилку;
+    - після кожного успішного оновлення дані зберігаються у файл-знімок,
+      який завантажується при старті сервісу.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[ReferenceMaps]], ttl: float,
+                 snapshot_path: Union[str, Callable[[], str], None] = None):
+        self._loader = loader
+        self.ttl = ttl
+        self._snapshot_path = snapshot_path
+        self._data: Optional[ReferenceMaps] = None
+        self._fetched_at: Optional[float] = None
+        self.fingerprint: Optional[str] = None
+        self._retry_after = 0.0
+        self._last_error: Optional[Exception] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _set_data(self, data: Optional[ReferenceMaps], fetched_at: Optional[float]) -> None:
+        self._data = data
+        self._fetched_at = fetched_at
+        self.fingerprint = None
+        if data is not None:
+            # Відбиток вмісту довідників: входить у ключі кешу результатів парсингу студентів
+            payload = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+            self.fingerprint = hashlib.sha256(payload).hexdigest()[:16]
+
+    @property
+    def snapshot_path(self) -> Optional[str]:
+        """Шлях знімка; функція обчислюється при кожному зверненні (каталог визначається під час старту)."""
+        return self._snapshot_path() if callable(self._snapshot_path) else self._snapshot_path
+
+    @property
+    def age(self) -> Optional[float]:
+        if self._fetched_at is None:
+            return None
+        return max(0.0, time.time() - self._fetched_at)
+
+    @property
+    def is_stale(self) -> bool:
+        age = self.age
+        return age is None or age >= self.ttl
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._data is not None,
+            "fetched_at": self._fetched_at,
+            "age_seconds": self.age,
+            "ttl_seconds": self.ttl,
+            "stale": self.is_stale,
+            "fingerprint": self.fingerprint,
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+            "snapshot_path": self.snapshot_path
+        }
+
+    async def get(self) -> ReferenceMaps:
+        if self._data is not None:
+            if self.is_stale and time.time() >= self._retry_after:
+                self._start_refresh()
+            return self._data
+
+        if self._last_error is not None and time.time() < self._retry_after:
+            # Без traceback попередніх викликів, щоб він не накопичувався між повторами
+            raise self._last_error.with_traceback(None)
+        return await asyncio.shield(self._start_refresh())
+
+    def invalidate(self) -> Dict[str, Any]:
+        """Скидає дані у пам'яті; наступний запит завантажить довідники заново."""
+        previous = self.status()
+        self._set_data(None, None)
+        self._retry_after = 0.0
+        self._last_error = None
+        return previous
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._set_data((
+                snapshot["faculties"],
+                snapshot["degrees"],
+                snapshot["study_forms"],
+                snapshot["groups"]
+            ), float(snapshot["fetched_at"]))
+            print(f"Завантажено знімок довідників: {self.snapshot_path}")
+            return True
+        except Exception as e:
+            print(f"Помилка при читанні знімка довідників {self.snapshot_path}: {str(e)}")
+            return False
+
+    def _save_snapshot(self, data: ReferenceMaps, fetched_at: float) -> None:
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "fetched_at": fetched_at,
+                "faculties": data[0],
+                "degrees": data[1],
+                "study_forms": data[2],
+                "groups": data[3]
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> ReferenceMaps:
+        try:
+            data = tuple(await self._loader())
+        except Exception as e:
+            self._retry_after = time.time() + RETRY_INTERVAL
+            if self._data is None:
+                self.load_snapshot()
+            if self._data is None:
+                self._last_error = e
+                raise
+            print(f"Не вдалося оновити довідники, використовуються збережені дані: {str(e)}")
+            return self._data
+
+        fetched_at = time.time()
+        self._last_error = None
+        self._set_data(data, fetched_at)
+        if self.snapshot_path:
+            try:
+                await asyncio.to_thread(self._save_snapshot, data, fetched_at)
+            except Exception as e:
+                print(f"Помилка при збереженні знімка довідників: {str(e)}")
+        return data
@@ -0,0 +1,25 @@
+from typing import Any, Dict
+import os
+import sys
+import time
+
+# Бібліотеки, що помітно сповільнюють імпорт; звіт показує, які з них уже завантажені
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "PyPDF2", "docx", "lxml", "pyarrow")
+
+_stages: Dict[str, float] = {}
+
+
+def record_stage(stage: str, started: float) -> float:
+    """Запам'ятовує тривалість етапу старту (від `started` за time.perf_counter до зараз) у мс."""
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    _stages[stage] = elapsed
+    return elapsed
+
+
+def startup_report() -> Dict[str, Any]:
+    """Звіт про старт процесу: тривалості етапів і вже імпортовані важкі бібліотеки."""
+    return {
+        "pid": os.getpid(),
+        "stages_ms": dict(_stages),
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in sys.modules]
+    }
@@ -1,13 +1,61 @@
+import time
+
+# Початок імпорту застосунку: тривалість імпорту потрапляє у звіт про старт (/health)
+IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
-from app.api.endpoints import parser
+from app.api.endpoints import parser, data
+from app.core.http_client import start_http_client, close_http_client
+from app.core.executor import start_executor, shutdown_executor, executor_info, warm_up_executor
+from app.core.config import settings, prepare_directories
+from app.core.startup import record_stage, startup_report
+from app.parsers.registry import load_parsers, parsers_status, pdf_parser
+from app.services.reference_data import reference_cache
+from app.services.directory_watcher import directory_watcher
+from app.services.job_queue import job_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    prepare_directories()
+    await start_http_client()
+    start_executor()
+    if settings.PARSER_WARMUP:
+        warmup_started = time.perf_counter()
+        await asyncio.to_thread(load_parsers)
+        await warm_up_executor(load_parsers)
+        record_stage("warmup", warmup_started)
+    reference_cache.load_snapshot()
+    await job_queue.start()
+    if settings.WATCHER_ENABLED:
+        await directory_watcher.start()
+    record_stage("startup", started)
+    report = startup_report()
+    print(f"Сервіс запущено (pid {report['pid']}): етапи {report['stages_ms']} мс, "
+          f"завантажені бібліотеки: {', '.join(report['heavy_modules_loaded']) or 'немає'}")
+    try:
+        yield
+    finally:
+        await directory_watcher.stop()
+        await job_queue.stop()
+        shutdown_executor()
+        if pdf_parser.loaded:
+            pdf_parser.shutdown_extraction_pool()
+        await close_http_client()
+
 
 app = FastAPI(
     title="Document Parser Microservice",
     description="Мікросервіс для парсингу документів різних форматів (Excel, PDF, Word)",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.include_router(parser.router, prefix="/api", tags=["parser"])
+app.include_router(data.router, prefix="/api", tags=["data"])
 
 @app.get("/", tags=["root"])
 async def root():
@@ -15,4 +63,13 @@ async def root():
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "parser_pool": executor_info(),
+        "watcher": directory_watcher.status(),
+        "parsers": parsers_status(),
+        "jobs": await job_queue.status(),
+        "startup": startup_report()
+    }
+
+record_stage("import", IMPORT_STARTED)
@@ -0,0 +1,99 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+import os
+from app.core.config import settings
+from app.services.result_cache import ResultCache
+from app.utils.file_handler import Source, source_sha256
+
+# Змінюйте при зміні способу побудови моделі: версія входить у ключ кешу
+DOCUMENT_MODEL_VERSION = 2
+
+
+class DocumentModel:
+    """
+    Нормалізоване подання документа, спільне для всіх екстракторів.
+
+    Для DOCX заповнюються `paragraphs` (текст абзаців по порядку) і `tables`
+    (таблиці як сітки рядків з уже обрізаними пробілами, по одному рядку
+    на кожну клітинку row.cells), а `table_positions[i]` — кількість абзаців
+    перед i-ю таблицею, що зберігає порядок тіла документа. Для PDF заповнюються `pages` — тексти
+    сторінок по порядку; модель може бути частковою, якщо попередній розбір
+    завершився раніше, тоді `page_count` більший за len(pages).
+    """
+
+    def __init__(self, paragraphs: Optional[List[str]] = None, tables: Optional[List[List[List[str]]]] = None,
+                 pages: Optional[List[str]] = None, page_count: Optional[int] = None,
+                 table_positions: Optional[List[int]] = None):
+        self.paragraphs = paragraphs or []
+        self.tables = tables or []
+        self.table_positions = table_positions or []
+        self.pages = pages or []
+        self.page_count = page_count
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.paragraphs)
+
+    def iter_body(self) -> Iterator[Union[str, List[List[str]]]]:
+        """Абзаци (str) і таблиці (сітки) тіла документа в порядку появи."""
+        paragraph_idx = 0
+        for table, position in zip(self.tables, self.table_positions):
+            yield from self.paragraphs[paragraph_idx:position]
+            paragraph_idx = max(paragraph_idx, position)
+            yield table
+        yield from self.paragraphs[paragraph_idx:]
+
+    @property
+    def is_complete(self) -> bool:
+        return self.page_count is None or len(self.pages) >= self.page_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "paragraphs": self.paragraphs,
+            "tables": self.tables,
+            "table_positions": self.table_positions,
+            "pages": self.pages,
+            "page_count": self.page_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DocumentModel":
+        return cls(data["paragraphs"], data["tables"], data["pages"], data["page_count"], data["table_positions"])
+
+
+# Воркери пулу парсерів мають власні екземпляри, але спільний каталог на диску
+document_cache = ResultCache(
+    directory=lambda: os.path.join(settings.CACHE_FOLDER, "documents"),
+    max_bytes=settings.DOCUMENT_CACHE_MAX_BYTES,
+    enabled=settings.DOCUMENT_CACHE_ENABLED
+)
+
+
+def _key(file_hash: str, kind: str) -> str:
+    return ResultCache.make_key(file_hash, f"document_model.{kind}", DOCUMENT_MODEL_VERSION, {})
+
+
+def get_cached_document(file_hash: str, kind: str) -> Optional[DocumentModel]:
+    data = document_cache.get_sync(_key(file_hash, kind))
+    return DocumentModel.from_dict(data) if data is not None else None
+
+
+def save_document(file_hash: str, kind: str, model: DocumentModel) -> None:
+    document_cache.set_sync(_key(file_hash, kind), model.to_dict())
+
+
+def load_document(file_path: Source, kind: str, build: Callable[[Source], DocumentModel]) -> DocumentModel:
+    """
+    Повертає модель документа з кешу за хешем вмісту або будує її
+    функцією `build` і зберігає.
+
+    Args:
+        file_path: Шлях до файлу або його вміст у пам'яті
+        kind: Тип моделі ("docx", "pdf"), входить у ключ кешу
+        build: Функція, що будує модель з файлу
+    """
+    file_hash = source_sha256(file_path)
+    model = get_cached_document(file_hash, kind)
+    if model is None:
+        model = build(file_path)
+        save_document(file_hash, kind, model)
+    return model
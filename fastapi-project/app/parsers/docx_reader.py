@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import posixpath
+import zipfile
+from lxml import etree
+from app.parsers.document_model import DocumentModel
+from app.utils.file_handler import Source, open_source
+
+# Легкий читач DOCX: потоково розбирає основну частину документа (зазвичай
+# word/document.xml) і повертає лише абзаци й таблиці тіла. Стилі, медіа,
+# колонтитули тощо не завантажуються. Текст збігається з python-docx (1.x):
+# Paragraph.text, а таблиці — з row.cells з урахуванням gridSpan і vMerge.
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_R = _w("r")
+W_HYPERLINK = _w("hyperlink")
+W_TBL = _w("tbl")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_TRPR = _w("trPr")
+W_TCPR = _w("tcPr")
+W_GRID_BEFORE = _w("gridBefore")
+W_GRID_SPAN = _w("gridSpan")
+W_VMERGE = _w("vMerge")
+W_VAL = _w("val")
+W_TYPE = _w("type")
+
+# Текстові еквіваленти вмісту w:r, як у python-docx
+RUN_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+W_T = _w("t")
+W_BR = _w("br")
+
+Block = Union[str, List[List[str]]]
+
+
+def _main_part_name(package: zipfile.ZipFile) -> str:
+    try:
+        rels = etree.fromstring(package.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(f"{{{PACKAGE_RELS_NS}}}Relationship"):
+        if rel.get("Type") == OFFICE_DOCUMENT_REL:
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return "word/document.xml"
+
+
+def _run_text(run: etree._Element) -> str:
+    parts = []
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or "")
+        elif child.tag == W_BR:
+            parts.append("\n" if child.get(W_TYPE, "textWrapping") == "textWrapping" else "")
+        else:
+            parts.append(RUN_TEXT.get(child.tag, ""))
+    return "".join(parts)
+
+
+def paragraph_text(paragraph: etree._Element) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def _int_property(parent: Optional[etree._Element], tag: str, default: int) -> int:
+    if parent is None:
+        return default
+    element = parent.find(tag)
+    if element is None:
+        return default
+    try:
+        return int(element.get(W_VAL))
+    except (TypeError, ValueError):
+        return default
+
+
+def table_grid(table: etree._Element) -> List[List[str]]:
+    """
+    Сітка таблиці: по одному рядку на клітинку сітки, як row.cells у python-docx.
+    Клітинка з gridSpan повторюється для кожної колонки, яку займає, а клітинка
+    vMerge="continue" бере текст (і ширину) кореневої клітинки над нею.
+    """
+    grid = []
+    above: Dict[int, Tuple[str, int]] = {}
+
+    for row in table.iterchildren(W_TR):
+        offset = _int_property(row.find(W_TRPR), W_GRID_BEFORE, 0)
+        current: Dict[int, Tuple[str, int]] = {}
+        cells = []
+
+        for cell in row.iterchildren(W_TC):
+            properties = cell.find(W_TCPR)
+            span = _int_property(properties, W_GRID_SPAN, 1)
+            vmerge = properties.find(W_VMERGE) if properties is not None else None
+
+            if vmerge is not None and vmerge.get(W_VAL, "continue") == "continue" and offset in above:
+                content = above[offset]
+            else:
+                text = "\n".join(paragraph_text(p) for p in cell.iterchildren(W_P))
+                content = (text.strip(), span)
+
+            current[offset] = content
+            cells.extend([content[0]] * content[1])
+            offset += span
+
+        grid.append(cells)
+        above = current
+
+    return grid
+
+
+def iter_body_blocks(file_path: Source) -> Iterator[Block]:
+    """
+    Потоково повертає блоки тіла документа в порядку появи: текст абзацу (str)
+    або сітку таблиці (список рядків). Розібрані елементи одразу звільняються.
+    """
+    with open_source(file_path) as file, zipfile.ZipFile(file) as package:
+        with package.open(_main_part_name(package)) as part:
+            depth = 0
+            for event, element in etree.iterparse(part, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    continue
+
+                # Глибина 3 — безпосередні нащадки w:body (w:document > w:body > ...)
+                if depth == 3 and element.getparent() is not None and element.getparent().tag == W_BODY:
+                    if element.tag == W_P:
+                        yield paragraph_text(element)
+                    elif element.tag == W_TBL:
+                        yield table_grid(element)
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                depth -= 1
+
+
+def build_document_model(file_path: Source) -> DocumentModel:
+    return model_from_blocks(iter_body_blocks(file_path))
+
+
+def model_from_blocks(blocks: Iterable[Block]) -> DocumentModel:
+    model = DocumentModel()
+    for block in blocks:
+        if isinstance(block, str):
+            model.paragraphs.append(block)
+        else:
+            model.table_positions.append(len(model.paragraphs))
+            model.tables.append(block)
+    return model
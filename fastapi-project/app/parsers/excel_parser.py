@@ -1,188 +1,236 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterator, AsyncIterator
+from itertools import islice
+import asyncio
+import numpy as np
 import pandas as pd
-import httpx
+import openpyxl
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
 import os
-import json
 from pathlib import Path
 from app.core.config import settings
+from app.core.reference_cache import ReferenceMaps
+from app.services.reference_data import reference_cache
+from app.core.executor import run_in_executor
+from app.utils.serialization import write_json
+from app.utils.file_handler import Source, in_memory_source, open_source
 
+# Змінюйте при зміні логіки парсера: версія входить у ключ кешу результатів
+PARSER_VERSION = 1
 
-async def get_faculty_map() -> Dict[str, int]:
-    url = "https://localhost:7011/api/Faculty"
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(url, headers={"accept": "text/plain"})
-        response.raise_for_status()
-        faculties = response.json()
-        return {f["nameFaculty"]: f["idFaculty"] for f in faculties}
-
-async def get_degree_map() -> Dict[str, int]:
-    url = "https://localhost:7011/api/EducationalDegree"
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(url, headers={"accept": "text/plain"})
-        response.raise_for_status()
-        degrees = response.json()
-        return {d["nameEducationalDegreec"]: d["idEducationalDegree"] for d in degrees}
-
-async def get_study_form_map() -> Dict[str, int]:
-    url = "https://localhost:7011/api/StudyForm"
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(url, headers={"accept": "text/plain"})
-        response.raise_for_status()
-        forms = response.json()
-        return {f["nameStudyForm"]: f["idStudyForm"] for f in forms}
-
-async def get_group_map() -> Dict[str, Dict[str, int]]:
-    url = "https://localhost:7011/api/Group?sortOrder=0"
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(url, headers={"accept": "text/plain"})
-        response.raise_for_status()
-        groups = response.json()
-        return {g["code"].strip().upper(): {"groupId": g["id"], "departmentId": g["departmentId"]} for g in groups}
-
-def save_to_json(data: List[Dict[str, Any]], output_file: str) -> str:
+
+def resolve_output_path(output_file: str) -> str:
+    """Якщо вказано тільки ім'я файлу без шляху, повертає шлях у директорії output_json_files."""
+    if os.path.dirname(output_file) == "":
+        return os.path.join(settings.OUTPUT_JSON_FOLDER, output_file)
+    return output_file
+
+def save_to_json(data: List[Dict[str, Any]], output_file: str, pretty: bool = False) -> str:
     """
     Зберігає дані у JSON-файл і повертає шлях до збереженого файлу.
     
     Args:
         data: Дані для збереження
         output_file: Шлях до вихідного файлу
+        pretty: Форматувати з відступами (за замовчуванням — компактний JSON)
     
     Returns:
         Повний шлях до збереженого файлу
     """
-    from app.core.config import settings
-    
-    # Якщо вказано тільки ім'я файлу без шляху, зберігаємо в директорію output_json_files
-    if os.path.dirname(output_file) == "":
-        output_path = os.path.join(settings.OUTPUT_JSON_FOLDER, output_file)
-    else:
-        output_path = output_file
-    
-    # Переконуємося, що директорія існує
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    # Зберігаємо JSON-файл
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    return output_path
+    return write_json(resolve_output_path(output_file), data, pretty)
+
+# Колонки аркуша зі списком студентів (нумерація з 0, header=None)
+STATUS_COL = 1  # B: Статус
+ID_COL = 2  # C: ID ФО
+NAME_COL = 3    # D: Здобувач
+START_DATE_COL = 5  # F: Початок навчання
+END_DATE_COL = 6    # G: Завершення навчання
+FACULTY_COL = 7  # H: Структурний підрозділ (факультет)
+DEGREE_COL = 9  # J: Освітній ступінь
+STUDY_FORM_COL = 10  # K: Форма навчання
+IS_SHORT_COL = 11  # L: Чи скорочений термін
+EDU_PROG_COL = 14  # O: ID ОП
+COURSE_COL = 17  # R: Курс
+GROUP_COL = 18  # S: Група
+
+STUDENT_COLUMNS = (
+    STATUS_COL, ID_COL, NAME_COL, START_DATE_COL, END_DATE_COL, FACULTY_COL,
+    DEGREE_COL, STUDY_FORM_COL, IS_SHORT_COL, EDU_PROG_COL, COURSE_COL, GROUP_COL
+)
+
+# Значення, які pd.read_excel за замовчуванням вважає порожніми (копія
+# pandas._libs.parsers.STR_NA_VALUES: приватний API pandas може змінитися)
+NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+})
+
+def _convert_cell(cell: Any) -> Any:
+    """Перетворює клітинку openpyxl так само, як це робить pd.read_excel."""
+    value = cell.value
+    if value is None:
+        return None
+    if cell.data_type == TYPE_ERROR:
+        return None
+    if cell.data_type == TYPE_NUMERIC:
+        int_value = int(value)
+        return int_value if int_value == value else float(value)
+    if isinstance(value, str) and value in NA_STRINGS:
+        return None
+    return value
+
+def iter_student_rows(file_path: Source, limit: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+    """
+    Потоково читає аркуш студентів у режимі read_only (з файлу або з буфера в пам'яті).
 
-async def parse_students(file_path: str, limit: int = 5, output_file: str = None) -> List[Dict[str, Any]]:
+    Повертає кортежі значень колонок STUDENT_COLUMNS (без рядка заголовка),
+    пропускає порожні рядки і припиняє читання файлу після `limit` рядків.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    first_col = min(STUDENT_COLUMNS)
+    positions = [col - first_col for col in STUDENT_COLUMNS]
+
+    with open_source(file_path) as file:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            sheet.reset_dimensions()
+
+            header_skipped = False
+            produced = 0
+            for row in sheet.iter_rows(min_col=first_col + 1, max_col=max(STUDENT_COLUMNS) + 1):
+                values = tuple(_convert_cell(row[pos]) if pos < len(row) else None for pos in positions)
+                if all(value is None for value in values):
+                    continue
+                if not header_skipped:
+                    header_skipped = True
+                    continue
+
+                yield values
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+        finally:
+            workbook.close()
+
+def read_student_rows(file_path: Source, limit: Optional[int] = None) -> pd.DataFrame:
+    """Збирає перші `limit` рядків аркуша студентів у DataFrame з колонками STUDENT_COLUMNS."""
+    return pd.DataFrame(list(iter_student_rows(file_path, limit)), columns=list(STUDENT_COLUMNS), dtype=object)
+
+def load_students(file_path: Source, limit: Optional[int], reference_maps: ReferenceMaps) -> List[Dict[str, Any]]:
+    """Синхронна частина parse_students: читання аркуша і побудова записів (виконується в пулі парсерів)."""
+    return build_students(read_student_rows(file_path, limit), *reference_maps)
+
+def _map_column(series: pd.Series, func: Callable[[Any], Any]) -> np.ndarray:
+    """
+    Застосовує func до кожного унікального непорожнього значення колонки
+    і розгортає результат на всі рядки. Порожні клітинки дають None.
+    """
+    codes, uniques = pd.factorize(series)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(value) for value in uniques]
+    mapped[-1] = None
+    return mapped[codes]
+
+def _lookup(mapping: Dict[str, Any]) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        name = str(value)
+        return mapping.get(name) if name else None
+    return convert
+
+def _to_timestamp(value: Any, label: str) -> pd.Timestamp:
     try:
-        faculty_name_to_id = await get_faculty_map()
-        degree_name_to_id = await get_degree_map()
-        study_form_name_to_id = await get_study_form_map()
-        group_code_to_ids = await get_group_map()
+        return pd.to_datetime(value)
+    except Exception as e:
+        print(f"Помилка при обробці дати {label}: {str(e)}")
+        return pd.NaT
 
-        df = pd.read_excel(file_path, header=None)
-        
-        df = df.iloc[1:]
-        
-        if len(df) > limit:
-            df = df.iloc[:limit]
-        
-        students = []
-        for _, row in df.iterrows():
-            status_col = 1  # B: Статус
-            id_col = 2  # C: ID ФО
-            name_col = 3    # D: Здобувач
-            start_date_col = 5  # F: Початок навчання
-            end_date_col = 6    # G: Завершення навчання
-            faculty_col = 7  # H: Структурний підрозділ (факультет)
-            degree_col = 9  # J: Освітній ступінь
-            study_form_col = 10  # K: Форма навчання
-            is_short_col = 11  # L: Чи скорочений термін
-            edu_prog_col = 14  # O: ID ОП
-            course_col = 17  # R: Курс
-            group_col = 18  # S: Група
-
-            faculty_name = str(row[faculty_col]) if pd.notna(row[faculty_col]) else None
-            faculty_id = faculty_name_to_id.get(faculty_name) if faculty_name else None
-
-            degree_name = str(row[degree_col]) if pd.notna(row[degree_col]) else None
-            educational_degree_id = degree_name_to_id.get(degree_name) if degree_name else None
-
-            study_form_name = str(row[study_form_col]) if pd.notna(row[study_form_col]) else None
-            study_form_id = study_form_name_to_id.get(study_form_name) if study_form_name else None
-
-            group_code = str(row[group_col]).strip().upper() if pd.notna(row[group_col]) else None
-            
-            if group_code:
-                found = group_code in group_code_to_ids
-                print(f"Шукаю групу: '{group_code}', Знайдено: {found}")
-                if not found:
-                    similar_codes = [code for code in group_code_to_ids.keys() 
-                                   if code.replace("-", "").lower() == group_code.replace("-", "").lower()]
-                    if similar_codes:
-                        print(f"Знайдено схожі коди: {similar_codes}")
-            
-            group_info = group_code_to_ids.get(group_code) if group_code else None
-            group_id = group_info["groupId"] if group_info else None
-            department_id = group_info["departmentId"] if group_info else None
-
-            education_start = None
-            if pd.notna(row[start_date_col]):
-                try:
-                    start_date = pd.to_datetime(row[start_date_col])
-                    education_start = {
-                        "year": int(start_date.year),
-                        "month": int(start_date.month),
-                        "day": int(start_date.day),
-                        "dayOfWeek": int(start_date.dayofweek)
-                    }
-                except Exception as e:
-                    print(f"Помилка при обробці дати початку навчання: {str(e)}")
-            
-            education_end = None
-            if pd.notna(row[end_date_col]):
-                try:
-                    end_date = pd.to_datetime(row[end_date_col])
-                    education_end = {
-                        "year": int(end_date.year),
-                        "month": int(end_date.month),
-                        "day": int(end_date.day),
-                        "dayOfWeek": int(end_date.dayofweek)
-                    }
-                except Exception as e:
-                    print(f"Помилка при обробці дати завершення навчання: {str(e)}")
-            
-            is_short = "0"
-            if pd.notna(row[is_short_col]):
-                is_short_val = str(row[is_short_col]).strip().lower()
-                if is_short_val == "так":
-                    is_short = "1"
-            
-            student = {
-                "IDstudent": int(row[id_col]) if pd.notna(row[id_col]) else None,
-                "nameStudent": str(row[name_col]) if pd.notna(row[name_col]) else None,
-                # "statusId": str(row[status_col]) if pd.notna(row[status_col]) else None,
-                "educationStart": education_start,
-                "educationEnd": education_end,
-                "course": int(row[course_col]) if pd.notna(row[course_col]) else None,
-                "facultyId": faculty_id,
-                "educationalDegreeId": educational_degree_id,
-                "studyFormId": study_form_id,
-                "isShort": int(is_short),
-                "educationalProgramId": int(row[edu_prog_col]) if pd.notna(row[edu_prog_col]) else None,
-                "departmentId": department_id,
-                "groupId": group_id
-            }
-            students.append(student)
+def _date_column(series: pd.Series, label: str) -> List[Optional[Dict[str, int]]]:
+    """Перетворює колонку дат на словники {year, month, day, dayOfWeek} за один прохід."""
+    codes, uniques = pd.factorize(series)
+    dates = pd.DatetimeIndex([_to_timestamp(value, label) for value in uniques] + [pd.NaT])[codes]
+
+    return [
+        {
+            "year": int(year),
+            "month": int(month),
+            "day": int(day),
+            "dayOfWeek": int(day_of_week)
+        } if valid else None
+        for year, month, day, day_of_week, valid in zip(
+            dates.year, dates.month, dates.day, dates.dayofweek, dates.notna()
+        )
+    ]
+
+def build_students(
+    df: pd.DataFrame,
+    faculty_name_to_id: Dict[str, int],
+    degree_name_to_id: Dict[str, int],
+    study_form_name_to_id: Dict[str, int],
+    group_code_to_ids: Dict[str, Dict[str, int]]
+) -> List[Dict[str, Any]]:
+    """
+    Будує записи студентів з аркуша поколонково: кожне перетворення
+    виконується один раз на унікальне значення колонки, а не на кожен рядок.
+    """
+    group_codes = _map_column(df[GROUP_COL], lambda value: str(value).strip().upper())
+    unique_group_codes = {code for code in group_codes if code}
+    missing_groups = sorted(code for code in unique_group_codes if code not in group_code_to_ids)
+    print(f"Знайдено груп: {len(unique_group_codes) - len(missing_groups)} з {len(unique_group_codes)}")
+    for group_code in missing_groups:
+        similar_codes = [code for code in group_code_to_ids.keys()
+                         if code.replace("-", "").lower() == group_code.replace("-", "").lower()]
+        print(f"Не знайдено групу: '{group_code}'" + (f", схожі коди: {similar_codes}" if similar_codes else ""))
+
+    group_infos = [group_code_to_ids.get(code) if code else None for code in group_codes]
+
+    columns = zip(
+        _map_column(df[ID_COL], int),
+        _map_column(df[NAME_COL], str),
+        _date_column(df[START_DATE_COL], "початку навчання"),
+        _date_column(df[END_DATE_COL], "завершення навчання"),
+        _map_column(df[COURSE_COL], int),
+        _map_column(df[FACULTY_COL], _lookup(faculty_name_to_id)),
+        _map_column(df[DEGREE_COL], _lookup(degree_name_to_id)),
+        _map_column(df[STUDY_FORM_COL], _lookup(study_form_name_to_id)),
+        _map_column(df[IS_SHORT_COL], lambda value: 1 if str(value).strip().lower() == "так" else 0),
+        _map_column(df[EDU_PROG_COL], int),
+        group_infos
+    )
+
+    return [
+        {
+            "IDstudent": student_id,
+            "nameStudent": name,
+            # "statusId": str(row[STATUS_COL]) if pd.notna(row[STATUS_COL]) else None,
+            "educationStart": education_start,
+            "educationEnd": education_end,
+            "course": course,
+            "facultyId": faculty_id,
+            "educationalDegreeId": educational_degree_id,
+            "studyFormId": study_form_id,
+            "isShort": is_short or 0,
+            "educationalProgramId": educational_program_id,
+            "departmentId": group_info["departmentId"] if group_info else None,
+            "groupId": group_info["groupId"] if group_info else None
+        }
+        for (
+            student_id, name, education_start, education_end, course, faculty_id,
+            educational_degree_id, study_form_id, is_short, educational_program_id, group_info
+        ) in columns
+    ]
+
+async def parse_students(file_path: Source, limit: int = 5, output_file: str = None, reference_maps: Optional[ReferenceMaps] = None) -> List[Dict[str, Any]]:
+    try:
+        if reference_maps is None:
+            reference_maps = await reference_cache.get()
+
+        students = await run_in_executor(load_students, in_memory_source(file_path), limit, reference_maps)
         
         # Зберігаємо результат у JSON-файл, якщо вказано шлях
         if output_file:
-            if os.path.dirname(output_file) == "":
-                output_path = os.path.join(settings.OUTPUT_JSON_FOLDER, output_file)
-            else:
-                output_path = output_file
-                
-            # Переконуємося, що директорія існує
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Зберігаємо JSON-файл
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(students, f, ensure_ascii=False, indent=2)
-                
+            output_path = save_to_json(students, output_file)
             print(f"Результати збережено у файл: {output_path}")
             
             # Повертаємо повний шлях до збереженого файлу
@@ -194,9 +242,41 @@ async def parse_students(file_path: str, limit: int = 5, output_file: str = None
         print(f"Помилка при парсингу Excel файлу студентів: {str(e)}")
         raise ValueError(f"Не вдалося розібрати файл студентів: {str(e)}")
     
-async def parse_disciplines(file_path: str, limit: int = 5, output_file: str = None) -> List[Dict[str, Any]]:
+async def iter_students(file_path: Source, limit: int = 5, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Потоково розбирає файл студентів і повертає записи пакетами по `batch_size`.
+    Читання і перетворення кожного пакета виконуються в окремому потоці.
+    """
+    batch_size = batch_size or settings.STREAM_BATCH_SIZE
+    (
+        faculty_name_to_id,
+        degree_name_to_id,
+        study_form_name_to_id,
+        group_code_to_ids
+    ) = await reference_cache.get()
+
+    rows = iter_student_rows(file_path, limit)
+
+    def next_batch() -> List[Dict[str, Any]]:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return []
+        df = pd.DataFrame(chunk, columns=list(STUDENT_COLUMNS), dtype=object)
+        return build_students(df, faculty_name_to_id, degree_name_to_id, study_form_name_to_id, group_code_to_ids)
+
+    try:
+        while True:
+            students = await asyncio.to_thread(next_batch)
+            if not students:
+                break
+            yield students
+    finally:
+        rows.close()
+
+def parse_disciplines(file_path: Source, limit: int = 5, output_file: str = None) -> List[Dict[str, Any]]:
     try:
-        df = pd.read_excel(file_path)
+        with open_source(file_path) as file:
+            df = pd.read_excel(file)
         
         df = df.head(limit)
         
@@ -1,70 +1,255 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Pattern, Tuple, Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
+import multiprocessing.util
 import PyPDF2
+import math
 import re
-import os
+import threading
+import time
+from app.core.config import settings
+from app.parsers.rules import FieldRule, RuleSet, CYCLE_SECTION, extract_discipline, iter_blocks
+from app.parsers.document_model import DocumentModel, get_cached_document, save_document
+from app.utils.file_handler import Source, in_memory_source, open_source, source_sha256
+
+# Змінюйте при зміні логіки парсера: версія входить у ключ кешу результатів
+PARSER_VERSION = 1
+
+CONTROL_WORDS = r'екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит'
+
+PROGRAM_RULES = RuleSet([
+    FieldRule("program_name", r'Освітньо-професійна програма|Освітня програма',
+              r'(?:Освітньо-професійна програма|Освітня програма)\s*[«"]([^»"]+)[»"]'),
+    FieldRule("official_name", r'Офіційна|Повна',
+              r'(?:Офіційна|Повна)\s+назва\s+освітньої\s+програми\s*[:\n\s]+([^\n]+)'),
+    FieldRule("degree", r'ступінь|рівень', r'(?:ступінь|рівень)\s+(?:вищої\s+освіти)[:\s]+([^\n]+)'),
+    FieldRule("degree_cycle", r'перший|другий', r'(?:перший|другий)[\s(]+(?:бакалаврський|магістерський)[)\s]'),
+    FieldRule("speciality", r'спеціальність', r'спеціальність[:\s]+(\d+)[^\n,;]*'),
+    FieldRule("credits", r'\d+\s*кредит', r'(\d+)\s*кредит'),
+    FieldRule("accreditation", r'Наявність|акредитація',
+              r'(?:Наявність\s+акредитації|акредитація)[:\s]+((?:[^\n]+\n?){1,6})'),
+])
+
+PROGRAM_NAME_PREFIX = re.compile(r'Освітньо\s*-?професійна\s+програма\s*[«"]?\s*', re.IGNORECASE)
+TRAILING_QUOTE = re.compile(r'[»"]\s*$')
+SPECIALITY_TAIL = re.compile(r'\d+[^\n,;]*')
+MULTIPLE_SPACES = re.compile(r'\s{2,}')
+NUMBER_CELL = re.compile(r'^\d+(?:[.,]\d+)?$')
+INTEGER_CELL = re.compile(r'^\d+$')
+TRAILING_NUMBER = re.compile(r'(\d+)\s*$')
+CONTROL_FORM = re.compile(rf'({CONTROL_WORDS})', re.IGNORECASE)
+CONTROL_FORM_LIST = re.compile(rf'({CONTROL_WORDS})(?:,\s*(?:{CONTROL_WORDS}))*', re.IGNORECASE)
+SEMESTER_LABEL = re.compile(r'(?:семестр|сем\.?)[:\s]*(\d+)', re.IGNORECASE)
+
+MAIN_DISCIPLINE_ROW = re.compile(
+    rf'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+?)\s+(\d+(?:[.,]\d+)?)\s+({CONTROL_WORDS})(?:,\s*(?:{CONTROL_WORDS}))*\s+(\d+(?:,\d+)?)',
+    re.IGNORECASE
+)
+MAIN_DISCIPLINE_LINE = re.compile(r'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+)')
+MAIN_DISCIPLINE_LOOSE_ROW = re.compile(
+    rf'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+?)\s+(\d+(?:[.,]\d+)?)\s+(?:{CONTROL_WORDS})',
+    re.IGNORECASE
+)
+ELECTIVE_SECTION = re.compile(r'Вибіркові компоненти(.*?)(?:Атестація|ІІІ Цикл|Всього за|Загальний обсяг)', re.DOTALL | re.IGNORECASE)
+# Межі ELECTIVE_SECTION окремо, щоб відстежувати розділ посторінково (див. ElectiveSectionTracker)
+ELECTIVE_START = re.compile(r'Вибіркові компоненти', re.IGNORECASE)
+ELECTIVE_END = re.compile(r'Атестація|ІІІ Цикл|Всього за|Загальний обсяг', re.IGNORECASE)
+# Не менше за найдовшу межу: межа може бути розірвана між сторінками
+SECTION_OVERLAP = 32
+ELECTIVE_ROW = re.compile(r'(ВК\s*\d+(?:\.\d+)?)[^\d]*(\d+(?:[.,]\d+)?)[^\d]*(екзамен|залік|іспит|диф\.\s*залік)[^\d]*(\d+)', re.IGNORECASE)
+ELECTIVE_LINE = re.compile(r'(ВК\s*\d+(?:\.\d+)?)\s+([^\n]+)', re.IGNORECASE)
+
+@lru_cache(maxsize=32)
+def control_continuation(form_control: str) -> Pattern:
+    """Вираз для повного переліку форм контролю, що починається з form_control."""
+    return re.compile(rf"{re.escape(form_control)}((?:,\s*(?:{CONTROL_WORDS}))*)", re.IGNORECASE)
+
+def page_has_text(page: PyPDF2.PageObject) -> bool:
+    """
+    Швидка перевірка без розбору потоку вмісту: сторінка без шрифтів і без
+    form XObject (наприклад, відскановане зображення) не містить тексту.
+    """
+    resources = page.get("/Resources")
+    if resources is None:
+        return True
+    resources = resources.get_object()
+    if "/Font" in resources:
+        return True
+
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return False
+    return any(
+        xobject.get_object().get("/Subtype") == "/Form"
+        for xobject in xobjects.get_object().values()
+    )
+
+def iter_page_texts(reader: PyPDF2.PdfReader, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Ліниво витягує текст сторінок по одній; сторінки-зображення пропускаються."""
+    for page in reader.pages[start:stop]:
+        yield page.extract_text() if page_has_text(page) else ""
+
+def extract_page_range(file_path: Source, start: int, stop: int) -> Tuple[List[str], float]:
+    """
+    Витягує текст сторінок [start, stop) у воркері: файл відкривається незалежно
+    від інших воркерів.
+
+    Returns:
+        Кортеж (тексти сторінок по порядку, процесорний час воркера у секундах)
+    """
+    began = time.process_time()
+    with open_source(file_path) as file:
+        texts = list(iter_page_texts(PyPDF2.PdfReader(file), start, stop))
+    return texts, time.process_time() - began
+
+# Пул процесів для витягування сторінок, спільний для всіх документів процесу
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_extraction_pool_workers = 0
+_extraction_pool_lock = threading.Lock()
+_extraction_pool_finalizer: Optional[multiprocessing.util.Finalize] = None
+
+def _parallel_workers(page_count: int) -> int:
+    """
+    Кількість процесів витягування. Паралельне витягування вмикається явно через
+    PDF_PARALLEL_WORKERS: пул парсерів (app.core.executor) за замовчуванням уже
+    займає всі ядра, тож додаткові процеси лише конкурували б з ним.
+    """
+    if settings.PDF_PARALLEL_WORKERS < 2 or page_count < settings.PDF_PARALLEL_PAGE_THRESHOLD:
+        return 1
+    return min(settings.PDF_PARALLEL_WORKERS, page_count)
+
+def _get_extraction_pool(workers: int) -> Tuple[ProcessPoolExecutor, bool]:
+    """
+    Довгоживучий пул витягування (процеси запускаються один раз, а не для кожного документа).
+
+    Returns:
+        Кортеж (пул, чи використано вже запущений пул)
+    """
+    global _extraction_pool, _extraction_pool_workers, _extraction_pool_finalizer
+    with _extraction_pool_lock:
+        if _extraction_pool_finalizer is None:
+            # Воркери пулу парсерів завершуються через multiprocessing.util._exit_function,
+            # а не atexit: фіналізатор зупиняє пул до того, як процес чекатиме на його дочірні
+            # процеси. Зупинка з очікуванням і з пріоритетом, вищим за фіналізатори черг пулу (10),
+            # інакше черга закривається раніше, ніж у неї потрапляють сигнали завершення воркерам
+            _extraction_pool_finalizer = multiprocessing.util.Finalize(
+                None, shutdown_extraction_pool, kwargs={"wait": True}, exitpriority=100
+            )
+        if _extraction_pool is not None and _extraction_pool_workers >= workers:
+            return _extraction_pool, True
+        if _extraction_pool is not None:
+            _extraction_pool.shutdown(wait=False)
+        _extraction_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _extraction_pool_workers = workers
+        return _extraction_pool, False
+
+def shutdown_extraction_pool(wait: bool = False) -> None:
+    global _extraction_pool, _extraction_pool_workers
+    with _extraction_pool_lock:
+        if _extraction_pool is not None:
+            _extraction_pool.shutdown(wait=wait, cancel_futures=True)
+        _extraction_pool = None
+        _extraction_pool_workers = 0
+
+def iter_document_pages(file_path: Source, reader: PyPDF2.PdfReader, timings: Dict[str, Any],
+                        start: int = 0) -> Iterator[str]:
+    """
+    Повертає тексти сторінок, починаючи зі start, по порядку. Якщо задано
+    PDF_PARALLEL_WORKERS і сторінок для витягування не менше за
+    PDF_PARALLEL_PAGE_THRESHOLD, діапазон ділиться між процесами.
+    Після завершення (або переривання) ітерації timings містить тривалість
+    витягування та прискорення: сумарний процесорний час воркерів (оцінка
+    послідовного витягування) поділений на фактичну тривалість. Фактична тривалість
+    включає запуск процесів і імпорт у них PyPDF2, тож для першого документа
+    (pool_reused=False) прискорення нижче, ніж для наступних.
+    """
+    page_count = len(reader.pages)
+    workers = _parallel_workers(page_count - start)
+    began = time.perf_counter()
+    pages_done = 0
+    work_seconds = 0.0
+    futures = []
+    pool_reused = None
+
+    try:
+        if workers < 2:
+            for text in iter_page_texts(reader, start):
+                pages_done += 1
+                yield text
+            work_seconds = time.perf_counter() - began
+        else:
+            # Дрібніші частини, ніж по одній на воркер, щоб раннє завершення не чекало зайвих сторінок
+            chunk_size = math.ceil((page_count - start) / (workers * 4))
+            executor, pool_reused = _get_extraction_pool(workers)
+            source = in_memory_source(file_path)
+            futures = [
+                executor.submit(extract_page_range, source, chunk_start, min(chunk_start + chunk_size, page_count))
+                for chunk_start in range(start, page_count, chunk_size)
+            ]
+            for future in futures:
+                texts, seconds = future.result()
+                work_seconds += seconds
+                for text in texts:
+                    pages_done += 1
+                    yield text
+    finally:
+        # Пул спільний, тому при ранньому завершенні скасовуються лише частини цього документа
+        for future in futures:
+            future.cancel()
+        elapsed = time.perf_counter() - began
+        timings.update({
+            "mode": "parallel" if workers > 1 else "sequential",
+            "workers": workers,
+            "pages_total": page_count,
+            "pages_extracted": pages_done,
+            "extract_ms": round(elapsed * 1000, 1),
+            "worker_ms": round(work_seconds * 1000, 1),
+            "speedup": round(work_seconds / elapsed, 2) if elapsed > 0 and workers > 1 else 1.0,
+            "pool_reused": pool_reused
+        })
+
+def iter_pdf_pages(file_path: Source, timings: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """
+    Тексти сторінок PDF по порядку через модель документа (app.parsers.document_model).
+    Сторінки, витягнуті попередніми розборами того самого вмісту, беруться з кешу;
+    PyPDF2 відкриває файл лише для решти сторінок, після чого модель доповнюється.
+    """
+    timings = {} if timings is None else timings
+    file_hash = source_sha256(file_path)
+    model = get_cached_document(file_hash, "pdf") or DocumentModel()
+    cached_pages = len(model.pages)
+    timings["pages_cached"] = cached_pages
+    # Загальна кількість сторінок відома з моделі ще до того, як споживач отримає першу сторінку
+    if model.page_count is not None:
+        timings["pages_total"] = model.page_count
+        if model.is_complete:
+            timings["mode"] = "cached"
+
+    yield from model.pages[:cached_pages]
+    if model.page_count is not None and model.is_complete:
+        return
 
-async def parse_disciplines(file_path: str, limit: int = 5) -> List[Dict[str, Any]]:
     try:
-        with open(file_path, 'rb') as file:
+        with open_source(file_path) as file:
             reader = PyPDF2.PdfReader(file)
-            text = ""
-            
-            for page in reader.pages:
-                text += page.extract_text()
-        
+            model.page_count = len(reader.pages)
+            timings["pages_total"] = model.page_count
+            for text in iter_document_pages(file_path, reader, timings, cached_pages):
+                model.pages.append(text)
+                yield text
+    finally:
+        if len(model.pages) > cached_pages:
+            save_document(file_hash, "pdf", model)
+
+def parse_disciplines(file_path: Source, limit: int = 5) -> List[Dict[str, Any]]:
+    try:
         disciplines = []
         
-        discipline_blocks = re.split(r'\n\s*\n', text)
-        
-        for block in discipline_blocks:
-            if re.search(r'назва дисципліни|код дисципліни', block, re.IGNORECASE):
-                name_match = re.search(r'назва(?:\s+дисципліни)?[:\s]+([^\n]+)', block, re.IGNORECASE)
-                name = name_match.group(1).strip() if name_match else ""
-                
-                code_match = re.search(r'код(?:\s+дисципліни)?[:\s]+([^\n]+)', block, re.IGNORECASE)
-                code = code_match.group(1).strip() if code_match else ""
-                
-                faculty_match = re.search(r'факультет[:\s]+([^\n]+)', block, re.IGNORECASE)
-                faculty = faculty_match.group(1).strip() if faculty_match else ""
-                
-                min_count_match = re.search(r'мін(?:імальна)?(?:\s+кількість)?[:\s]+(\d+)', block, re.IGNORECASE)
-                min_count = int(min_count_match.group(1)) if min_count_match else 0
-                
-                max_count_match = re.search(r'макс(?:имальна)?(?:\s+кількість)?[:\s]+(\d+)', block, re.IGNORECASE)
-                max_count = int(max_count_match.group(1)) if max_count_match else 0
-                
-                details = {
-                    "departmentId": 0,
-                    "teacher": "",
-                    "recomend": "",
-                    "prerequisites": "",
-                    "language": "",
-                    "determination": "",
-                    "whyInterestingDetermination": "",
-                    "resultEducation": "",
-                    "usingIrl": "",
-                    "additionaLiterature": "",
-                    "typesOfTraining": "",
-                    "typeOfControll": ""
-                }
-                
-                teacher_match = re.search(r'викладач[:\s]+([^\n]+)', block, re.IGNORECASE)
-                if teacher_match:
-                    details["teacher"] = teacher_match.group(1).strip()
-                
-                discipline = {
-                    "nameAddDisciplines": name,
-                    "codeAddDisciplines": code,
-                    "faculty": faculty,
-                    "minCountPeople": min_count,
-                    "maxCountPeople": max_count,
-                    "minCourse": 0,
-                    "maxCourse": 0,
-                    "addSemestr": "",
-                    "degreeLevel": "",
-                    "details": details,
-                    "idAddDisciplines": 0
-                }
+        # Сторінки витягуються лише доти, доки не набрано limit дисциплін
+        for block in iter_blocks(iter_pdf_pages(file_path)):
+            discipline = extract_discipline(block)
+            if discipline:
                 disciplines.append(discipline)
                 
                 if len(disciplines) >= limit:
@@ -76,222 +261,184 @@ async def parse_disciplines(file_path: str, limit: int = 5) -> List[Dict[str, An
         print(f"Помилка при парсингу PDF файлу дисциплін: {str(e)}")
         raise ValueError(f"Не вдалося розібрати PDF файл дисциплін: {str(e)}")
 
-async def parse_educational_programs(file_path: str) -> Dict[str, Any]:
-    try:
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            
-            for page in reader.pages:
-                text += page.extract_text()
-        
-        program_name = "" 
-        degree = ""
-        accreditation_type = ""
-        credits = 0
-        speciality = ""
-        
-        semester_counts = {3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
-        
-        ukr_match = re.search(r'(?:Освітньо-професійна програма|Освітня програма)\s*[«"]([^»"]+)[»"]', text, re.IGNORECASE)
-        if ukr_match:
-            name_content = ukr_match.group(1).strip()
-            name_content = re.sub(r'Освітньо\s*-?професійна\s+програма\s*[«"]?\s*', '', name_content, flags=re.IGNORECASE)
+def build_educational_program(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Розбирає текст освітньої програми.
+
+    Returns:
+        Кортеж (результат, complete): complete=True означає, що дописування
+        тексту наступних сторінок не змінить результат
+    """
+    program_name = "" 
+    degree = ""
+    accreditation_type = ""
+    credits = 0
+    speciality = ""
+    
+    semester_counts = {3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
+    
+    matches = PROGRAM_RULES.scan(text)
+    
+    ukr_match = matches.get("program_name")
+    if ukr_match:
+        name_content = ukr_match.group(1).strip()
+        name_content = PROGRAM_NAME_PREFIX.sub('', name_content)
+        name_content = name_content.strip()
+        name_content = TRAILING_QUOTE.sub('', name_content)
+        program_name = f"Освітньо-професійна програма «{name_content}»"
+    else:
+        alt_match = matches.get("official_name")
+        if alt_match:
+            name_content = alt_match.group(1).strip()
+            name_content = PROGRAM_NAME_PREFIX.sub('', name_content)
             name_content = name_content.strip()
-            name_content = re.sub(r'[»"]\s*$', '', name_content)
+            name_content = TRAILING_QUOTE.sub('', name_content)
             program_name = f"Освітньо-професійна програма «{name_content}»"
-            print(f"Found Ukrainian program name: {program_name}")
-        else:
-            alt_match = re.search(r'(?:Офіційна|Повна)\s+назва\s+освітньої\s+програми\s*[:\n\s]+([^\n]+)', text, re.IGNORECASE)
-            if alt_match:
-                name_content = alt_match.group(1).strip()
-                name_content = re.sub(r'Освітньо\s*-?професійна\s+програма\s*[«"]?\s*', '', name_content, flags=re.IGNORECASE)
-                name_content = name_content.strip()
-                name_content = re.sub(r'[»"]\s*$', '', name_content)
-                program_name = f"Освітньо-професійна програма «{name_content}»"
-                print(f"Found alternative Ukrainian program name: {program_name}")
-        
-        degree_match = re.search(r'(?:ступінь|рівень)\s+(?:вищої\s+освіти)[:\s]+([^\n]+)', text, re.IGNORECASE)
-        if degree_match:
-            degree_text = degree_match.group(1).strip().lower()
-            if 'бакалавр' in degree_text:
+    
+    degree_match = matches.get("degree")
+    if degree_match:
+        degree_text = degree_match.group(1).strip().lower()
+        if 'бакалавр' in degree_text:
+            degree = 'бакалавр'
+        elif 'магістр' in degree_text:
+            degree = 'магістр'
+        elif 'доктор філософії' in degree_text:
+            degree = 'доктор філософії'
+    else:
+        alt_degree = matches.get("degree_cycle")
+        if alt_degree:
+            if 'бакалавр' in alt_degree.group(0).lower():
                 degree = 'бакалавр'
-            elif 'магістр' in degree_text:
+            elif 'магістр' in alt_degree.group(0).lower():
                 degree = 'магістр'
-            elif 'доктор філософії' in degree_text:
-                degree = 'доктор філософії'
-        else:
-            alt_degree = re.search(r'(?:перший|другий)[\s(]+(?:бакалаврський|магістерський)[)\s]', text, re.IGNORECASE)
-            if alt_degree:
-                if 'бакалавр' in alt_degree.group(0).lower():
-                    degree = 'бакалавр'
-                elif 'магістр' in alt_degree.group(0).lower():
-                    degree = 'магістр'
-        
-        if not degree:
-            degree = 'бакалавр'
-        
-        speciality_match = re.search(r'спеціальність[:\s]+(\d+)[^\n,;]*', text, re.IGNORECASE)
-        if speciality_match:
-            spec_num = speciality_match.group(1).strip()
-            spec_name_match = re.search(f"{spec_num}[^\n,;]*", text)
-            if spec_name_match:
-                speciality = spec_name_match.group(0).strip()
-            else:
-                speciality = spec_num
-        
-        credits_match = re.search(r'(\d+)\s*кредит', text, re.IGNORECASE)
-        if credits_match:
-            credits = int(credits_match.group(1))
+    
+    if not degree:
+        degree = 'бакалавр'
+    
+    speciality_fixed = False
+    speciality_match = matches.get("speciality")
+    if speciality_match:
+        spec_num = speciality_match.group(1).strip()
+        # Перше входження номера спеціальності в тексті разом з назвою до розділювача
+        spec_pos = text.find(spec_num)
+        if spec_pos != -1:
+            speciality_tail = SPECIALITY_TAIL.match(text, spec_pos)
+            speciality = speciality_tail.group(0).strip()
+            speciality_fixed = speciality_tail.end() < len(text)
         else:
-            credits = 240 if degree == 'бакалавр' else 120
-        
-        accreditation_match = re.search(r'(?:Наявність\s+акредитації|акредитація)[:\s]+((?:[^\n]+\n?){1,6})', text, re.IGNORECASE)
-        if accreditation_match:
-            accreditation_type = accreditation_match.group(1).strip()
-            accreditation_type = re.sub(r'\s{2,}', ' ', accreditation_type)
-        
-        educational_program = {
-            "idEducationalProgram": 0,
-            "nameEducationalProgram": program_name,
-            "countAddSemestr3": semester_counts[3],
-            "countAddSemestr4": semester_counts[4],
-            "countAddSemestr5": semester_counts[5],
-            "countAddSemestr6": semester_counts[6],
-            "countAddSemestr7": semester_counts[7],
-            "countAddSemestr8": semester_counts[8],
-            "degree": degree,
-            "speciality": speciality,
-            "accreditation": credits,
-            "accreditationType": accreditation_type,
-            "studentsAmount": 0,
-            "studentsCount": 0,
-            "disciplinesCount": 0
-        }
+            speciality = spec_num
+    
+    credits_match = matches.get("credits")
+    if credits_match:
+        credits = int(credits_match.group(1))
+    else:
+        credits = 240 if degree == 'бакалавр' else 120
+    
+    accreditation_match = matches.get("accreditation")
+    if accreditation_match:
+        accreditation_type = accreditation_match.group(1).strip()
+        accreditation_type = MULTIPLE_SPACES.sub(' ', accreditation_type)
+    
+    educational_program = {
+        "idEducationalProgram": 0,
+        "nameEducationalProgram": program_name,
+        "countAddSemestr3": semester_counts[3],
+        "countAddSemestr4": semester_counts[4],
+        "countAddSemestr5": semester_counts[5],
+        "countAddSemestr6": semester_counts[6],
+        "countAddSemestr7": semester_counts[7],
+        "countAddSemestr8": semester_counts[8],
+        "degree": degree,
+        "speciality": speciality,
+        "accreditation": credits,
+        "accreditationType": accreditation_type,
+        "studentsAmount": 0,
+        "studentsCount": 0,
+        "disciplinesCount": 0
+    }
+    
+    main_disciplines = []
+    
+    cycle_match = CYCLE_SECTION.search(text)
+    match = cycle_match
+    if match:
+        disciplines_text = match.group(1)
         
-        main_disciplines = []
+        discipline_matches = MAIN_DISCIPLINE_ROW.finditer(disciplines_text)
         
-        match = re.search(r'І Цикл загальної підготовки(.*?)Вибіркові компоненти', text, re.DOTALL | re.IGNORECASE)
-        if match:
-            disciplines_text = match.group(1)
+        for match in discipline_matches:
+            code = match.group(1).strip()
+            name_discipline = match.group(2).strip()
+            loans_text = match.group(3).replace(',', '.')
+            form_control = match.group(4).strip()
             
-            discipline_matches = re.finditer(
-                r'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+?)\s+(\d+(?:[.,]\d+)?)\s+(екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит)(?:,\s*(?:екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит))*\s+(\d+(?:,\d+)?)',
-                disciplines_text,
-                re.IGNORECASE
-            )
+            full_control_text = control_continuation(form_control).search(match.group(0))
             
-            for match in discipline_matches:
-                code = match.group(1).strip()
-                name_discipline = match.group(2).strip()
-                loans_text = match.group(3).replace(',', '.')
-                form_control = match.group(4).strip()
-                
-                full_control_text = re.search(
-                    f"{re.escape(form_control)}((?:,\\s*(?:екзамен|залік|іспит|диф\\.\\s*залік|атестаційний іспит))*)",
-                    match.group(0), 
-                    re.IGNORECASE
-                )
-                
-                if full_control_text and full_control_text.group(1):
-                    form_control += full_control_text.group(1)
-                
-                semestr_text = match.group(5)
-                
-                try:
-                    loans = float(loans_text)
-                except ValueError:
-                    loans = 0
-                    
-                try:
-                    if ',' in semestr_text:
-                        semestr = int(semestr_text.split(',')[0])
-                    else:
-                        semestr = int(semestr_text)
-                except ValueError:
-                    semestr = 0
-                
-                discipline = {
-                    "idBindMainDisciplines": 0,
-                    "codeMainDisciplines": code,
-                    "disciplineName": name_discipline,
-                    "loans": loans,
-                    "formControll": form_control,
-                    "semestr": semestr,
-                }
-                main_disciplines.append(discipline)
+            if full_control_text and full_control_text.group(1):
+                form_control += full_control_text.group(1)
             
-            if len(main_disciplines) < 5:
-                ok_matches = re.finditer(r'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+)', disciplines_text)
+            semestr_text = match.group(5)
+            
+            try:
+                loans = float(loans_text)
+            except ValueError:
+                loans = 0
                 
-                for match in ok_matches:
-                    code = match.group(1).strip()
-                    rest_of_line = match.group(2).strip()
-                    
-                    if any(d["codeMainDisciplines"] == code for d in main_disciplines):
-                        continue
-                    
-                    parts = re.split(r'\s{2,}', rest_of_line)
-                    
-                    name_discipline = parts[0] if parts else ""
-                    loans = 0
-                    form_control = ""
-                    semestr = 0
-                    
-                    for part in parts:
-                        if re.match(r'^\d+(?:[.,]\d+)?$', part.strip()):
-                            try:
-                                loans = float(part.replace(',', '.'))
-                                break
-                            except ValueError:
-                                pass
-                    
-                    control_pattern = r'(екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит)'
-                    for part in parts:
-                        if re.search(control_pattern, part, re.IGNORECASE):
-                            form_control = part.strip()
-                            break
-                    
-                    for part in reversed(parts):
-                        if re.match(r'^\d+$', part.strip()):
-                            try:
-                                semestr = int(part)
-                                break
-                            except ValueError:
-                                pass
-                    
-                    discipline = {
-                        "idBindMainDisciplines": 0,
-                        "codeMainDisciplines": code,
-                        "disciplineName": name_discipline,
-                        "loans": loans,
-                        "formControll": form_control,
-                        "semestr": semestr,
-                    }
-                    main_disciplines.append(discipline)
+            try:
+                if ',' in semestr_text:
+                    semestr = int(semestr_text.split(',')[0])
+                else:
+                    semestr = int(semestr_text)
+            except ValueError:
+                semestr = 0
+            
+            discipline = {
+                "idBindMainDisciplines": 0,
+                "codeMainDisciplines": code,
+                "disciplineName": name_discipline,
+                "loans": loans,
+                "formControll": form_control,
+                "semestr": semestr,
+            }
+            main_disciplines.append(discipline)
         
         if len(main_disciplines) < 5:
-            ok_patterns = re.finditer(r'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+?)\s+(\d+(?:[.,]\d+)?)\s+(?:екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит)', text, re.IGNORECASE)
+            ok_matches = MAIN_DISCIPLINE_LINE.finditer(disciplines_text)
             
-            for match in ok_patterns:
+            for match in ok_matches:
                 code = match.group(1).strip()
+                rest_of_line = match.group(2).strip()
                 
                 if any(d["codeMainDisciplines"] == code for d in main_disciplines):
                     continue
                 
-                name_discipline = match.group(2).strip()
-                loans_text = match.group(3).replace(',', '.')
+                parts = MULTIPLE_SPACES.split(rest_of_line)
                 
-                form_control_match = re.search(r'(екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит)(?:,\s*(?:екзамен|залік|іспит|диф\.\s*залік|атестаційний іспит))*', match.group(0), re.IGNORECASE)
-                form_control = form_control_match.group(0) if form_control_match else ""
+                name_discipline = parts[0] if parts else ""
+                loans = 0
+                form_control = ""
+                semestr = 0
                 
-                semester_match = re.search(r'(?:семестр|сем\.?)[:\s]*(\d+)', match.group(0) + text[match.end():match.end()+50], re.IGNORECASE)
-                semestr = int(semester_match.group(1)) if semester_match else 0
+                for part in parts:
+                    if NUMBER_CELL.match(part.strip()):
+                        try:
+                            loans = float(part.replace(',', '.'))
+                            break
+                        except ValueError:
+                            pass
                 
-                try:
-                    loans = float(loans_text)
-                except ValueError:
-                    loans = 0
+                for part in parts:
+                    if CONTROL_FORM.search(part):
+                        form_control = part.strip()
+                        break
+                
+                for part in reversed(parts):
+                    if INTEGER_CELL.match(part.strip()):
+                        try:
+                            semestr = int(part)
+                            break
+                        except ValueError:
+                            pass
                 
                 discipline = {
                     "idBindMainDisciplines": 0,
@@ -302,49 +449,170 @@ async def parse_educational_programs(file_path: str) -> Dict[str, Any]:
                     "semestr": semestr,
                 }
                 main_disciplines.append(discipline)
+    
+    section_disciplines_count = len(main_disciplines)
+    
+    if len(main_disciplines) < 5:
+        ok_patterns = MAIN_DISCIPLINE_LOOSE_ROW.finditer(text)
         
-        elective_section_match = re.search(r'Вибіркові компоненти(.*?)(?:Атестація|ІІІ Цикл|Всього за|Загальний обсяг)', text, re.DOTALL | re.IGNORECASE)
-        if elective_section_match:
-            electives_text = elective_section_match.group(1)
+        for match in ok_patterns:
+            code = match.group(1).strip()
+            
+            if any(d["codeMainDisciplines"] == code for d in main_disciplines):
+                continue
+            
+            name_discipline = match.group(2).strip()
+            loans_text = match.group(3).replace(',', '.')
+            
+            form_control_match = CONTROL_FORM_LIST.search(match.group(0))
+            form_control = form_control_match.group(0) if form_control_match else ""
             
-            vk_matches = re.finditer(r'(ВК\s*\d+(?:\.\d+)?)[^\d]*(\d+(?:[.,]\d+)?)[^\d]*(екзамен|залік|іспит|диф\.\s*залік)[^\d]*(\d+)', electives_text, re.IGNORECASE)
+            semester_match = SEMESTER_LABEL.search(match.group(0) + text[match.end():match.end()+50])
+            semestr = int(semester_match.group(1)) if semester_match else 0
             
-            for match in vk_matches:
-                try:
-                    semester = int(match.group(4))
-                    if 3 <= semester <= 8:
-                        semester_counts[semester] += 1
-                except (ValueError, IndexError):
-                    pass
+            try:
+                loans = float(loans_text)
+            except ValueError:
+                loans = 0
             
-            if all(count == 0 for count in semester_counts.values()):
-                vk_entries = re.finditer(r'(ВК\s*\d+(?:\.\d+)?)\s+([^\n]+)', electives_text, re.IGNORECASE)
+            discipline = {
+                "idBindMainDisciplines": 0,
+                "codeMainDisciplines": code,
+                "disciplineName": name_discipline,
+                "loans": loans,
+                "formControll": form_control,
+                "semestr": semestr,
+            }
+            main_disciplines.append(discipline)
+    
+    elective_section_match = ELECTIVE_SECTION.search(text)
+    if elective_section_match:
+        electives_text = elective_section_match.group(1)
+        
+        vk_matches = ELECTIVE_ROW.finditer(electives_text)
+        
+        for match in vk_matches:
+            try:
+                semester = int(match.group(4))
+                if 3 <= semester <= 8:
+                    semester_counts[semester] += 1
+            except (ValueError, IndexError):
+                pass
+        
+        if all(count == 0 for count in semester_counts.values()):
+            vk_entries = ELECTIVE_LINE.finditer(electives_text)
+            
+            for match in vk_entries:
+                line = match.group(2)
+                semester_match = TRAILING_NUMBER.search(line)
                 
-                for match in vk_entries:
-                    line = match.group(2)
-                    semester_match = re.search(r'(\d+)\s*$', line)
-                    
-                    if semester_match:
-                        try:
-                            semester = int(semester_match.group(1))
-                            if 3 <= semester <= 8:
-                                semester_counts[semester] += 1
-                        except ValueError:
-                            pass
+                if semester_match:
+                    try:
+                        semester = int(semester_match.group(1))
+                        if 3 <= semester <= 8:
+                            semester_counts[semester] += 1
+                    except ValueError:
+                        pass
+        
+        educational_program["countAddSemestr3"] = semester_counts[3]
+        educational_program["countAddSemestr4"] = semester_counts[4]
+        educational_program["countAddSemestr5"] = semester_counts[5]
+        educational_program["countAddSemestr6"] = semester_counts[6]
+        educational_program["countAddSemestr7"] = semester_counts[7]
+        educational_program["countAddSemestr8"] = semester_counts[8]
+    
+    main_disciplines.sort(key=lambda d: d["codeMainDisciplines"])
+    
+    # Результат остаточний, якщо подальший текст уже не може змінити жодного збігу:
+    # усі поля знайдено і кожен збіг закінчується до кінця тексту, обидва розділи
+    # закриті, а розділу «І Цикл» вистачило без пошуку по всьому тексту
+    complete = (
+        all(
+            matches.get(name) is not None and matches[name].end() < len(text)
+            for name in ("program_name", "degree", "speciality", "credits", "accreditation")
+        )
+        and speciality_fixed
+        and cycle_match is not None
+        and section_disciplines_count >= 5
+        and elective_section_match is not None
+    )
+    
+    return {
+        "educationalProgram": educational_program,
+        "mainDisciplines": main_disciplines
+    }, complete
+
+class ElectiveSectionTracker:
+    """
+    Посторінково визначає, чи закрито розділ вибіркових компонентів, тобто чи
+    знайдеться ELECTIVE_SECTION у тексті всіх переданих сторінок. Кожна сторінка
+    переглядається один раз разом із хвостом попередньої (SECTION_OVERLAP символів).
+    """
+
+    def __init__(self):
+        self.started = False
+        self.closed = False
+        self._tail = ""
+
+    def feed(self, page_text: str) -> bool:
+        if self.closed:
+            return True
+        window = self._tail + page_text
+        position = 0
+        if not self.started:
+            start = ELECTIVE_START.search(window)
+            if start is None:
+                self._tail = window[-SECTION_OVERLAP:]
+                return False
+            self.started = True
+            position = start.end()
+        self.closed = ELECTIVE_END.search(window, position) is not None
+        # Хвіст не захоплює текст до початку розділу, інакше межа перед ним дала б хибний збіг
+        self._tail = window[max(position, len(window) - SECTION_OVERLAP):]
+        return self.closed
+
+def parse_educational_programs(file_path: Source) -> Dict[str, Any]:
+    program, _ = parse_educational_programs_timed(file_path)
+    return program
+
+def parse_educational_programs_timed(file_path: Source) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Те саме, що parse_educational_programs, але додатково повертає
+    час витягування тексту сторінок (див. iter_document_pages).
+    """
+    timings: Dict[str, Any] = {}
+    try:
+        page_texts = []
+        section = ElectiveSectionTracker()
+        program = None
+        complete = False
+        parsed_pages = 0
+        
+        pages = iter_pdf_pages(file_path, timings)
+        for page_text in pages:
+            page_texts.append(page_text)
             
-            educational_program["countAddSemestr3"] = semester_counts[3]
-            educational_program["countAddSemestr4"] = semester_counts[4]
-            educational_program["countAddSemestr5"] = semester_counts[5]
-            educational_program["countAddSemestr6"] = semester_counts[6]
-            educational_program["countAddSemestr7"] = semester_counts[7]
-            educational_program["countAddSemestr8"] = semester_counts[8]
+            # Поки розділ вибіркових компонентів не закрито, результат точно неповний;
+            # після закриття текст розбирається один раз
+            if program is not None or not section.feed(page_text):
+                continue
+            
+            program, complete = build_educational_program("".join(page_texts))
+            parsed_pages = len(page_texts)
+            if complete:
+                print(f"Розбір завершено після {parsed_pages} з {timings.get('pages_total', '?')} сторінок")
+                break
+        pages.close()
+        
+        # Неповний результат перераховується один раз по всіх сторінках
+        if program is None or (not complete and parsed_pages < len(page_texts)):
+            program, _ = build_educational_program("".join(page_texts))
         
-        main_disciplines.sort(key=lambda d: d["codeMainDisciplines"])
+        program_name = program["educationalProgram"]["nameEducationalProgram"]
+        if program_name:
+            print(f"Found Ukrainian program name: {program_name}")
         
-        return {
-            "educationalProgram": educational_program,
-            "mainDisciplines": main_disciplines
-        }
+        return program, timings
     
     except Exception as e:
         print(f"Помилка при парсингу PDF файлу освітньої програми: {str(e)}")
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Iterable, Optional
+from types import ModuleType
+import importlib
+import threading
+import time
+
+
+class LazyParser:
+    """
+    Модуль парсера, що імпортується під час першого звернення до його атрибута.
+    Парсери тягнуть важкі бібліотеки (pandas і openpyxl, PyPDF2, python-docx і lxml),
+    тож старт сервісу і воркерів не платить за формати, які ще не використовувались.
+    Атрибути повертаються з реального модуля, тому функції парсерів можна передавати
+    в пул процесів (pickle за іменем модуля).
+    """
+
+    def __init__(self, name: str, module_name: str):
+        self.name = name
+        self.module_name = module_name
+        self.import_ms: Optional[float] = None
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.module_name)
+                    self.import_ms = round((time.perf_counter() - started) * 1000, 1)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+    def status(self) -> Dict[str, Any]:
+        return {"module": self.module_name, "loaded": self.loaded, "import_ms": self.import_ms}
+
+
+PARSERS = {
+    "excel": LazyParser("excel", "app.parsers.excel_parser"),
+    "pdf": LazyParser("pdf", "app.parsers.pdf_parser"),
+    "word": LazyParser("word", "app.parsers.word_parser"),
+}
+
+excel_parser = PARSERS["excel"]
+pdf_parser = PARSERS["pdf"]
+word_parser = PARSERS["word"]
+
+
+def load_parsers(names: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+    """
+    Імпортує вказані (за замовчуванням усі) парсери; для воркерів пулу під час прогріву.
+
+    Returns:
+        Словник {назва парсера: тривалість імпорту в мс}
+    """
+    names = list(names) if names is not None else list(PARSERS)
+    unknown = [name for name in names if name not in PARSERS]
+    if unknown:
+        raise ValueError(f"Невідомі парсери: {', '.join(unknown)}. Допустимі: {', '.join(PARSERS)}")
+    for name in names:
+        PARSERS[name].load()
+    return {name: PARSERS[name].import_ms for name in names}
+
+
+def parsers_status() -> Dict[str, Dict[str, Any]]:
+    return {name: parser.status() for name, parser in PARSERS.items()}
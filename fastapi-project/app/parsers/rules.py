@@ -0,0 +1,137 @@
+from typing import Any, Dict, Iterable, Iterator, List, Match, Optional
+import re
+
+# Спільні для pdf_parser і word_parser вирази
+BLOCK_SEPARATOR = re.compile(r'\n\s*\n')
+CYCLE_SECTION = re.compile(r'І Цикл загальної підготовки(.*?)Вибіркові компоненти', re.DOTALL | re.IGNORECASE)
+
+
+def iter_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Ліниво ділить текст, що надходить частинами (сторінками), на блоки за
+    BLOCK_SEPARATOR. Блоки збігаються з BLOCK_SEPARATOR.split("".join(chunks)):
+    роздільник вважається остаточним лише тоді, коли після нього вже є
+    непробільний символ, тобто наступна частина не може його подовжити.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        content_end = len(buffer.rstrip())
+        start = 0
+        for separator in BLOCK_SEPARATOR.finditer(buffer):
+            if separator.end() > content_end:
+                break
+            yield buffer[start:separator.start()]
+            start = separator.end()
+        buffer = buffer[start:]
+
+    yield from BLOCK_SEPARATOR.split(buffer)
+
+
+class FieldRule:
+    """
+    Правило вилучення одного поля.
+
+    `keyword` — вираз, з якого починається кожен збіг `pattern` (наприклад,
+    ключове слово заголовка). За ним RuleSet знаходить позиції-кандидати,
+    а сам `pattern` перевіряється лише в цих позиціях.
+    """
+
+    def __init__(self, name: str, keyword: str, pattern: str, flags: int = re.IGNORECASE):
+        self.name = name
+        self.keyword = keyword
+        self.regex = re.compile(pattern, flags)
+
+
+class RuleSet:
+    """
+    Набір правил, скомпільований при імпорті.
+
+    Текст проглядається один раз виразом, що об'єднує ключові слова всіх правил.
+    Для кожного поля повертається найлівіший збіг — той самий, що дав би
+    окремий re.search(pattern, text) — а сканування зупиняється, щойно
+    знайдено всі потрібні поля.
+    """
+
+    def __init__(self, rules: Iterable[FieldRule]):
+        self.rules: List[FieldRule] = list(rules)
+        keywords = list(dict.fromkeys(rule.keyword for rule in self.rules))
+        self._keywords = re.compile("|".join(f"(?:{keyword})" for keyword in keywords), re.IGNORECASE)
+
+    def scan(self, text: str, only: Optional[Iterable[str]] = None) -> Dict[str, Match]:
+        pending = [rule for rule in self.rules if only is None or rule.name in only]
+        found: Dict[str, Match] = {}
+
+        hit = self._keywords.search(text) if pending else None
+        while hit is not None:
+            pos = hit.start()
+            matched = False
+            for rule in pending:
+                match = rule.regex.match(text, pos)
+                if match:
+                    found[rule.name] = match
+                    matched = True
+            if matched:
+                pending = [rule for rule in pending if rule.name not in found]
+                if not pending:
+                    break
+            hit = self._keywords.search(text, pos + 1)
+
+        return found
+
+
+DISCIPLINE_RULES = RuleSet([
+    FieldRule("marker", r'назва|код', r'назва дисципліни|код дисципліни'),
+    FieldRule("name", r'назва', r'назва(?:\s+дисципліни)?[:\s]+([^\n]+)'),
+    FieldRule("code", r'код', r'код(?:\s+дисципліни)?[:\s]+([^\n]+)'),
+    FieldRule("faculty", r'факультет', r'факультет[:\s]+([^\n]+)'),
+    FieldRule("min_count", r'мін', r'мін(?:імальна)?(?:\s+кількість)?[:\s]+(\d+)'),
+    FieldRule("max_count", r'макс', r'макс(?:имальна)?(?:\s+кількість)?[:\s]+(\d+)'),
+    FieldRule("teacher", r'викладач', r'викладач[:\s]+([^\n]+)'),
+])
+
+
+def _text(matches: Dict[str, Match], name: str) -> str:
+    match = matches.get(name)
+    return match.group(1).strip() if match else ""
+
+
+def _number(matches: Dict[str, Match], name: str) -> int:
+    match = matches.get(name)
+    return int(match.group(1)) if match else 0
+
+
+def extract_discipline(block: str) -> Optional[Dict[str, Any]]:
+    """Будує запис дисципліни з текстового блоку або повертає None, якщо блок її не описує."""
+    matches = DISCIPLINE_RULES.scan(block)
+    if "marker" not in matches:
+        return None
+
+    details = {
+        "departmentId": 0,
+        "teacher": _text(matches, "teacher"),
+        "recomend": "",
+        "prerequisites": "",
+        "language": "",
+        "determination": "",
+        "whyInterestingDetermination": "",
+        "resultEducation": "",
+        "usingIrl": "",
+        "additionaLiterature": "",
+        "typesOfTraining": "",
+        "typeOfControll": ""
+    }
+
+    return {
+        "nameAddDisciplines": _text(matches, "name"),
+        "codeAddDisciplines": _text(matches, "code"),
+        "faculty": _text(matches, "faculty"),
+        "minCountPeople": _number(matches, "min_count"),
+        "maxCountPeople": _number(matches, "max_count"),
+        "minCourse": 0,
+        "maxCourse": 0,
+        "addSemestr": "",
+        "degreeLevel": "",
+        "details": details,
+        "idAddDisciplines": 0
+    }
@@ -1,67 +1,154 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, Optional, Iterable, Iterator
 import docx
+from docx.oxml.ns import qn
 import re
+from app.core.config import settings
+from app.parsers import docx_reader
+from app.parsers.rules import FieldRule, RuleSet, CYCLE_SECTION, extract_discipline, iter_blocks
+from app.parsers.document_model import DocumentModel, load_document, get_cached_document, save_document
+from app.utils.file_handler import Source, open_source, source_sha256
 
-async def parse_disciplines(file_path: str, limit: int = 5) -> List[Dict[str, Any]]:
+# Змінюйте при зміні логіки парсера: версія входить у ключ кешу результатів
+PARSER_VERSION = 2
+
+# Поля, які шукаються в тексті абзаців, якщо їх не знайдено в таблицях
+TEXT_RULES = RuleSet([
+    FieldRule("program_name_opp", r'Освітньо-професійна програма', r'Освітньо-професійна програма «([^»]+)»'),
+    FieldRule("program_name_op", r'Освітня програма', r'Освітня програма: «([^»]+)»'),
+    FieldRule("program_name_official", r'Офіційна назва освітньої програми', r'Офіційна назва освітньої програми[:\s]+([^\n]+)'),
+    FieldRule("degree", r'ступінь', r'ступінь[:\s]+([^\n]+)'),
+    FieldRule("math_speciality", r'спеціальність', r'спеціальність[:\s]+(\d+)[^\n,;]*(?:математика)'),
+    FieldRule("mathematics", r'математика', r'математика'),
+    FieldRule("credits", r'\d+\s*кредит', r'(\d+)\s*кредит', flags=0),
+])
+# Порядок пріоритету шаблонів назви програми
+PROGRAM_NAME_FIELDS = ["program_name_opp", "program_name_op", "program_name_official"]
+
+DEGREE_HEADER = re.compile(r'ступінь.*освіти|кваліфікація')
+DEGREE_VALUE = re.compile(r'бакалавр|магістр|доктор філософії', re.IGNORECASE)
+SPECIALITY_HEADER = re.compile(r'спеціальність')
+SPECIALITY_VALUE = re.compile(r'(\d+)\s+(\w+)')
+MATHEMATICS = re.compile(r'математика', re.IGNORECASE)
+ACCREDITATION_HEADER = re.compile(r'акредитаці[яї]|наявність')
+VOLUME_HEADER = re.compile(r'обсяг|диплом')
+CREDITS = re.compile(r'(\d+)\s*кредит')
+
+ELECTIVES_MARKER = re.compile(r'Вибіркові компоненти|ВК \d+')
+ELECTIVES_SECTION = re.compile(r'Вибіркові компоненти', re.IGNORECASE)
+HEADER_ROW_HINT = re.compile(r'форма.*контролю|семестр|кредити', re.IGNORECASE)
+FORM_CONTROL_HEADER = re.compile(r'форма.*контролю', re.IGNORECASE)
+CREDITS_HEADER = re.compile(r'кредити|ЄКТС', re.IGNORECASE)
+SEMESTER_HEADER = re.compile(r'семестр', re.IGNORECASE)
+CONTROL_CELL = re.compile(r'екзамен|залік|іспит', re.IGNORECASE)
+NUMBER_CELL = re.compile(r'^\d+(?:[.,]\d+)?$')
+INTEGER_CELL = re.compile(r'^\d+$')
+INTEGER_LIST_CELL = re.compile(r'^\d+(?:,\d+)+$')
+CONTROL_IN_NAME = re.compile(r'(екзамен|залік|іспит|диф\.\s*залік)', re.IGNORECASE)
+CONTROL_IN_NAME_STRIP = re.compile(r'\s*[(]?екзамен|залік|іспит|диф\.\s*залік[)]?\s*', re.IGNORECASE)
+MAIN_DISCIPLINE_ROW = re.compile(
+    r'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+?)\s+(\d+(?:[.,]\d+)?)\s+(екзамен|залік|іспит|диф\.\s*залік)\s+(\d+(?:,\d+)?)',
+    re.IGNORECASE
+)
+
+def build_document_model(file_path: Source) -> DocumentModel:
+    """Розбирає DOCX один раз: абзаци і таблиці у вигляді сіток рядків."""
+    with open_source(file_path) as file:
+        doc = docx.Document(file)
+    
+    table_positions = []
+    paragraph_count = 0
+    for element in doc.element.body.iterchildren():
+        if element.tag == qn('w:p'):
+            paragraph_count += 1
+        elif element.tag == qn('w:tbl'):
+            table_positions.append(paragraph_count)
+    
+    return DocumentModel(
+        paragraphs=[paragraph.text for paragraph in doc.paragraphs],
+        tables=[
+            [[cell.text.strip() for cell in row.cells] for row in table.rows]
+            for table in doc.tables
+        ],
+        table_positions=table_positions
+    )
+
+# Бекенди побудови моделі DOCX; обидва дають однакову модель, тому кеш моделі спільний
+DOCX_BACKENDS = {
+    "python-docx": build_document_model,
+    "lxml": docx_reader.build_document_model
+}
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    backend = backend or settings.DOCX_BACKEND
+    if backend not in DOCX_BACKENDS:
+        raise ValueError(f"Невідомий бекенд DOCX: {backend}")
+    return backend
+
+def load_document_model(file_path: Source, backend: Optional[str] = None) -> DocumentModel:
+    """
+    Args:
+        backend: "python-docx" або "lxml" (потоковий читач app.parsers.docx_reader);
+            за замовчуванням settings.DOCX_BACKEND
+    """
+    return load_document(file_path, "docx", DOCX_BACKENDS[_resolve_backend(backend)])
+
+def iter_document_body(file_path: Source, backend: Optional[str] = None) -> Iterator[docx_reader.Block]:
+    """
+    Абзаци і таблиці тіла DOCX у порядку появи. Модель з кешу використовується
+    одразу; без неї бекенд lxml читає документ потоково, тож перерваний обхід
+    не розбирає решту файлу (модель кешується, лише якщо документ прочитано
+    до кінця), а python-docx будує модель повністю.
+    """
+    backend = _resolve_backend(backend)
+    file_hash = source_sha256(file_path)
+    model = get_cached_document(file_hash, "docx")
+    
+    if model is None and backend == "lxml":
+        blocks = []
+        for block in docx_reader.iter_body_blocks(file_path):
+            blocks.append(block)
+            yield block
+        save_document(file_hash, "docx", docx_reader.model_from_blocks(blocks))
+        return
+    
+    if model is None:
+        model = load_document_model(file_path, backend)
+    yield from model.iter_body()
+
+def table_text(grid: List[List[str]]) -> str:
+    """Непорожні рядки клітинок таблиці; повтори об'єднаних по горизонталі клітинок пропускаються."""
+    lines = []
+    for row in grid:
+        previous = None
+        for cell in row:
+            if cell and cell != previous:
+                lines.extend(line for line in cell.split("\n") if line.strip())
+            previous = cell
+    return "\n".join(lines)
+
+def iter_body_text(blocks: Iterable[docx_reader.Block]) -> Iterator[str]:
+    """
+    Текст тіла документа частинами для iter_blocks: абзаци з'єднуються через
+    перенесення рядка, а кожна таблиця відокремлюється порожніми рядками
+    і стає окремим блоком.
+    """
+    first = True
+    for block in blocks:
+        separator = "" if first else "\n"
+        if isinstance(block, str):
+            yield separator + block
+        else:
+            yield separator + "\n" + table_text(block) + "\n"
+        first = False
+
+def parse_disciplines(file_path: Source, limit: int = 5, backend: Optional[str] = None) -> List[Dict[str, Any]]:
     try:
-        doc = docx.Document(file_path)
-        
-        paragraphs = doc.paragraphs[:min(100, len(doc.paragraphs))]
-        text = "\n".join([paragraph.text for paragraph in paragraphs])
-        
         disciplines = []
         
-        discipline_blocks = re.split(r'\n\s*\n', text)
-        
-        for block in discipline_blocks:
-            if re.search(r'назва дисципліни|код дисципліни', block, re.IGNORECASE):
-                name_match = re.search(r'назва(?:\s+дисципліни)?[:\s]+([^\n]+)', block, re.IGNORECASE)
-                name = name_match.group(1).strip() if name_match else ""
-                
-                code_match = re.search(r'код(?:\s+дисципліни)?[:\s]+([^\n]+)', block, re.IGNORECASE)
-                code = code_match.group(1).strip() if code_match else ""
-                
-                faculty_match = re.search(r'факультет[:\s]+([^\n]+)', block, re.IGNORECASE)
-                faculty = faculty_match.group(1).strip() if faculty_match else ""
-                
-                min_count_match = re.search(r'мін(?:імальна)?(?:\s+кількість)?[:\s]+(\d+)', block, re.IGNORECASE)
-                min_count = int(min_count_match.group(1)) if min_count_match else 0
-                
-                max_count_match = re.search(r'макс(?:имальна)?(?:\s+кількість)?[:\s]+(\d+)', block, re.IGNORECASE)
-                max_count = int(max_count_match.group(1)) if max_count_match else 0
-                
-                details = {
-                    "departmentId": 0,
-                    "teacher": "",
-                    "recomend": "",
-                    "prerequisites": "",
-                    "language": "",
-                    "determination": "",
-                    "whyInterestingDetermination": "",
-                    "resultEducation": "",
-                    "usingIrl": "",
-                    "additionaLiterature": "",
-                    "typesOfTraining": "",
-                    "typeOfControll": ""
-                }
-                
-                teacher_match = re.search(r'викладач[:\s]+([^\n]+)', block, re.IGNORECASE)
-                if teacher_match:
-                    details["teacher"] = teacher_match.group(1).strip()
-                
-                discipline = {
-                    "nameAddDisciplines": name,
-                    "codeAddDisciplines": code,
-                    "faculty": faculty,
-                    "minCountPeople": min_count,
-                    "maxCountPeople": max_count,
-                    "minCourse": 0,
-                    "maxCourse": 0,
-                    "addSemestr": "",
-                    "degreeLevel": "",
-                    "details": details,
-                    "idAddDisciplines": 0
-                }
+        # Блок обробляється, щойно закривається; після limit дисциплін документ далі не читається
+        for block in iter_blocks(iter_body_text(iter_document_body(file_path, backend))):
+            discipline = extract_discipline(block)
+            if discipline:
                 disciplines.append(discipline)
                 
                 if len(disciplines) >= limit:
@@ -73,74 +160,265 @@ async def parse_disciplines(file_path: str, limit: int = 5) -> List[Dict[str, An
         print(f"Помилка при парсингу Word файлу дисциплін: {str(e)}")
         raise ValueError(f"Не вдалося розібрати Word файл дисциплін: {str(e)}")
 
-async def parse_educational_programs(file_path: str) -> Dict[str, Any]:
+CYCLE_MARKER = "І Цикл загальної підготовки"
+METADATA_HEADER = re.compile('|'.join([
+    r'назва освітньої програми',
+    DEGREE_HEADER.pattern,
+    SPECIALITY_HEADER.pattern,
+    ACCREDITATION_HEADER.pattern,
+    VOLUME_HEADER.pattern
+]))
+
+class TableSnapshot:
+    """
+    Незмінна сітка рядків таблиці з класифікацією, обчисленою за один прохід:
+    таблиця метаданих (рядки «заголовок | значення»), таблиця вибіркових
+    компонентів і таблиця циклу обов'язкових дисциплін. Одна таблиця може
+    належати до кількох класів.
+    """
+
+    __slots__ = ("rows", "is_metadata", "is_electives", "is_cycle")
+
+    def __init__(self, grid: List[List[str]]):
+        self.rows: Tuple[Tuple[str, ...], ...] = tuple(tuple(row) for row in grid)
+        self.is_metadata = False
+        self.is_electives = False
+        self.is_cycle = False
+
+        for cells in self.rows:
+            if not self.is_metadata and len(cells) >= 2 and METADATA_HEADER.search(cells[0].lower()):
+                self.is_metadata = True
+            if not self.is_electives and any(ELECTIVES_MARKER.search(cell) for cell in cells):
+                self.is_electives = True
+            if not self.is_cycle and any(CYCLE_MARKER in cell for cell in cells):
+                self.is_cycle = True
+
+def snapshot_tables(doc: DocumentModel) -> List[TableSnapshot]:
+    return [TableSnapshot(grid) for grid in doc.tables]
+
+def extract_table_metadata(tables: List[TableSnapshot]) -> Tuple[str, str, str, str, str, int]:
+    """
+    Поля програми з рядків «заголовок | значення» таблиць-метаданих.
+
+    Returns:
+        Кортеж (назва, назва англійською, ступінь, спеціальність, тип акредитації, кредити)
+    """
+    program_name = ""
+    program_name_en = ""
+    degree = ""
+    accreditation_type = ""
+    credits = 0
+    speciality = "" 
+    
+    for table in tables:
+        if not table.is_metadata:
+            continue
+        for row in table.rows:
+            if len(row) < 2:
+                continue
+                
+            header_cell = row[0].lower()
+            value_cell = row[1]
+            
+            if ("офіційна назва освітньої програми" in header_cell or 
+                "повна назва освітньої програми" in header_cell) and "англійськ" not in header_cell:
+                program_name = value_cell
+                print(f"Found Ukrainian program name in table: {program_name}")
+            
+            elif ("офіційна назва освітньої програми" in header_cell or 
+                  "назва освітньої програми" in header_cell) and "англійськ" in header_cell:
+                program_name_en = value_cell
+                print(f"Found English program name in table: {program_name_en}")
+            
+            elif DEGREE_HEADER.search(header_cell):
+                degree_match = DEGREE_VALUE.search(value_cell)
+                if degree_match:
+                    degree = degree_match.group(0).lower()
+            
+            elif SPECIALITY_HEADER.search(header_cell):
+                if "111" in value_cell or MATHEMATICS.search(value_cell):
+                    speciality = "111 Математика"
+                else:
+                    speciality_match = SPECIALITY_VALUE.search(value_cell)
+                    if speciality_match:
+                        spec_num = speciality_match.group(1)
+                        spec_name = speciality_match.group(2)
+                        if spec_num == "11" and MATHEMATICS.search(spec_name):
+                            speciality = "111 Математика"
+                        else:
+                            speciality = f"{spec_num} {spec_name}"
+            
+            elif ACCREDITATION_HEADER.search(header_cell):
+                accreditation_type = value_cell
+            
+            elif VOLUME_HEADER.search(header_cell) and 'кредит' in value_cell.lower():
+                credits_match = CREDITS.search(value_cell)
+                if credits_match:
+                    credits = int(credits_match.group(1))
+    
+    return program_name, program_name_en, degree, speciality, accreditation_type, credits
+
+def count_electives(tables: List[TableSnapshot]) -> Dict[int, int]:
+    """Кількість вибіркових компонентів (рядків «ВК») за семестрами 3–8."""
+    semester_counts = {3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
+    
+    for table in tables:
+        if not table.is_electives:
+            continue
+            
+        for cells in table.rows:
+            if len(cells) < 3:
+                continue
+            
+            if cells[0].startswith("ВК"):
+                try:
+                    semester = 0
+                    for idx in range(len(cells) - 1, 0, -1):
+                        if INTEGER_CELL.match(cells[idx]):
+                            semester = int(cells[idx])
+                            break
+                    
+                    if semester in semester_counts:
+                        semester_counts[semester] += 1
+                    
+                except (ValueError, IndexError):
+                    pass
+    
+    return semester_counts
+
+def collect_cycle_disciplines(tables: List[TableSnapshot]) -> List[Dict[str, Any]]:
+    """Обов'язкові дисципліни з таблиць розділу «І Цикл загальної підготовки»."""
+    main_disciplines = []
+    
+    for snapshot in tables:
+        if not snapshot.is_cycle:
+            continue
+        table = snapshot.rows
+        
+        is_collecting = False
+        header_row = None
+        
+        for row_idx, cells in enumerate(table):
+            if any("І Цикл загальної підготовки" in cell for cell in cells):
+                is_collecting = True
+                if row_idx + 1 < len(table):
+                    header_cells = table[row_idx + 1]
+                    if any(HEADER_ROW_HINT.search(cell) for cell in header_cells):
+                        header_row = header_cells
+                continue
+            
+            if is_collecting and any(ELECTIVES_SECTION.search(cell) for cell in cells):
+                is_collecting = False
+                break
+            
+            if not is_collecting or len(cells) < 3:
+                continue
+            
+            if not cells[0].startswith("ОК"):
+                continue
+            
+            code = cells[0].strip()
+            
+            name_idx = 1
+            form_control_idx = None
+            credit_idx = None
+            semester_idx = None
+            
+            if header_row:
+                for i, header in enumerate(header_row):
+                    if FORM_CONTROL_HEADER.search(header):
+                        form_control_idx = i
+                    elif CREDITS_HEADER.search(header):
+                        credit_idx = i
+                    elif SEMESTER_HEADER.search(header):
+                        semester_idx = i
+            
+            if form_control_idx is None:
+                for i in range(2, min(5, len(cells))):
+                    if CONTROL_CELL.search(cells[i]):
+                        form_control_idx = i
+                        break
+            
+            if credit_idx is None:
+                for i in range(1, min(5, len(cells))):
+                    if NUMBER_CELL.match(cells[i]):
+                        credit_idx = i
+                        break
+            
+            if semester_idx is None:
+                for i in range(len(cells) - 1, 0, -1):
+                    if INTEGER_CELL.match(cells[i]) or INTEGER_LIST_CELL.match(cells[i]):
+                        semester_idx = i
+                        break
+            
+            name_discipline = cells[name_idx] if name_idx < len(cells) else ""
+            
+            form_control = ""
+            if form_control_idx is not None and form_control_idx < len(cells):
+                form_control = cells[form_control_idx]
+            elif len(cells) > 2:
+                control_match = CONTROL_IN_NAME.search(name_discipline)
+                if control_match:
+                    form_control = control_match.group(1)
+                    name_discipline = CONTROL_IN_NAME_STRIP.sub('', name_discipline)
+            
+            loans = 0
+            if credit_idx is not None and credit_idx < len(cells):
+                loans_text = cells[credit_idx].replace(',', '.')
+                try:
+                    loans = float(loans_text)
+                except ValueError:
+                    loans = 0
+            
+            semestr = 0
+            if semester_idx is not None and semester_idx < len(cells):
+                semestr_text = cells[semester_idx]
+                try:
+                    semestr = int(semestr_text)
+                except ValueError:
+                    if ',' in semestr_text:
+                        try:
+                            semestr = int(semestr_text.split(',')[0])
+                        except ValueError:
+                            semestr = 0
+            
+            discipline = {
+                "idBindMainDisciplines": 0,
+                "codeMainDisciplines": code,
+                "disciplineName": name_discipline,
+                "loans": loans,
+                "formControll": form_control,
+                "semestr": semestr,
+            }
+            main_disciplines.append(discipline)
+    
+    return main_disciplines
+
+def parse_educational_programs(file_path: Source, backend: Optional[str] = None) -> Dict[str, Any]:
     try:
-        doc = docx.Document(file_path)
+        doc = load_document_model(file_path, backend)
         
-        program_name = ""
-        program_name_en = ""
-        degree = ""
-        accreditation_type = ""
-        credits = 0
-        speciality = "" 
+        tables = snapshot_tables(doc)
         
-        semester_counts = {3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
+        program_name, program_name_en, degree, speciality, accreditation_type, credits = extract_table_metadata(tables)
         
-        for table in doc.tables:
-            for row in table.rows:
-                if len(row.cells) < 2:
-                    continue
-                    
-                header_cell = row.cells[0].text.strip().lower()
-                value_cell = row.cells[1].text.strip()
-                
-                if ("офіційна назва освітньої програми" in header_cell or 
-                    "повна назва освітньої програми" in header_cell) and "англійськ" not in header_cell:
-                    program_name = value_cell
-                    print(f"Found Ukrainian program name in table: {program_name}")
-                
-                elif ("офіційна назва освітньої програми" in header_cell or 
-                      "назва освітньої програми" in header_cell) and "англійськ" in header_cell:
-                    program_name_en = value_cell
-                    print(f"Found English program name in table: {program_name_en}")
-                
-                elif re.search(r'ступінь.*освіти|кваліфікація', header_cell):
-                    degree_match = re.search(r'бакалавр|магістр|доктор філософії', value_cell, re.IGNORECASE)
-                    if degree_match:
-                        degree = degree_match.group(0).lower()
-                
-                elif re.search(r'спеціальність', header_cell):
-                    if "111" in value_cell or re.search(r'математика', value_cell, re.IGNORECASE):
-                        speciality = "111 Математика"
-                    else:
-                        speciality_match = re.search(r'(\d+)\s+(\w+)', value_cell)
-                        if speciality_match:
-                            spec_num = speciality_match.group(1)
-                            spec_name = speciality_match.group(2)
-                            if spec_num == "11" and re.search(r'математика', spec_name, re.IGNORECASE):
-                                speciality = "111 Математика"
-                            else:
-                                speciality = f"{spec_num} {spec_name}"
-                
-                elif re.search(r'акредитаці[яї]|наявність', header_cell):
-                    accreditation_type = value_cell
-                
-                elif re.search(r'обсяг|диплом', header_cell) and 'кредит' in value_cell.lower():
-                    credits_match = re.search(r'(\d+)\s*кредит', value_cell)
-                    if credits_match:
-                        credits = int(credits_match.group(1))
+        text = doc.text
         
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+        needed_fields = []
+        if not program_name:
+            needed_fields += PROGRAM_NAME_FIELDS
+        if not degree:
+            needed_fields.append("degree")
+        if not speciality or speciality != "111 Математика":
+            needed_fields += ["math_speciality", "mathematics"]
+        if not credits:
+            needed_fields.append("credits")
+        
+        matches = TEXT_RULES.scan(text, needed_fields)
         
         if not program_name:
-            ukr_patterns = [
-                r'Освітньо-професійна програма «([^»]+)»',
-                r'Освітня програма: «([^»]+)»',
-                r'Офіційна назва освітньої програми[:\s]+([^\n]+)'
-            ]
-            
-            for pattern in ukr_patterns:
-                ukr_match = re.search(pattern, text, re.IGNORECASE)
+            for field in PROGRAM_NAME_FIELDS:
+                ukr_match = matches.get(field)
                 if ukr_match:
                     if "Освітньо-професійна програма" in ukr_match.group(0):
                         program_name = f"Освітньо-професійна програма «{ukr_match.group(1).strip()}»"
@@ -152,56 +430,27 @@ async def parse_educational_programs(file_path: str) -> Dict[str, Any]:
                     break
         
         if not degree:
-            degree_match = re.search(r'ступінь[:\s]+([^\n]+)', text, re.IGNORECASE)
+            degree_match = matches.get("degree")
             if degree_match:
                 degree = degree_match.group(1).strip().lower()
         
         if not speciality or speciality != "111 Математика":
-            math_speciality_match = re.search(r'спеціальність[:\s]+(\d+)[^\n,;]*(?:математика)', text, re.IGNORECASE)
+            math_speciality_match = matches.get("math_speciality")
             if math_speciality_match:
                 spec_num = math_speciality_match.group(1).strip()
                 if spec_num == "11" or spec_num == "111":
                     speciality = "111 Математика"
-            elif re.search(r'математика', text, re.IGNORECASE):
+            elif "mathematics" in matches:
                 speciality = "111 Математика"
         
         if not credits:
-            credits_match = re.search(r'(\d+)\s*кредит', text)
+            credits_match = matches.get("credits")
             if credits_match:
                 credits = int(credits_match.group(1))
         
         final_program_name = program_name if program_name else "Освітня програма"
         
-        for table in doc.tables:
-            is_electives_table = False
-            for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells]
-                if any(re.search(r'Вибіркові компоненти|ВК \d+', cell) for cell in cells):
-                    is_electives_table = True
-                    break
-            
-            if not is_electives_table:
-                continue
-                
-            for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells]
-                
-                if len(cells) < 3:
-                    continue
-                
-                if cells[0].startswith("ВК"):
-                    try:
-                        semester = 0
-                        for idx in range(len(cells) - 1, 0, -1):
-                            if re.match(r'^\d+$', cells[idx]):
-                                semester = int(cells[idx])
-                                break
-                        
-                        if semester in semester_counts:
-                            semester_counts[semester] += 1
-                        
-                    except (ValueError, IndexError):
-                        pass
+        semester_counts = count_electives(tables)
         
         print(f"Electives per semester: {semester_counts}")
         
@@ -226,138 +475,14 @@ async def parse_educational_programs(file_path: str) -> Dict[str, Any]:
             "disciplinesCount": 0
         }
         
-        main_disciplines = []
-        
-        target_tables = []
-        
-        for table_idx, table in enumerate(doc.tables):
-            found_cycle = False
-            found_electives = False
-            
-            for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells]
-                
-                if any("І Цикл загальної підготовки" in cell for cell in cells):
-                    found_cycle = True
-                
-                if found_cycle and any("Вибіркові компоненти" in cell for cell in cells):
-                    found_electives = True
-            
-            if found_cycle:
-                target_tables.append(table_idx)
-        
-        for table_idx in target_tables:
-            table = doc.tables[table_idx]
-            
-            is_collecting = False
-            header_row = None
-            
-            for row_idx, row in enumerate(table.rows):
-                cells = [cell.text.strip() for cell in row.cells]
-                
-                if any("І Цикл загальної підготовки" in cell for cell in cells):
-                    is_collecting = True
-                    if row_idx + 1 < len(table.rows):
-                        header_cells = [cell.text.strip() for cell in table.rows[row_idx + 1].cells]
-                        if any(re.search(r'форма.*контролю|семестр|кредити', cell, re.IGNORECASE) for cell in header_cells):
-                            header_row = header_cells
-                    continue
-                
-                if is_collecting and any(re.search(r'Вибіркові компоненти', cell, re.IGNORECASE) for cell in cells):
-                    is_collecting = False
-                    break
-                
-                if not is_collecting or len(cells) < 3:
-                    continue
-                
-                if not cells[0].startswith("ОК"):
-                    continue
-                
-                code = cells[0].strip()
-                
-                name_idx = 1
-                form_control_idx = None
-                credit_idx = None
-                semester_idx = None
-                
-                if header_row:
-                    for i, header in enumerate(header_row):
-                        if re.search(r'форма.*контролю', header, re.IGNORECASE):
-                            form_control_idx = i
-                        elif re.search(r'кредити|ЄКТС', header, re.IGNORECASE):
-                            credit_idx = i
-                        elif re.search(r'семестр', header, re.IGNORECASE):
-                            semester_idx = i
-                
-                if form_control_idx is None:
-                    for i in range(2, min(5, len(cells))):
-                        if re.search(r'екзамен|залік|іспит', cells[i], re.IGNORECASE):
-                            form_control_idx = i
-                            break
-                
-                if credit_idx is None:
-                    for i in range(1, min(5, len(cells))):
-                        if re.match(r'^\d+(?:[.,]\d+)?$', cells[i]):
-                            credit_idx = i
-                            break
-                
-                if semester_idx is None:
-                    for i in range(len(cells) - 1, 0, -1):
-                        if re.match(r'^\d+$', cells[i]) or re.match(r'^\d+(?:,\d+)+$', cells[i]):
-                            semester_idx = i
-                            break
-                
-                name_discipline = cells[name_idx] if name_idx < len(cells) else ""
-                
-                form_control = ""
-                if form_control_idx is not None and form_control_idx < len(cells):
-                    form_control = cells[form_control_idx]
-                elif len(cells) > 2:
-                    control_match = re.search(r'(екзамен|залік|іспит|диф\.\s*залік)', name_discipline, re.IGNORECASE)
-                    if control_match:
-                        form_control = control_match.group(1)
-                        name_discipline = re.sub(r'\s*[(]?екзамен|залік|іспит|диф\.\s*залік[)]?\s*', '', name_discipline, flags=re.IGNORECASE)
-                
-                loans = 0
-                if credit_idx is not None and credit_idx < len(cells):
-                    loans_text = cells[credit_idx].replace(',', '.')
-                    try:
-                        loans = float(loans_text)
-                    except ValueError:
-                        loans = 0
-                
-                semestr = 0
-                if semester_idx is not None and semester_idx < len(cells):
-                    semestr_text = cells[semester_idx]
-                    try:
-                        semestr = int(semestr_text)
-                    except ValueError:
-                        if ',' in semestr_text:
-                            try:
-                                semestr = int(semestr_text.split(',')[0])
-                            except ValueError:
-                                semestr = 0
-                
-                discipline = {
-                    "idBindMainDisciplines": 0,
-                    "codeMainDisciplines": code,
-                    "disciplineName": name_discipline,
-                    "loans": loans,
-                    "formControll": form_control,
-                    "semestr": semestr,
-                }
-                main_disciplines.append(discipline)
+        main_disciplines = collect_cycle_disciplines(tables)
         
         if not main_disciplines:
-            match = re.search(r'І Цикл загальної підготовки(.*?)Вибіркові компоненти', text, re.DOTALL | re.IGNORECASE)
+            match = CYCLE_SECTION.search(text)
             if match:
                 disciplines_text = match.group(1)
                 
-                discipline_matches = re.finditer(
-                    r'(ОК\s*\d+(?:\.\d+)?)\s+([^\n]+?)\s+(\d+(?:[.,]\d+)?)\s+(екзамен|залік|іспит|диф\.\s*залік)\s+(\d+(?:,\d+)?)',
-                    disciplines_text,
-                    re.IGNORECASE
-                )
+                discipline_matches = MAIN_DISCIPLINE_ROW.finditer(disciplines_text)
                 
                 for match in discipline_matches:
                     code = match.group(1).strip()
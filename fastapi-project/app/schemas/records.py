@@ -0,0 +1,49 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Type, TypeVar
+
+# Компактні типізовані записи студентів з полями моделі app/schemas, але з іменами ключів,
+# які реально повертає парсер (IDstudent, nameStudent тощо). На відміну від
+# pydantic-моделей не валідуються при створенні й займають менше пам'яті (__slots__);
+# app.utils.serialization серіалізує їх напряму, без перетворення на словники.
+
+RecordType = TypeVar("RecordType")
+
+
+def _from_dict(cls: Type[RecordType], data: Dict[str, Any]) -> RecordType:
+    return cls(**{field.name: data.get(field.name, field.default) for field in fields(cls)})
+
+
+@dataclass(slots=True)
+class EducationDateRecord:
+    year: int
+    month: int
+    day: int
+    dayOfWeek: int
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["EducationDateRecord"]:
+        return _from_dict(cls, data) if data is not None else None
+
+
+@dataclass(slots=True)
+class StudentRecord:
+    IDstudent: Optional[int] = None
+    nameStudent: Optional[str] = None
+    educationStart: Optional[EducationDateRecord] = None
+    educationEnd: Optional[EducationDateRecord] = None
+    course: Optional[int] = None
+    facultyId: Optional[int] = None
+    educationalDegreeId: Optional[int] = None
+    studyFormId: Optional[int] = None
+    isShort: int = 0
+    educationalProgramId: Optional[int] = None
+    departmentId: Optional[int] = None
+    groupId: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StudentRecord":
+        record = _from_dict(cls, data)
+        record.educationStart = EducationDateRecord.from_dict(data.get("educationStart"))
+        record.educationEnd = EducationDateRecord.from_dict(data.get("educationEnd"))
+        return record
+
@@ -0,0 +1,346 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import time
+from app.core.config import settings
+from app.core.database import SQLiteDatabase, sqlite_path
+from app.schemas.records import StudentRecord
+
+# Таблиці повторюють app/schemas: колонки мають ті самі імена, що й поля результатів
+# парсерів; вкладені об'єкти (дати навчання, details дисципліни) зберігаються як JSON.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS imports (
+    source_hash TEXT NOT NULL,
+    parser_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    imported_at REAL NOT NULL,
+    PRIMARY KEY (source_hash, parser_key)
+);
+CREATE TABLE IF NOT EXISTS students (
+    IDstudent INTEGER PRIMARY KEY,
+    nameStudent TEXT,
+    educationStart TEXT,
+    educationEnd TEXT,
+    course INTEGER,
+    facultyId INTEGER,
+    educationalDegreeId INTEGER,
+    studyFormId INTEGER,
+    isShort INTEGER,
+    educationalProgramId INTEGER,
+    departmentId INTEGER,
+    groupId INTEGER,
+    source_file TEXT NOT NULL,
+    source_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS students_group ON students (groupId);
+CREATE INDEX IF NOT EXISTS students_program ON students (educationalProgramId);
+CREATE TABLE IF NOT EXISTS disciplines (
+    source_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    source_hash TEXT NOT NULL,
+    nameAddDisciplines TEXT,
+    codeAddDisciplines TEXT,
+    faculty TEXT,
+    minCountPeople INTEGER,
+    maxCountPeople INTEGER,
+    minCourse INTEGER,
+    maxCourse INTEGER,
+    addSemestr TEXT,
+    degreeLevel TEXT,
+    details TEXT,
+    idAddDisciplines INTEGER,
+    PRIMARY KEY (source_file, position)
+);
+CREATE INDEX IF NOT EXISTS disciplines_code ON disciplines (codeAddDisciplines);
+CREATE INDEX IF NOT EXISTS disciplines_semester ON disciplines (addSemestr);
+CREATE TABLE IF NOT EXISTS educational_programs (
+    source_file TEXT PRIMARY KEY,
+    source_hash TEXT NOT NULL,
+    idEducationalProgram INTEGER,
+    nameEducationalProgram TEXT,
+    countAddSemestr3 INTEGER,
+    countAddSemestr4 INTEGER,
+    countAddSemestr5 INTEGER,
+    countAddSemestr6 INTEGER,
+    countAddSemestr7 INTEGER,
+    countAddSemestr8 INTEGER,
+    degree TEXT,
+    speciality TEXT,
+    accreditation INTEGER,
+    accreditationType TEXT,
+    studentsAmount INTEGER,
+    studentsCount INTEGER,
+    disciplinesCount INTEGER
+);
+CREATE TABLE IF NOT EXISTS main_disciplines (
+    source_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    idBindMainDisciplines INTEGER,
+    codeMainDisciplines TEXT,
+    disciplineName TEXT,
+    loans REAL,
+    formControll TEXT,
+    semestr INTEGER,
+    educationalProgramName TEXT,
+    PRIMARY KEY (source_file, position)
+);
+CREATE INDEX IF NOT EXISTS main_disciplines_code ON main_disciplines (codeMainDisciplines);
+CREATE INDEX IF NOT EXISTS main_disciplines_semester ON main_disciplines (semestr);
+CREATE TABLE IF NOT EXISTS roster_fingerprints (
+    roster TEXT NOT NULL,
+    IDstudent INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (roster, IDstudent)
+);
+CREATE TABLE IF NOT EXISTS roster_imports (
+    roster TEXT PRIMARY KEY,
+    source_hash TEXT NOT NULL,
+    students INTEGER NOT NULL,
+    imported_at REAL NOT NULL
+);
+"""
+
+STUDENT_COLUMNS = (
+    "IDstudent", "nameStudent", "educationStart", "educationEnd", "course", "facultyId",
+    "educationalDegreeId", "studyFormId", "isShort", "educationalProgramId", "departmentId", "groupId"
+)
+DISCIPLINE_COLUMNS = (
+    "nameAddDisciplines", "codeAddDisciplines", "faculty", "minCountPeople", "maxCountPeople",
+    "minCourse", "maxCourse", "addSemestr", "degreeLevel", "details", "idAddDisciplines"
+)
+PROGRAM_COLUMNS = (
+    "idEducationalProgram", "nameEducationalProgram", "countAddSemestr3", "countAddSemestr4",
+    "countAddSemestr5", "countAddSemestr6", "countAddSemestr7", "countAddSemestr8", "degree",
+    "speciality", "accreditation", "accreditationType", "studentsAmount", "studentsCount", "disciplinesCount"
+)
+MAIN_DISCIPLINE_COLUMNS = (
+    "idBindMainDisciplines", "codeMainDisciplines", "disciplineName", "loans", "formControll",
+    "semestr", "educationalProgramName"
+)
+JSON_COLUMNS = {"educationStart", "educationEnd", "details"}
+
+STORE_KINDS = ("students", "disciplines", "educational-programs")
+
+
+def _value(column: str, value: Any) -> Any:
+    if column in JSON_COLUMNS:
+        return json.dumps(value, ensure_ascii=False) if value is not None else None
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def _row(record: Dict[str, Any], columns: Tuple[str, ...]) -> List[Any]:
+    return [_value(column, record.get(column)) for column in columns]
+
+
+def _record(row: Any, columns: Tuple[str, ...]) -> Dict[str, Any]:
+    record = {}
+    for column in columns:
+        value = row[column]
+        record[column] = json.loads(value) if column in JSON_COLUMNS and value is not None else value
+    return record
+
+
+def _insert(table: str, columns: Tuple[str, ...]) -> str:
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+class DataStore(SQLiteDatabase):
+    """
+    Індексоване сховище результатів парсингу. Результати записуються пакетно
+    (executemany в одній транзакції) після кожного розбору, а запити з фільтрами
+    й пагінацією обслуговуються з індексів без повторного парсингу файлів.
+
+    Студенти ідентифікуються за IDstudent (останній імпорт перезаписує запис),
+    дисципліни — позицією у файлі-джерелі, освітня програма — файлом-джерелом.
+    Повторний запис того самого результату (той самий вміст файлу й параметри)
+    пропускається за таблицею imports.
+
+    Обмеження:
+    - файл-джерело — це ім'я файлу без шляху, тож різні файли з однаковим ім'ям
+      (наприклад, два завантаження student.xlsx) замінюють дисципліни й програму
+      одне одного — як нова версія того самого файлу;
+    - розбір списку студентів лише додає й оновлює записи: студенти, яких більше
+      немає у файлі, не видаляються (для цього — /import-students, див.
+      apply_roster_changes).
+    """
+
+    schema = SCHEMA
+
+    def is_imported(self, source_hash: str, parser_key: str) -> bool:
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM imports WHERE source_hash = ? AND parser_key = ?", (source_hash, parser_key)
+            ).fetchone()
+        return row is not None
+
+    def save(self, kind: str, file_path: str, source_hash: str, parser_key: str, result: Any) -> int:
+        """
+        Записує результат парсингу типу `kind` (див. STORE_KINDS) і повертає кількість записаних рядків.
+        """
+        source_file = os.path.basename(file_path)
+        with self.connect() as connection:
+            if kind == "students":
+                rows = [
+                    _row(student, STUDENT_COLUMNS) + [source_file, source_hash]
+                    for student in result if student.get("IDstudent") is not None
+                ]
+                connection.executemany(_insert("students", STUDENT_COLUMNS + ("source_file", "source_hash")), rows)
+
+            elif kind == "disciplines":
+                # Новий вміст файлу замінює всі його дисципліни, той самий — лише доповнює
+                # (розбір з меншим limit дає префікс попереднього)
+                connection.execute(
+                    "DELETE FROM disciplines WHERE source_file = ? AND source_hash != ?", (source_file, source_hash)
+                )
+                rows = [
+                    [source_file, position, source_hash] + _row(discipline, DISCIPLINE_COLUMNS)
+                    for position, discipline in enumerate(result)
+                ]
+                connection.executemany(
+                    _insert("disciplines", ("source_file", "position", "source_hash") + DISCIPLINE_COLUMNS), rows
+                )
+
+            elif kind == "educational-programs":
+                program = result.get("educationalProgram") or {}
+                main_disciplines = result.get("mainDisciplines") or []
+                connection.execute(
+                    _insert("educational_programs", ("source_file", "source_hash") + PROGRAM_COLUMNS),
+                    [source_file, source_hash] + _row(program, PROGRAM_COLUMNS)
+                )
+                connection.execute("DELETE FROM main_disciplines WHERE source_file = ?", (source_file,))
+                rows = [
+                    [source_file, position] + _row(discipline, MAIN_DISCIPLINE_COLUMNS)
+                    for position, discipline in enumerate(main_disciplines)
+                ]
+                connection.executemany(
+                    _insert("main_disciplines", ("source_file", "position") + MAIN_DISCIPLINE_COLUMNS), rows
+                )
+                # Рядок самої програми теж враховується
+                rows.append(program)
+
+            else:
+                raise ValueError(f"Невідомий тип даних для збереження: {kind}. Допустимі: {', '.join(STORE_KINDS)}")
+
+            connection.execute(
+                "INSERT OR REPLACE INTO imports (source_hash, parser_key, kind, source_file, rows, imported_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source_hash, parser_key, kind, source_file, len(rows), time.time())
+            )
+        return len(rows)
+
+    def _page(self, table: str, columns: Tuple[str, ...], filters: Dict[str, Any],
+              order_by: str, limit: int, offset: int, record_type: Optional[Any] = None) -> Dict[str, Any]:
+        conditions = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self.connect() as connection:
+            total = connection.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT * FROM {table}{where} ORDER BY {order_by} LIMIT ? OFFSET ?", params + [limit, offset]
+            ).fetchall()
+
+        return {
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "items": [
+                record_type.from_dict(_record(row, columns)) if record_type else _record(row, columns)
+                for row in rows
+            ]
+        }
+
+    def query_students(self, limit: int, offset: int, IDstudent: Optional[int] = None,
+                       groupId: Optional[int] = None, educationalProgramId: Optional[int] = None) -> Dict[str, Any]:
+        filters = {"IDstudent": IDstudent, "groupId": groupId, "educationalProgramId": educationalProgramId}
+        return self._page("students", STUDENT_COLUMNS, filters, "IDstudent", limit, offset, StudentRecord)
+
+    def query_disciplines(self, limit: int, offset: int, code: Optional[str] = None,
+                          semester: Optional[str] = None) -> Dict[str, Any]:
+        filters = {"codeAddDisciplines": code, "addSemestr": semester}
+        return self._page("disciplines", DISCIPLINE_COLUMNS + ("source_file",), filters,
+                          "source_file, position", limit, offset)
+
+    def query_main_disciplines(self, limit: int, offset: int, code: Optional[str] = None,
+                               semester: Optional[int] = None, source_file: Optional[str] = None) -> Dict[str, Any]:
+        filters = {"codeMainDisciplines": code, "semestr": semester, "source_file": source_file}
+        return self._page("main_disciplines", MAIN_DISCIPLINE_COLUMNS + ("source_file",), filters,
+                          "source_file, position", limit, offset)
+
+    def query_programs(self, limit: int, offset: int) -> Dict[str, Any]:
+        return self._page("educational_programs", PROGRAM_COLUMNS + ("source_file",), {},
+                          "source_file", limit, offset)
+
+    def roster_fingerprints(self, roster: str) -> Optional[Dict[int, str]]:
+        """Відбитки студентів попереднього імпорту списку `roster` або None, якщо імпорту ще не було."""
+        with self.connect() as connection:
+            if connection.execute("SELECT 1 FROM roster_imports WHERE roster = ?", (roster,)).fetchone() is None:
+                return None
+            rows = connection.execute(
+                "SELECT IDstudent, fingerprint FROM roster_fingerprints WHERE roster = ?", (roster,)
+            ).fetchall()
+        return {row["IDstudent"]: row["fingerprint"] for row in rows}
+
+    def roster_records(self, roster: str, student_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Збережені записи вказаних студентів списку (для визначення змінених полів)."""
+        records = {}
+        with self.connect() as connection:
+            # Не більше 500 параметрів на запит (ліміт SQLite — 999 у старих збірках)
+            for start in range(0, len(student_ids), 500):
+                chunk = student_ids[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT IDstudent, record FROM roster_fingerprints WHERE roster = ? "
+                    f"AND IDstudent IN ({', '.join('?' * len(chunk))})",
+                    [roster] + chunk
+                ).fetchall()
+                records.update({row["IDstudent"]: json.loads(row["record"]) for row in rows})
+        return records
+
+    def apply_roster_changes(self, roster: str, source_hash: str, students: int,
+                             upserts: List[Tuple[int, str, Dict[str, Any]]], removed: List[int]) -> None:
+        """Оновлює відбитки списку: upserts — (IDstudent, відбиток, запис), removed — IDstudent."""
+        with self.connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO roster_fingerprints (roster, IDstudent, fingerprint, record) VALUES (?, ?, ?, ?)",
+                [(roster, student_id, fingerprint, json.dumps(record, ensure_ascii=False))
+                 for student_id, fingerprint, record in upserts]
+            )
+            connection.executemany(
+                "DELETE FROM roster_fingerprints WHERE roster = ? AND IDstudent = ?",
+                [(roster, student_id) for student_id in removed]
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO roster_imports (roster, source_hash, students, imported_at) VALUES (?, ?, ?, ?)",
+                (roster, source_hash, students, time.time())
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self.connect() as connection:
+            return {
+                table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("students", "disciplines", "educational_programs", "main_disciplines", "imports")
+            }
+
+
+data_store = DataStore(sqlite_path(settings.database_url))
+
+
+async def store_result(kind: str, file_path: str, source_hash: str, parser_key: str, result: Any) -> None:
+    """
+    Записує результат у data_store, якщо сховище увімкнене і цей результат ще не записаний.
+    Помилка запису не впливає на відповідь парсера.
+    """
+    if not settings.DATA_STORE_ENABLED:
+        return
+    try:
+        if await asyncio.to_thread(data_store.is_imported, source_hash, parser_key):
+            return
+        await asyncio.to_thread(data_store.save, kind, file_path, source_hash, parser_key, result)
+    except Exception as e:
+        print(f"Не вдалося записати результат у сховище даних: {str(e)}")
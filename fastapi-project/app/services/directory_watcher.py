@@ -0,0 +1,231 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from app.core.config import settings
+from app.services.parser_service import ParserService
+
+# Які розбори прогріваються для кожного розширення
+WARM_KINDS = {
+    ".xlsx": ["students", "disciplines"],
+    ".pdf": ["educational-programs", "disciplines"],
+    ".docx": ["educational-programs", "disciplines"],
+}
+
+# Константи inotify з <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+Signature = Tuple[int, int]
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _is_candidate(name: str) -> bool:
+    # ~$name.docx — файли блокування Office, .name — тимчасові файли
+    if name.startswith(("~$", ".")):
+        return False
+    return os.path.splitext(name)[1].lower() in WARM_KINDS
+
+
+def _open_inotify(directory: str) -> Optional[int]:
+    """Дескриптор inotify для каталогу або None, якщо inotify недоступний (не Linux тощо)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class DirectoryWatcher:
+    """
+    Фоновий прогрівач кешу: стежить за каталогом (inotify, або опитування,
+    якщо inotify недоступний) і наперед розбирає нові та змінені файли,
+    щоб перший запит до них був влучанням у кеш результатів.
+
+    Файли обробляються по одному, після паузи `debounce` секунд без змін,
+    тож прогрів не конкурує з інтерактивними запитами за пул парсерів.
+    """
+
+    def __init__(self, directory: Union[str, Callable[[], str]], poll_interval: float, debounce: float, limit: int):
+        self._directory = directory
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.limit = limit
+        self.mode: Optional[str] = None
+        self.processed = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+        self._service = ParserService()
+        self._pending: Dict[str, float] = {}
+        self._signatures: Dict[str, Signature] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._fd: Optional[int] = None
+
+    @property
+    def directory(self) -> str:
+        return self._directory() if callable(self._directory) else self._directory
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        loop = asyncio.get_running_loop()
+
+        self._fd = _open_inotify(self.directory)
+        if self._fd is not None:
+            self.mode = "inotify"
+            loop.add_reader(self._fd, self._read_events)
+        else:
+            self.mode = "polling"
+            self._tasks.append(asyncio.create_task(self._poll()))
+
+        # Файли, що вже лежать у каталогі, теж прогріваються (для вже кешованих це лише хеш)
+        self._scan()
+        self._tasks.append(asyncio.create_task(self._process()))
+        print(f"Спостереження за каталогом {self.directory} запущено ({self.mode})")
+
+    async def stop(self) -> None:
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def schedule(self, path: str) -> None:
+        self._pending[path] = time.monotonic() + self.debounce
+        self._wakeup.set()
+
+    def _scan(self) -> None:
+        """Порівнює вміст каталогу з попереднім знімком і планує нові та змінені файли."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError as e:
+            self.last_error = str(e)
+            return
+
+        seen = set()
+        for name in names:
+            if not _is_candidate(name):
+                continue
+            path = os.path.join(self.directory, name)
+            signature = _signature(path)
+            if signature is None:
+                continue
+            seen.add(path)
+            if self._signatures.get(path) != signature:
+                self._signatures[path] = signature
+                self.schedule(path)
+
+        for path in set(self._signatures) - seen:
+            del self._signatures[path]
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            if not data:
+                return
+
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    self._scan()
+                elif _is_candidate(name):
+                    self.schedule(os.path.join(self.directory, name))
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            self._scan()
+
+    async def _process(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            path, due = min(self._pending.items(), key=lambda item: item[1])
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            del self._pending[path]
+            await self._warm(path)
+
+    async def _warm(self, path: str) -> None:
+        signature = _signature(path)
+        if signature is None:
+            return
+
+        kinds = WARM_KINDS[os.path.splitext(path)[1].lower()]
+        for kind in kinds:
+            try:
+                await self._service.parse_file(path, kind, self.limit)
+            except Exception as e:
+                self.failed += 1
+                self.last_error = f"{os.path.basename(path)} ({kind}): {str(e)}"
+                print(f"Помилка фонового розбору {self.last_error}")
+
+        self.processed += 1
+        self._signatures[path] = signature
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.running,
+            "mode": self.mode,
+            "directory": self.directory,
+            "pending": len(self._pending),
+            "processed": self.processed,
+            "failed": self.failed,
+            "last_error": self.last_error
+        }
+
+
+directory_watcher = DirectoryWatcher(
+    directory=lambda: settings.FILES_DIRECTORY,
+    poll_interval=settings.WATCHER_POLL_INTERVAL,
+    debounce=settings.WATCHER_DEBOUNCE,
+    limit=settings.WATCHER_LIMIT
+)
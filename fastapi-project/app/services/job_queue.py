@@ -0,0 +1,258 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import os
+import time
+import uuid
+from app.core.config import settings
+from app.core.database import SQLiteDatabase, sqlite_path
+from app.services.parser_service import ParserService
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS parse_jobs_status ON parse_jobs (status, created_at);
+"""
+
+
+class JobStore(SQLiteDatabase):
+    """
+    Таблиця завдань парсингу в SQLite. Завдання в стані running належить процесу
+    `owner` до `lease_until`; процес продовжує оренду, поки працює, тож чуже
+    завдання повертається в чергу лише після аварійного завершення власника.
+    """
+
+    schema = SCHEMA
+    added_columns = (
+        ("parse_jobs", "owner", "TEXT"),
+        ("parse_jobs", "lease_until", "REAL"),
+    )
+
+    def create(self, kind: str, filename: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT INTO parse_jobs (id, kind, filename, params, status, created_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, filename, json.dumps(params), time.time())
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str, with_result: bool = False) -> Optional[Dict[str, Any]]:
+        columns = "*" if with_result else "id, kind, filename, params, status, attempts, created_at, started_at, finished_at, error"
+        with self.connect() as connection:
+            row = connection.execute(f"SELECT {columns} FROM parse_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        # Службові поля оренди (і застаріла колонка progress старих баз) не повертаються
+        for column in ("owner", "lease_until", "progress"):
+            job.pop(column, None)
+        job["params"] = json.loads(job["params"])
+        if with_result:
+            job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Переводить завдання в running з орендою `owner`; False, якщо його вже взяв інший воркер."""
+        now = time.time()
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "UPDATE parse_jobs SET status = 'running', attempts = attempts + 1, started_at = ?, owner = ?, lease_until = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (now, owner, now + lease_seconds, job_id)
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, owner: str, lease_seconds: float) -> int:
+        """Продовжує оренду всіх завдань, які виконує `owner`."""
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "UPDATE parse_jobs SET lease_until = ? WHERE status = 'running' AND owner = ?",
+                (time.time() + lease_seconds, owner)
+            )
+            return cursor.rowcount
+
+    def finish(self, job_id: str, owner: str, result: Any) -> None:
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE parse_jobs SET status = 'done', finished_at = ?, result = ?, error = NULL, lease_until = NULL "
+                "WHERE id = ? AND owner = ?",
+                (time.time(), json.dumps(result, ensure_ascii=False), job_id, owner)
+            )
+
+    def fail(self, job_id: str, owner: str, error: str) -> None:
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE parse_jobs SET status = 'failed', finished_at = ?, error = ?, lease_until = NULL "
+                "WHERE id = ? AND owner = ?",
+                (time.time(), error, job_id, owner)
+            )
+
+    def release(self, owner: str) -> int:
+        """
+        Повертає в чергу завдання, перервані зупинкою процесу `owner`. Спроба
+        не зараховується: завдання не завершилося аварійно, його зупинили.
+        """
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "UPDATE parse_jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), started_at = NULL, "
+                "owner = NULL, lease_until = NULL WHERE status = 'running' AND owner = ?",
+                (owner,)
+            )
+            return cursor.rowcount
+
+    def requeue_expired(self, max_attempts: int) -> List[str]:
+        """
+        Завдання з простроченою орендою (процес-власник аварійно завершився):
+        після max_attempts запусків вони стають failed, решта повертається в чергу.
+
+        Returns:
+            id завдань, повернутих у чергу
+        """
+        now = time.time()
+        expired = "status = 'running' AND (lease_until IS NULL OR lease_until < ?)"
+        with self.connect() as connection:
+            connection.execute(
+                f"UPDATE parse_jobs SET status = 'failed', finished_at = ?, lease_until = NULL, "
+                f"error = 'Завдання перервано аварійним завершенням процесу ' || attempts || ' раз(и)' "
+                f"WHERE {expired} AND attempts >= ?",
+                (now, now, max_attempts)
+            )
+            rows = connection.execute(f"SELECT id FROM parse_jobs WHERE {expired}", (now,)).fetchall()
+            connection.execute(
+                f"UPDATE parse_jobs SET status = 'queued', started_at = NULL, owner = NULL, lease_until = NULL WHERE {expired}",
+                (now,)
+            )
+        return [row["id"] for row in rows]
+
+    def queued_ids(self) -> List[str]:
+        with self.connect() as connection:
+            rows = connection.execute("SELECT id FROM parse_jobs WHERE status = 'queued' ORDER BY created_at").fetchall()
+        return [row["id"] for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self.connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) AS count FROM parse_jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+
+class JobQueue:
+    """
+    Асинхронні завдання парсингу: стан зберігається в JobStore, а `workers`
+    фонових задач виконують їх через ParserService (тобто спільний пул парсерів
+    і кеш результатів). Кілька процесів сервісу можуть працювати з однією базою:
+    кожен має власний `owner` і продовжує оренду своїх завдань (JobStore), а
+    завдання процесу, що аварійно завершився, повертаються в чергу після
+    закінчення оренди (не більше JOB_MAX_ATTEMPTS запусків).
+    """
+
+    def __init__(self, store: JobStore, workers: int, lease_seconds: float, max_attempts: int):
+        self.store = store
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._service = ParserService()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+
+        requeued = await asyncio.to_thread(self.store.requeue_expired, self.max_attempts)
+        if requeued:
+            print(f"Відновлено перерваних завдань парсингу: {len(requeued)}")
+        for job_id in await asyncio.to_thread(self.store.queued_ids):
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+        self._tasks.append(asyncio.create_task(self._maintain()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        released = await asyncio.to_thread(self.store.release, self.owner)
+        if released:
+            print(f"Повернуто в чергу перерваних зупинкою завдань: {released}")
+
+    async def _maintain(self) -> None:
+        """Продовжує оренду власних завдань і підбирає завдання процесів, що аварійно завершились."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.renew, self.owner, self.lease_seconds)
+                for job_id in await asyncio.to_thread(self.store.requeue_expired, self.max_attempts):
+                    self._queue.put_nowait(job_id)
+            except Exception as e:
+                print(f"Помилка обслуговування черги завдань: {str(e)}")
+
+    async def submit(self, kind: str, filename: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.store.create, kind, filename, params)
+        if self._queue is not None:
+            self._queue.put_nowait(job["id"])
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        if not await asyncio.to_thread(self.store.claim, job_id, self.owner, self.lease_seconds):
+            return
+        job = await asyncio.to_thread(self.store.get, job_id)
+
+        try:
+            file_path = os.path.join(settings.FILES_DIRECTORY, job["filename"])
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Файл {job['filename']} не знайдено в директорії {settings.FILES_DIRECTORY}")
+            result = await self._service.parse_file(file_path, job["kind"], job["params"].get("limit", 5))
+        except asyncio.CancelledError:
+            # Зупинка сервісу: stop() повертає завдання в чергу
+            raise
+        except Exception as e:
+            print(f"Помилка завдання парсингу {job_id}: {str(e)}")
+            await asyncio.to_thread(self.store.fail, job_id, self.owner, str(e))
+            return
+
+        await asyncio.to_thread(self.store.finish, job_id, self.owner, result)
+
+    async def status(self) -> Dict[str, Any]:
+        return {
+            "owner": self.owner,
+            "workers": self.workers if self._tasks else 0,
+            "queued_in_memory": self._queue.qsize() if self._queue is not None else 0,
+            "counts": await asyncio.to_thread(self.store.counts)
+        }
+
+
+job_queue = JobQueue(
+    store=JobStore(sqlite_path(settings.database_url)),
+    workers=settings.JOB_WORKERS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS
+)
@@ -1,39 +1,250 @@
-from typing import Dict, Any, List, Optional
-from app.parsers import excel_parser, pdf_parser, word_parser
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator, Tuple
+import asyncio
+import os
+import time
+from app.core.config import settings
+from app.parsers.registry import excel_parser, pdf_parser, word_parser
+from app.core.executor import run_in_executor
+from app.services.result_cache import result_cache
+from app.services.data_store import store_result
+from app.services.reference_data import reference_cache
+from app.utils.file_handler import Source, source_name, source_sha256
+
+# Типи парсингу, доступні через parse_file / parse_batch
+PARSE_KINDS = ("students", "disciplines", "educational-programs")
+
+# Розширення файлів, які підтримує кожен тип парсингу
+PARSE_EXTENSIONS = {
+    "students": (".xlsx",),
+    "disciplines": (".xlsx", ".pdf", ".docx"),
+    "educational-programs": (".pdf", ".docx"),
+}
 
 class ParserService:
-    async def parse_students(self, file_path: str, file_extension: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Диспетчер парсерів: синхронна робота парсерів виконується в пулі процесів (app.core.executor),
+    а результати кешуються за вмістом файлу (app.services.result_cache).
+    """
+
+    async def _cached(self, file_path: Source, parser: str, version: Any, params: Dict[str, Any],
+                      compute: Callable[[], Awaitable[Any]], store_kind: str,
+                      meta: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Результат з кешу або обчислений `compute`; в обох випадках він потрапляє до data_store.
+        Якщо передано `meta`, туди записується result_id — ключ результату в кеші,
+        за яким його можна експортувати (/export-data з resultId).
+        """
+        file_hash, key = await self._result_key(file_path, parser, version, params)
+
+        result = await result_cache.get(key)
+        if result is None:
+            result = await compute()
+            await result_cache.set(key, result)
+
+        await store_result(store_kind, source_name(file_path), file_hash, key, result)
+        self._set_result_id(meta, key)
+        return result
+
+    async def _result_key(self, file_path: Source, parser: str, version: Any,
+                          params: Dict[str, Any]) -> Tuple[str, str]:
+        """Хеш вмісту файлу і ключ результату в кеші."""
+        file_hash = await asyncio.to_thread(source_sha256, file_path)
+        return file_hash, result_cache.make_key(file_hash, parser, version, params)
+
+    @staticmethod
+    def _set_result_id(meta: Optional[Dict[str, Any]], key: str) -> None:
+        if meta is not None and result_cache.enabled:
+            meta["result_id"] = key
+
+    @staticmethod
+    def _students_key_args(limit: int) -> Tuple[str, Any, Dict[str, Any]]:
+        """Парсер, версія і параметри ключа кешу студентів (спільні для parse_students і stream_students)."""
+        return (
+            "excel_parser.parse_students",
+            excel_parser.PARSER_VERSION,
+            {"limit": limit, "reference_data": reference_cache.fingerprint}
+        )
+
+    async def parse_students(self, file_path: Source, file_extension: str, limit: int = 5, output_file: str = None,
+                             meta: Optional[Dict[str, Any]] = None, pretty_output: bool = False) -> List[Dict[str, Any]]:
         if file_extension == '.xlsx':
-            students = await excel_parser.parse_students(file_path, limit)
+            reference_maps = await reference_cache.get()
+            students = await self._cached(
+                file_path,
+                *self._students_key_args(limit),
+                lambda: excel_parser.parse_students(file_path, limit, reference_maps=reference_maps),
+                "students",
+                meta
+            )
+
+            # Файл результатів не впливає на дані, тому записується поза кешем
+            if output_file:
+                saved_path = await asyncio.to_thread(excel_parser.save_to_json, students, output_file, pretty_output)
+                print(f"Результати збережено у файл: {saved_path}")
+                return students, saved_path
+
             return students
         else:
             raise ValueError(f"Непідтримуваний формат файлу для парсингу студентів: {file_extension}")
-    
-    async def parse_disciplines(self, file_path: str, file_extension: str, limit: int = 5) -> List[Dict[str, Any]]:
+
+    async def stream_students(self, file_path: Source, limit: int = 5,
+                              meta: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Потоковий варіант parse_students: записи пакетами (див. excel_parser.iter_students).
+        Результат кешується й потрапляє до data_store під тим самим ключем, що й у parse_students,
+        тож його можна експортувати за result_id. `meta` отримує result_id лише після
+        повного проходу; перерваний потік нічого не зберігає.
+        """
+        await reference_cache.get()
+        file_hash, key = await self._result_key(file_path, *self._students_key_args(limit))
+
+        students = await result_cache.get(key)
+        if students is not None:
+            for start in range(0, len(students), settings.STREAM_BATCH_SIZE):
+                yield students[start:start + settings.STREAM_BATCH_SIZE]
+        else:
+            students = []
+            async for batch in excel_parser.iter_students(file_path, limit):
+                students.extend(batch)
+                yield batch
+            await result_cache.set(key, students)
+
+        await store_result("students", source_name(file_path), file_hash, key, students)
+        self._set_result_id(meta, key)
+
+    async def parse_disciplines(self, file_path: Source, file_extension: str, limit: int = 5,
+                                docx_backend: Optional[str] = None,
+                                meta: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        # Бекенд DOCX не входить у ключ кешу: обидва бекенди дають однаковий результат
+        args = (file_path, limit)
         if file_extension == '.xlsx':
-            disciplines = await excel_parser.parse_disciplines(file_path, limit)
-            return disciplines
-        
+            parser = excel_parser
         elif file_extension == '.pdf':
-            disciplines = await pdf_parser.parse_disciplines(file_path, limit)
-            return disciplines
-        
+            parser = pdf_parser
         elif file_extension == '.docx':
-            disciplines = await word_parser.parse_disciplines(file_path, limit)
-            return disciplines
-            
+            parser = word_parser
+            args = (file_path, limit, docx_backend)
         else:
             raise ValueError(f"Непідтримуваний формат файлу для парсингу дисциплін: {file_extension}")
-    
-    async def parse_educational_programs(self, file_path: str, file_extension: str) -> Dict[str, Any]:
 
+        return await self._cached(
+            file_path,
+            f"{parser.__name__}.parse_disciplines",
+            parser.PARSER_VERSION,
+            {"limit": limit},
+            lambda: run_in_executor(parser.parse_disciplines, *args),
+            "disciplines",
+            meta
+        )
+
+    async def parse_educational_programs(self, file_path: Source, file_extension: str,
+                                         timings: Optional[Dict[str, Any]] = None,
+                                         docx_backend: Optional[str] = None,
+                                         meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Args:
+            meta: якщо передано, отримує result_id результату (див. _cached)
+            docx_backend: бекенд читання DOCX (див. word_parser.DOCX_BACKENDS)
+            timings: якщо передано, заповнюється часом розбору; для PDF, розібраного
+                без кешу, містить також "extraction" з прискоренням паралельного витягування
+        """
         if file_extension == '.pdf':
-            program_data = await pdf_parser.parse_educational_programs(file_path)
-            return program_data
-        
+            parser = pdf_parser
         elif file_extension == '.docx':
-            program_data = await word_parser.parse_educational_programs(file_path)
-            return program_data
-            
+            parser = word_parser
         else:
-            raise ValueError(f"Непідтримуваний формат файлу для парсингу освітніх програм: {file_extension}")
\ No newline at end of file
+            raise ValueError(f"Непідтримуваний формат файлу для парсингу освітніх програм: {file_extension}")
+
+        timings = {} if timings is None else timings
+        began = time.perf_counter()
+
+        async def compute() -> Dict[str, Any]:
+            if parser is pdf_parser:
+                result, timings["extraction"] = await run_in_executor(pdf_parser.parse_educational_programs_timed, file_path)
+                return result
+            return await run_in_executor(word_parser.parse_educational_programs, file_path, docx_backend)
+
+        result = await self._cached(
+            file_path,
+            f"{parser.__name__}.parse_educational_programs",
+            parser.PARSER_VERSION,
+            {},
+            compute,
+            "educational-programs",
+            meta
+        )
+
+        timings["total_ms"] = round((time.perf_counter() - began) * 1000, 1)
+        return result
+
+    async def parse_file(self, file_path: Source, kind: str, limit: int = 5,
+                         timings: Optional[Dict[str, Any]] = None,
+                         meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Розбирає файл парсером, обраним за типом `kind` (див. PARSE_KINDS) і розширенням.
+        `file_path` — шлях або InMemoryFile (завантаження в пам'яті); розширення береться з імені.
+        """
+        file_extension = os.path.splitext(source_name(file_path))[1].lower()
+
+        if kind == "students":
+            students = await self.parse_students(file_path, file_extension, limit, meta=meta)
+            return {"students": students, "total_processed": len(students)}
+        if kind == "disciplines":
+            disciplines = await self.parse_disciplines(file_path, file_extension, limit, meta=meta)
+            return {"disciplines": disciplines, "total_processed": len(disciplines)}
+        if kind == "educational-programs":
+            return await self.parse_educational_programs(file_path, file_extension, timings, meta=meta)
+
+        raise ValueError(f"Невідомий тип парсингу: {kind}. Допустимі: {', '.join(PARSE_KINDS)}")
+
+    async def parse_batch(self, items: List[Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+        """
+        Розбирає кілька файлів одночасно, не більше `concurrency` за раз.
+
+        Args:
+            items: Елементи {"filename", "kind", "limit"}; файли шукаються в settings.FILES_DIRECTORY
+            concurrency: Максимальна кількість файлів, що розбираються одночасно
+
+        Returns:
+            Результати в порядку елементів; помилка одного файлу не зупиняє інші
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        # Довідники завантажуються один раз на весь пакет, далі всі файли студентів беруть їх з кешу
+        if any(item["kind"] == "students" for item in items):
+            try:
+                await reference_cache.get()
+            except Exception as e:
+                print(f"Не вдалося завантажити довідники для пакета: {str(e)}")
+
+        async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+            entry = {"filename": item["filename"], "kind": item["kind"]}
+            timings: Dict[str, Any] = {}
+            queued = time.perf_counter()
+
+            async with semaphore:
+                started = time.perf_counter()
+                timings["queued_ms"] = round((started - queued) * 1000, 1)
+                try:
+                    file_path = os.path.join(settings.FILES_DIRECTORY, item["filename"])
+                    if not os.path.exists(file_path):
+                        raise FileNotFoundError(f"Файл {item['filename']} не знайдено в директорії {settings.FILES_DIRECTORY}")
+
+                    parser_timings: Dict[str, Any] = {}
+                    meta: Dict[str, Any] = {}
+                    entry["result"] = await self.parse_file(file_path, item["kind"], item.get("limit", 5), parser_timings, meta)
+                    entry["status"] = "success"
+                    if "result_id" in meta:
+                        entry["result_id"] = meta["result_id"]
+                    if "extraction" in parser_timings:
+                        timings["extraction"] = parser_timings["extraction"]
+                except Exception as e:
+                    entry["status"] = "error"
+                    entry["detail"] = str(e)
+
+                timings["parse_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+            entry["timings"] = timings
+            return entry
+
+        return list(await asyncio.gather(*(run(item) for item in items)))
@@ -0,0 +1,61 @@
+from typing import Dict, Optional, Tuple
+import asyncio
+import os
+import httpx
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.reference_cache import ReferenceDataCache
+
+# Довідники зовнішнього API для парсера студентів. Винесені з app.parsers.excel_parser,
+# щоб старт сервісу (знімок довідників у lifespan) не імпортував pandas і openpyxl.
+
+
+async def get_faculty_map(client: Optional[httpx.AsyncClient] = None) -> Dict[str, int]:
+    client = client or get_http_client()
+    response = await client.get(f"{settings.REFERENCE_API_URL}/api/Faculty", headers={"accept": "text/plain"})
+    response.raise_for_status()
+    faculties = response.json()
+    return {f["nameFaculty"]: f["idFaculty"] for f in faculties}
+
+async def get_degree_map(client: Optional[httpx.AsyncClient] = None) -> Dict[str, int]:
+    client = client or get_http_client()
+    response = await client.get(f"{settings.REFERENCE_API_URL}/api/EducationalDegree", headers={"accept": "text/plain"})
+    response.raise_for_status()
+    degrees = response.json()
+    return {d["nameEducationalDegreec"]: d["idEducationalDegree"] for d in degrees}
+
+async def get_study_form_map(client: Optional[httpx.AsyncClient] = None) -> Dict[str, int]:
+    client = client or get_http_client()
+    response = await client.get(f"{settings.REFERENCE_API_URL}/api/StudyForm", headers={"accept": "text/plain"})
+    response.raise_for_status()
+    forms = response.json()
+    return {f["nameStudyForm"]: f["idStudyForm"] for f in forms}
+
+async def get_group_map(client: Optional[httpx.AsyncClient] = None) -> Dict[str, Dict[str, int]]:
+    client = client or get_http_client()
+    response = await client.get(f"{settings.REFERENCE_API_URL}/api/Group?sortOrder=0", headers={"accept": "text/plain"})
+    response.raise_for_status()
+    groups = response.json()
+    return {g["code"].strip().upper(): {"groupId": g["id"], "departmentId": g["departmentId"]} for g in groups}
+
+async def get_reference_maps(client: Optional[httpx.AsyncClient] = None) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int], Dict[str, Dict[str, int]]]:
+    """
+    Паралельно завантажує довідники факультетів, ступенів, форм навчання та груп
+    через один спільний HTTP-клієнт.
+
+    Returns:
+        Кортеж (faculty_map, degree_map, study_form_map, group_map)
+    """
+    client = client or get_http_client()
+    return await asyncio.gather(
+        get_faculty_map(client),
+        get_degree_map(client),
+        get_study_form_map(client),
+        get_group_map(client)
+    )
+
+reference_cache = ReferenceDataCache(
+    loader=get_reference_maps,
+    ttl=settings.REFERENCE_CACHE_TTL,
+    snapshot_path=lambda: os.path.join(settings.CACHE_FOLDER, "reference_data.json")
+)
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from app.core.config import settings
+
+
+class ResultCache:
+    """
+    Кеш результатів парсингу на диску з адресацією за вмістом.
+
+    Ключ — хеш від вмісту файлу, назви і версії парсера та параметрів запиту,
+    тож змінений файл або нова версія парсера автоматично дають промах.
+    Коли сумарний розмір перевищує `max_bytes`, видаляються записи,
+    до яких найдовше не зверталися (LRU за часом модифікації файлу).
+
+    `directory` може бути функцією: тоді каталог визначається під час першого
+    звернення, тобто після prepare_directories (app.core.config).
+    """
+
+    def __init__(self, directory: Union[str, Callable[[], str]], max_bytes: int, enabled: bool = True):
+        self._directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return self._directory() if callable(self._directory) else self._directory
+
+    @staticmethod
+    def make_key(file_hash: str, parser: str, version: Any, params: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"file": file_hash, "parser": parser, "version": version, "params": params},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_key(value: str) -> bool:
+        """Чи є рядок ключем make_key (використовується для перевірки result_id від клієнта)."""
+        return len(value) == 64 and all(char in "0123456789abcdef" for char in value)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._entries is None:
+            os.makedirs(self.directory, exist_ok=True)
+            found = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, entry.name[:-len(".json")], stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self._size = sum(self._entries.values())
+        return self._entries
+
+    def _get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        with self._lock:
+            entries = self._load_index()
+            if key not in entries:
+                # Запис міг створити інший процес (воркер пулу) після завантаження індексу
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    self.misses += 1
+                    return None
+                self._size += size
+                entries[key] = size
+            entries.move_to_end(key)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._size -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def _set(self, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        with self._lock:
+            entries = self._load_index()
+            # Каталог могли видалити після завантаження індексу
+            os.makedirs(self.directory, exist_ok=True)
+            # Унікальне ім'я тимчасового файлу: кеш спільний для процесів пулу парсерів
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self._size += len(data) - entries.pop(key, 0)
+            entries[key] = len(data)
+
+            while self._size > self.max_bytes and entries:
+                old_key, old_size = entries.popitem(last=False)
+                self._size -= old_size
+                self.evictions += 1
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def _clear(self) -> int:
+        with self._lock:
+            entries = self._load_index()
+            removed = len(entries)
+            for key in list(entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            entries.clear()
+            self._size = 0
+            return removed
+
+    def get_sync(self, key: str) -> Optional[Any]:
+        """Блокуючий варіант get для коду, що вже виконується поза циклом подій (воркери пулу)."""
+        if not self.enabled:
+            return None
+        return self._get(key)
+
+    def set_sync(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._set(key, value)
+        except Exception as e:
+            print(f"Помилка при збереженні результату в кеш: {str(e)}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set_sync, key, value)
+
+    async def clear(self) -> int:
+        return await asyncio.to_thread(self._clear)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._load_index()
+            total = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "entries": len(entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+                "evictions": self.evictions
+            }
+
+
+result_cache = ResultCache(
+    directory=lambda: os.path.join(settings.CACHE_FOLDER, "results"),
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+    enabled=settings.RESULT_CACHE_ENABLED
+)
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import os
+import time
+from app.services.data_store import data_store
+from app.services.parser_service import ParserService
+from app.utils.file_handler import file_sha256
+
+
+def student_fingerprint(student: Dict[str, Any]) -> str:
+    """Відбиток запису студента: змінюється при зміні будь-якого поля."""
+    payload = json.dumps(student, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def changed_fields(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {
+        field: {"old": old.get(field), "new": new.get(field)}
+        for field in sorted(set(old) | set(new))
+        if old.get(field) != new.get(field)
+    }
+
+
+async def import_roster(service: ParserService, file_path: str, roster: Optional[str] = None,
+                        dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Інкрементальний імпорт списку студентів: порівнює новий файл із відбитками
+    попереднього імпорту того самого списку (за IDstudent) і повертає лише
+    додані, змінені (з переліком змінених полів) та вилучені записи.
+
+    Args:
+        service: Сервіс парсингу (файл розбирається повністю, результат кешується)
+        file_path: Шлях до Excel-файлу зі списком
+        roster: Назва списку, з яким порівнюється файл; за замовчуванням — ім'я файлу
+        dry_run: Лише обчислити зміни, не оновлюючи збережені відбитки
+
+    Returns:
+        Словник зі зведенням і списками inserted, updated, removed
+    """
+    roster = roster or os.path.basename(file_path)
+    started = time.perf_counter()
+
+    students = await service.parse_students(file_path, os.path.splitext(file_path)[1].lower(), None)
+    source_hash = await asyncio.to_thread(file_sha256, file_path)
+
+    # Студент, що трапляється у файлі кілька разів, береться за останнім рядком (як у data_store)
+    current = {student["IDstudent"]: student for student in students if student.get("IDstudent") is not None}
+    fingerprints = {student_id: student_fingerprint(student) for student_id, student in current.items()}
+
+    previous = await asyncio.to_thread(data_store.roster_fingerprints, roster)
+    first_import = previous is None
+    previous = previous or {}
+
+    inserted_ids = [student_id for student_id in current if student_id not in previous]
+    updated_ids = [
+        student_id for student_id in current
+        if student_id in previous and previous[student_id] != fingerprints[student_id]
+    ]
+    removed_ids = [student_id for student_id in previous if student_id not in current]
+
+    old_records = await asyncio.to_thread(data_store.roster_records, roster, updated_ids + removed_ids)
+
+    updated: List[Dict[str, Any]] = []
+    for student_id in updated_ids:
+        updated.append({
+            "IDstudent": student_id,
+            "changes": changed_fields(old_records.get(student_id, {}), current[student_id]),
+            "student": current[student_id]
+        })
+
+    if not dry_run:
+        await asyncio.to_thread(
+            data_store.apply_roster_changes,
+            roster,
+            source_hash,
+            len(current),
+            [(student_id, fingerprints[student_id], current[student_id]) for student_id in inserted_ids + updated_ids],
+            removed_ids
+        )
+
+    return {
+        "roster": roster,
+        "first_import": first_import,
+        "dry_run": dry_run,
+        "summary": {
+            "total": len(current),
+            "inserted": len(inserted_ids),
+            "updated": len(updated_ids),
+            "removed": len(removed_ids),
+            "unchanged": len(current) - len(inserted_ids) - len(updated_ids)
+        },
+        "inserted": [current[student_id] for student_id in inserted_ids],
+        "updated": updated,
+        "removed": [
+            {"IDstudent": student_id, "student": old_records.get(student_id)}
+            for student_id in removed_ids
+        ],
+        "timings": {"total_ms": round((time.perf_counter() - started) * 1000, 1)}
+    }
@@ -0,0 +1,240 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+import csv
+import gzip
+import importlib.util
+import io
+import itertools
+import json
+import os
+
+# Формати експорту: назва -> розширення файлу
+EXPORT_FORMATS = {
+    "xlsx": ".xlsx",
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "parquet": ".parquet",
+}
+
+# Необов'язкові пакети, потрібні для окремих форматів
+FORMAT_DEPENDENCIES = {
+    "parquet": "pyarrow",
+}
+
+# Кількість записів, що одночасно тримаються в пам'яті при записі Parquet
+PARQUET_BATCH_SIZE = 10000
+
+# Excel обмежує назву аркуша 31 символом і забороняє деякі символи
+SHEET_TITLE_FORBIDDEN = str.maketrans({char: "_" for char in "[]:*?/\\"})
+
+
+def export_format(filename: str, requested: Optional[str] = None) -> str:
+    """Формат експорту: явно вказаний або за розширенням файлу (за замовчуванням xlsx)."""
+    if requested:
+        if requested not in EXPORT_FORMATS:
+            raise ValueError(f"Непідтримуваний формат експорту: {requested}. Допустимі: {', '.join(EXPORT_FORMATS)}")
+        return requested
+    lowered = filename.lower()
+    # Довші розширення перевіряються першими (.csv.gz раніше за .csv)
+    for name, extension in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1])):
+        if lowered.endswith(extension):
+            return name
+    return "xlsx"
+
+
+def missing_dependency(fmt: str) -> Optional[str]:
+    """Назва невстановленого пакета, потрібного для формату `fmt`, або None."""
+    package = FORMAT_DEPENDENCIES.get(fmt)
+    if package is not None and importlib.util.find_spec(package) is None:
+        return package
+    return None
+
+
+def collect_columns(records: Iterable[Dict[str, Any]]) -> List[str]:
+    """Об'єднання ключів усіх записів у порядку першої появи (як колонки pd.DataFrame)."""
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
+
+
+def _cell(value: Any) -> Any:
+    # Вкладені об'єкти (дати навчання, details) записуються як JSON-рядок
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _rows(records: Iterable[Dict[str, Any]], columns: Sequence[str]) -> Iterator[List[Any]]:
+    for record in records:
+        yield [_cell(record.get(column)) for column in columns]
+
+
+def _sheet_title(name: str, used: set) -> str:
+    title = (name.translate(SHEET_TITLE_FORBIDDEN) or "Sheet")[:31]
+    candidate, suffix = title, 1
+    while candidate.lower() in used:
+        suffix += 1
+        candidate = f"{title[:31 - len(str(suffix)) - 1]}_{suffix}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def _sheet_path(path: str, extension: str, sheet: str, multiple: bool) -> str:
+    if not multiple:
+        return path
+    stem = path[:-len(extension)] if path.lower().endswith(extension) else path
+    return f"{stem}_{sheet}{extension}"
+
+
+def result_sheets(result: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Аркуші експорту для збереженого результату парсингу: список записів — один
+    аркуш "data"; словник (освітня програма, результат parse_file) — аркуш на
+    кожне поле зі списком записів або об'єктом (educationalProgram, mainDisciplines тощо).
+    """
+    if isinstance(result, list):
+        return {"data": result}
+    if isinstance(result, dict):
+        sheets = {}
+        for name, value in result.items():
+            if isinstance(value, list):
+                sheets[name] = value
+            elif isinstance(value, dict):
+                sheets[name] = [value]
+        return sheets
+    raise ValueError("Збережений результат не містить записів для експорту")
+
+
+def write_xlsx(path: str, sheets: Dict[str, Iterable[Dict[str, Any]]],
+               columns: Dict[str, Sequence[str]]) -> List[str]:
+    """Записує всі аркуші в один файл через write-only режим openpyxl (рядки не зберігаються в пам'яті)."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    used: set = set()
+    for name, records in sheets.items():
+        sheet = workbook.create_sheet(_sheet_title(name, used))
+        sheet.append(list(columns[name]))
+        for row in _rows(records, columns[name]):
+            sheet.append(row)
+    workbook.save(path)
+    return [path]
+
+
+def _write_csv(stream: io.TextIOBase, records: Iterable[Dict[str, Any]], columns: Sequence[str]) -> None:
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    writer.writerows(_rows(records, columns))
+
+
+def write_csv(path: str, sheets: Dict[str, Iterable[Dict[str, Any]]],
+              columns: Dict[str, Sequence[str]], compress: bool = False) -> List[str]:
+    """CSV (utf-8 з BOM, щоб Excel коректно відкривав кирилицю); кілька аркушів — окремі файли."""
+    extension = EXPORT_FORMATS["csv.gz" if compress else "csv"]
+    paths = []
+    for name, records in sheets.items():
+        sheet_path = _sheet_path(path, extension, name, len(sheets) > 1)
+        if compress:
+            stream = gzip.open(sheet_path, "wt", encoding="utf-8-sig", newline="", compresslevel=6)
+        else:
+            stream = open(sheet_path, "w", encoding="utf-8-sig", newline="")
+        with stream:
+            _write_csv(stream, records, columns[name])
+        paths.append(sheet_path)
+    return paths
+
+
+def _parquet_schema(pyarrow: Any, batch: List[Dict[str, Any]], names: Sequence[str]) -> Any:
+    """
+    Схема з усіх колонок: типи визначаються за першим пакетом, а колонки без
+    жодного значення в ньому стають рядковими (інакше тип null не прийняв би
+    значення з наступних пакетів).
+    """
+    inferred = pyarrow.Table.from_pylist(batch).schema if batch else None
+    fields = []
+    for name in names:
+        field_type = inferred.field(name).type if inferred is not None else pyarrow.null()
+        if pyarrow.types.is_null(field_type):
+            field_type = pyarrow.string()
+        fields.append(pyarrow.field(name, field_type))
+    return pyarrow.schema(fields)
+
+
+def _parquet_batch(batch: List[Dict[str, Any]], string_columns: Sequence[str]) -> List[Dict[str, Any]]:
+    # Значення рядкових колонок приводяться до str: тип колонки могли обрати за замовчуванням
+    for record in batch:
+        for column in string_columns:
+            value = record[column]
+            if value is not None and not isinstance(value, str):
+                record[column] = str(value)
+    return batch
+
+
+def write_parquet(path: str, sheets: Dict[str, Iterable[Dict[str, Any]]],
+                  columns: Dict[str, Sequence[str]]) -> List[str]:
+    """Parquet (потрібен pyarrow) пакетами по PARQUET_BATCH_SIZE записів; кілька аркушів — окремі файли."""
+    # pyarrow (необов'язкова залежність) імпортується лише під час експорту в Parquet
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Для експорту у Parquet потрібен пакет pyarrow (pip install pyarrow)")
+
+    paths = []
+    for name, records in sheets.items():
+        sheet_path = _sheet_path(path, EXPORT_FORMATS["parquet"], name, len(sheets) > 1)
+        names = list(columns[name])
+        writer = None
+        try:
+            rows = _rows(records, names)
+            while True:
+                batch = [dict(zip(names, row)) for row in itertools.islice(rows, PARQUET_BATCH_SIZE)]
+                if writer is None:
+                    # Схема визначається за першим пакетом, наступні пакети приводяться до неї
+                    schema = _parquet_schema(pyarrow, batch, names)
+                    string_columns = [field.name for field in schema if pyarrow.types.is_string(field.type)]
+                    writer = pyarrow.parquet.ParquetWriter(sheet_path, schema)
+                elif not batch:
+                    break
+                table = pyarrow.Table.from_pylist(_parquet_batch(batch, string_columns), schema=schema)
+                writer.write_table(table)
+                if len(batch) < PARQUET_BATCH_SIZE:
+                    break
+        finally:
+            if writer is not None:
+                writer.close()
+        paths.append(sheet_path)
+    return paths
+
+
+def write_export(path: str, sheets: Dict[str, Iterable[Dict[str, Any]]], fmt: str,
+                 columns: Optional[Dict[str, Sequence[str]]] = None) -> List[str]:
+    """
+    Потоково записує аркуші `sheets` (назва -> записи) у файл(и) формату `fmt`.
+
+    Args:
+        path: Шлях до файлу експорту
+        sheets: Аркуші; записи можуть бути генератором, якщо для аркуша передано columns
+        fmt: Формат з EXPORT_FORMATS
+        columns: Колонки аркушів; якщо не вказано — об'єднання ключів записів
+            (для цього записи аркуша проходяться двічі, тож мають бути списком)
+
+    Returns:
+        Шляхи створених файлів (xlsx — один файл, інші формати — файл на аркуш)
+    """
+    columns = dict(columns or {})
+    for name, records in sheets.items():
+        if name not in columns:
+            columns[name] = collect_columns(records)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    if fmt == "xlsx":
+        return write_xlsx(path, sheets, columns)
+    if fmt in ("csv", "csv.gz"):
+        return write_csv(path, sheets, columns, compress=fmt == "csv.gz")
+    if fmt == "parquet":
+        return write_parquet(path, sheets, columns)
+    raise ValueError(f"Непідтримуваний формат експорту: {fmt}. Допустимі: {', '.join(EXPORT_FORMATS)}")
@@ -1,21 +1,185 @@
+import asyncio
+import io
 import os
 import uuid
-import shutil
+import hashlib
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from fastapi import UploadFile
 from app.core.config import settings
 
-async def save_upload_file_temporarily(upload_file: UploadFile) -> str:
-    os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
-    
-    file_id = uuid.uuid4()
-    extension = os.path.splitext(upload_file.filename)[1]
-    temp_file = os.path.join(settings.UPLOAD_FOLDER, f"{file_id}{extension}")
-    
-    with open(temp_file, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class UploadTooLargeError(ValueError):
+    """Завантажений файл перевищує дозволений розмір."""
+
+class InMemoryFile:
+    """
+    Вміст завантаженого файлу в пам'яті з оригінальним ім'ям (розширення, data_store)
+    і, якщо він уже відомий, sha256. Серіалізується pickle, тож передається
+    в пул процесів парсерів так само, як шлях.
+    """
+
+    def __init__(self, name: str, data: bytes, sha256: Optional[str] = None):
+        self.name = name
+        self.data = data
+        self.sha256 = sha256
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+# Джерело документа для парсерів: шлях до файлу або вміст у пам'яті
+Source = Union[str, InMemoryFile, bytes, bytearray, memoryview, BinaryIO]
+
+class HashingFileWriter:
+    """
+    Записує файл частинами й одночасно рахує sha256, тож після запису
+    хеш відомий без повторного читання файлу. Методи блокуючі —
+    з асинхронного коду їх викликають через asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._file = None
+
+    def write(self, chunks: List[bytes]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "wb")
+        for chunk in chunks:
+            self.size += len(chunk)
+            if self.max_bytes is not None and self.size > self.max_bytes:
+                raise UploadTooLargeError(f"Файл перевищує максимальний розмір {self.max_bytes} байт")
+            self._file.write(chunk)
+            self._digest.update(chunk)
+
+    def close(self) -> str:
+        """Закриває файл, запам'ятовує його хеш для file_sha256 і повертає хеш."""
+        if self._file is None:
+            self._file = open(self.path, "wb")
+        self._file.close()
+        file_hash = self._digest.hexdigest()
+        remember_sha256(self.path, file_hash)
+        return file_hash
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def upload_path(filename: str) -> str:
+    """
+    Шлях для завантаженого файлу: окремий каталог UPLOAD_FOLDER/<uuid>/ з
+    оригінальним ім'ям файлу (лише basename), щоб ім'я зберігалося для парсерів і data_store.
+    """
+    directory = os.path.join(settings.UPLOAD_FOLDER, uuid.uuid4().hex)
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.basename(filename.replace("\\", "/")) or "upload"
+    return os.path.join(directory, name)
+
+async def save_upload_file_temporarily(upload_file: UploadFile, max_bytes: Optional[int] = None) -> str:
+    temp_file = upload_path(upload_file.filename)
+    writer = HashingFileWriter(temp_file, max_bytes)
+    try:
+        while True:
+            chunk = await upload_file.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            await asyncio.to_thread(writer.write, [chunk])
+        await asyncio.to_thread(writer.close)
+    except BaseException:
+        writer.abort()
+        await remove_temp_file(temp_file)
+        raise
+
     return temp_file
 
 async def remove_temp_file(file_path: str) -> None:
     if os.path.exists(file_path):
-        os.remove(file_path)
\ No newline at end of file
+        os.remove(file_path)
+
+    # Каталог окремого завантаження (UPLOAD_FOLDER/<uuid>/) видаляється разом з файлом
+    directory = os.path.dirname(os.path.abspath(file_path))
+    if os.path.dirname(directory) == os.path.abspath(settings.UPLOAD_FOLDER):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+def source_name(source: Source) -> str:
+    """Шлях або оригінальне ім'я джерела; для буфера без імені — порожній рядок."""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, InMemoryFile):
+        return source.name
+    name = getattr(source, "name", "")
+    return name if isinstance(name, str) else ""
+
+def _source_buffer(source: Source) -> Union[bytes, bytearray, memoryview]:
+    if isinstance(source, InMemoryFile):
+        return source.data
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+def open_source(source: Source) -> BinaryIO:
+    """
+    Відкриває джерело для читання: файл за шляхом або новий BytesIO над вмістом
+    у пам'яті (кожен виклик має власну позицію, тож джерело можна читати повторно).
+    """
+    if isinstance(source, str):
+        return open(source, "rb")
+    return io.BytesIO(_source_buffer(source))
+
+def in_memory_source(source: Source) -> Union[str, InMemoryFile]:
+    """Шлях без змін, а буфер — як InMemoryFile (для передачі в інші процеси)."""
+    if isinstance(source, (str, InMemoryFile)):
+        return source
+    return InMemoryFile(source_name(source), bytes(_source_buffer(source)))
+
+def source_sha256(source: Source) -> str:
+    """sha256 вмісту джерела; для InMemoryFile обчислюється один раз."""
+    if isinstance(source, str):
+        return file_sha256(source)
+    if isinstance(source, InMemoryFile) and source.sha256:
+        return source.sha256
+    file_hash = hashlib.sha256(_source_buffer(source)).hexdigest()
+    if isinstance(source, InMemoryFile):
+        source.sha256 = file_hash
+    return file_hash
+
+# (шлях, розмір, mtime) -> sha256, щоб не перечитувати незмінені файли
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+def _memo_key(file_path: str) -> Tuple[str, int, int]:
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+def remember_sha256(file_path: str, file_hash: str) -> None:
+    """Запам'ятовує хеш, уже обчислений під час запису файлу."""
+    if len(_hash_memo) >= 1024:
+        _hash_memo.clear()
+    _hash_memo[_memo_key(file_path)] = file_hash
+
+def file_sha256(file_path: str) -> str:
+    memo_key = _memo_key(file_path)
+    cached = _hash_memo.get(memo_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    file_hash = digest.hexdigest()
+    if len(_hash_memo) >= 1024:
+        _hash_memo.clear()
+    _hash_memo[memo_key] = file_hash
+    return file_hash
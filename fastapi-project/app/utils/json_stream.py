@@ -0,0 +1,47 @@
+from typing import Any, Dict, Iterable
+import textwrap
+from app.utils.serialization import dumps
+
+
+def ndjson_line(record: Dict[str, Any]) -> str:
+    return dumps(record).decode("utf-8") + "\n"
+
+
+class JsonArrayWriter:
+    """
+    Записує JSON-масив у файл частинами, не тримаючи всі записи в пам'яті.
+    Форматування те саме, що в app.utils.serialization.write_json(path, data, pretty):
+    компактний JSON або, з pretty=True, з відступом у 2 пробіли; записи серіалізуються
+    тим самим dumps.
+    """
+
+    def __init__(self, path: str, pretty: bool = False):
+        self.path = path
+        self.pretty = pretty
+        self.count = 0
+        self._file = open(path, 'wb')
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            if self.pretty:
+                self._file.write(b"[\n" if self.count == 0 else b",\n")
+                self._file.write(textwrap.indent(dumps(record, pretty=True).decode("utf-8"), "  ").encode("utf-8"))
+            else:
+                self._file.write(b"[" if self.count == 0 else b",")
+                self._file.write(dumps(record))
+            self.count += 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if not self.count:
+            self._file.write(b"[]")
+        else:
+            self._file.write(b"\n]" if self.pretty else b"]")
+        self._file.close()
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,60 @@
+from typing import Any
+import dataclasses
+import json
+import os
+from fastapi.responses import JSONResponse
+
+# orjson серіалізує записи в кілька разів швидше за json і без проміжних
+# структур; якщо пакет не встановлено, використовується стандартний json
+# з тим самим форматуванням (UTF-8 без екранування, ті самі відступи). Значення
+# можуть відрізнятися: orjson записує NaN та Infinity як null, а запис дробових
+# чисел може не збігатися з json посимвольно
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Типи, яких немає в JSON: записи app.schemas.records і скаляри numpy/pandas."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Тип {type(value).__name__} не серіалізується в JSON")
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """
+    JSON у UTF-8. Компактний за замовчуванням; pretty=True дає відступ у 2 пробіли,
+    як json.dump(..., ensure_ascii=False, indent=2), але з orjson NaN та Infinity
+    стають null, а дробові числа можуть бути записані інакше.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2, default=_default).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def write_json(path: str, data: Any, pretty: bool = False) -> str:
+    """Записує дані у JSON-файл (створюючи директорію) і повертає шлях."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(dumps(data, pretty))
+    return path
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse, що серіалізує вміст через dumps. Повертається ендпоінтами
+    напряму, тож великі списки записів не проходять через jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
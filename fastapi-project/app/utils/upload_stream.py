@@ -0,0 +1,175 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
+import asyncio
+import hashlib
+import os
+from app.utils.file_handler import HashingFileWriter, InMemoryFile, UploadTooLargeError, remove_temp_file, upload_path
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# Дані файлу накопичуються до такого обсягу і записуються на диск у потоці пулу
+FLUSH_BYTES = 1024 * 1024
+# Максимальний розмір звичайного (не файлового) поля форми
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class ReceivedUpload:
+    """
+    Результат потокового прийому: джерело для парсерів (шлях до файлу або InMemoryFile),
+    оригінальне ім'я, розмір, sha256 і поля форми. `path` — None, якщо файл лишився в пам'яті.
+    """
+
+    def __init__(self, source: Union[str, InMemoryFile], filename: str, size: int, sha256: str, fields: Dict[str, str]):
+        self.source = source
+        self.path = source if isinstance(source, str) else None
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.fields = fields
+
+
+class _MultipartReceiver:
+    """
+    Колбеки MultipartParser: дані файлової частини збираються в `pending`
+    (після переходу на диск — записуються у файл між порціями тіла запиту),
+    звичайні поля — в `fields`.
+    """
+
+    def __init__(self, max_bytes: int, allowed_extensions: Optional[Iterable[str]]):
+        self.max_bytes = max_bytes
+        self.allowed_extensions = set(allowed_extensions) if allowed_extensions else None
+        self.fields: Dict[str, str] = {}
+        self.writer: Optional[HashingFileWriter] = None
+        self.filename: Optional[str] = None
+        self.pending: List[bytes] = []
+        self.pending_bytes = 0
+        self.received = 0
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._field_name: Optional[str] = None
+        self._field_data: Optional[bytearray] = None
+        self._in_file = False
+
+    def callbacks(self) -> Dict[str, object]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._field_name = None
+        self._field_data = None
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise ValueError("Частина форми без імені (Content-Disposition name)")
+        self._field_name = options[b"name"].decode("utf-8", "replace")
+
+        if b"filename" not in options:
+            self._field_data = bytearray()
+            return
+
+        if self.filename is not None:
+            raise ValueError("Очікується лише один файл у запиті")
+        filename = options[b"filename"].decode("utf-8", "replace")
+        extension = os.path.splitext(filename)[1].lower()
+        if self.allowed_extensions is not None and extension not in self.allowed_extensions:
+            raise ValueError(f"Непідтримуваний формат файлу: {extension}. Підтримуються: {', '.join(sorted(self.allowed_extensions))}")
+
+        self.filename = filename
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.received += end - start
+            if self.received > self.max_bytes:
+                raise UploadTooLargeError(f"Файл перевищує максимальний розмір {self.max_bytes} байт")
+            self.pending.append(data[start:end])
+            self.pending_bytes += end - start
+        elif self._field_data is not None:
+            if len(self._field_data) + end - start > MAX_FIELD_BYTES:
+                raise ValueError(f"Поле форми {self._field_name} перевищує {MAX_FIELD_BYTES} байт")
+            self._field_data.extend(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._field_data is not None:
+            self.fields[self._field_name] = self._field_data.decode("utf-8", "replace")
+        self._in_file = False
+
+    def take_pending(self) -> List[bytes]:
+        chunks = self.pending
+        self.pending = []
+        self.pending_bytes = 0
+        return chunks
+
+
+async def receive_multipart_upload(content_type: str, stream: AsyncIterator[bytes], max_bytes: int,
+                                   allowed_extensions: Optional[Iterable[str]] = None,
+                                   memory_max_bytes: int = 0) -> ReceivedUpload:
+    """
+    Потоково приймає multipart/form-data з одним файлом: тіло запиту розбирається
+    порціями по мірі надходження. Файл до memory_max_bytes лишається в пам'яті
+    (InMemoryFile, без тимчасового файлу); більший пишеться в UPLOAD_FOLDER/<uuid>/<ім'я>
+    у потоці пулу (цикл подій не блокується), а sha256 рахується під час запису.
+
+    Raises:
+        UploadTooLargeError: файл більший за max_bytes (прийом переривається одразу)
+        ValueError: некоректна форма, немає файлу або непідтримуване розширення
+    """
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise ValueError("Очікується multipart/form-data з boundary")
+
+    receiver = _MultipartReceiver(max_bytes, allowed_extensions)
+    parser = MultipartParser(boundary, receiver.callbacks())
+
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+            if receiver.writer is None and receiver.received > memory_max_bytes:
+                # Файл не вміщується в пам'ять: далі (разом з уже прийнятими даними) пишемо на диск
+                receiver.writer = HashingFileWriter(upload_path(receiver.filename), max_bytes)
+            if receiver.writer is not None and receiver.pending_bytes >= FLUSH_BYTES:
+                await asyncio.to_thread(receiver.writer.write, receiver.take_pending())
+        parser.finalize()
+
+        if receiver.filename is None:
+            raise ValueError("У запиті немає файлу (поле форми з filename)")
+        if receiver.writer is None:
+            data = b"".join(receiver.take_pending())
+            source = InMemoryFile(receiver.filename, data, hashlib.sha256(data).hexdigest())
+            return ReceivedUpload(source, receiver.filename, source.size, source.sha256, receiver.fields)
+
+        await asyncio.to_thread(receiver.writer.write, receiver.take_pending())
+        sha256 = await asyncio.to_thread(receiver.writer.close)
+    except BaseException:
+        if receiver.writer is not None:
+            receiver.writer.abort()
+            await remove_temp_file(receiver.writer.path)
+        raise
+
+    return ReceivedUpload(receiver.writer.path, receiver.filename, receiver.writer.size, sha256, receiver.fields)